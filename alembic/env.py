@@ -13,7 +13,8 @@ from app.core.db.base import DATABASE_URL
 from app.models import (  # noqa: F401 — ensure models are registered
     User, Project, BackofficeUser, AgenticComponent,
     ComponentField, ComponentPort, ComponentApiConfig, ComponentOutputSchema,
-    Flow, ConsistentCharacter, EventLog,
+    Flow, ConsistentCharacter, EventLog, NodeOutputCacheEntry,
+    ExecutionRun, ExecutionNodeState, EventRelayEntry,
 )
 
 config = context.config
@@ -0,0 +1,34 @@
+"""add node_output_cache
+
+Revision ID: a3c91e07d5b2
+Revises: 76ab156db31b
+Create Date: 2026-10-18 10:12:03.114502
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e07d5b2'
+down_revision: Union[str, None] = '76ab156db31b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('node_output_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('node_type', sa.String(length=100), nullable=False),
+    sa.Column('output', sa.JSON(), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_node_output_cache_node_type'), 'node_output_cache', ['node_type'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_node_output_cache_node_type'), table_name='node_output_cache')
+    op.drop_table('node_output_cache')
@@ -0,0 +1,28 @@
+"""add flows listing index
+
+Revision ID: b8d2e4f61a37
+Revises: f3a6d1e8b5c2
+Create Date: 2026-10-18 20:41:12.530118
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2e4f61a37'
+down_revision: Union[str, None] = 'f3a6d1e8b5c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_flows_user_project_updated_at', 'flows',
+        ['user_id', 'project_id', 'updated_at', 'id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_flows_user_project_updated_at', table_name='flows')
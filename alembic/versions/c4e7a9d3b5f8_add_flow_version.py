@@ -0,0 +1,25 @@
+"""add flow version
+
+Revision ID: c4e7a9d3b5f8
+Revises: b8d2e4f61a37
+Create Date: 2026-10-18 21:15:37.204561
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a9d3b5f8'
+down_revision: Union[str, None] = 'b8d2e4f61a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('flows', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('flows', 'version')
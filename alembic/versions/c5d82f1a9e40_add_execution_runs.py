@@ -0,0 +1,58 @@
+"""add execution_runs and execution_node_states
+
+Revision ID: c5d82f1a9e40
+Revises: a3c91e07d5b2
+Create Date: 2026-10-18 14:41:27.530118
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d82f1a9e40'
+down_revision: Union[str, None] = 'a3c91e07d5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('execution_runs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('flow_id', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('request', sa.JSON(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('worker_id', sa.String(length=255), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_execution_runs_user_id'), 'execution_runs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_execution_runs_flow_id'), 'execution_runs', ['flow_id'], unique=False)
+    op.create_index(op.f('ix_execution_runs_status'), 'execution_runs', ['status'], unique=False)
+    op.create_index(op.f('ix_execution_runs_worker_id'), 'execution_runs', ['worker_id'], unique=False)
+    op.create_index(op.f('ix_execution_runs_heartbeat_at'), 'execution_runs', ['heartbeat_at'], unique=False)
+    op.create_table('execution_node_states',
+    sa.Column('run_id', sa.String(length=32), nullable=False),
+    sa.Column('node_id', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('output', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['execution_runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('run_id', 'node_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('execution_node_states')
+    op.drop_index(op.f('ix_execution_runs_heartbeat_at'), table_name='execution_runs')
+    op.drop_index(op.f('ix_execution_runs_worker_id'), table_name='execution_runs')
+    op.drop_index(op.f('ix_execution_runs_status'), table_name='execution_runs')
+    op.drop_index(op.f('ix_execution_runs_flow_id'), table_name='execution_runs')
+    op.drop_index(op.f('ix_execution_runs_user_id'), table_name='execution_runs')
+    op.drop_table('execution_runs')
@@ -0,0 +1,46 @@
+"""flow graph_data to jsonb with gin index
+
+Revision ID: d9f1b3c5e7a2
+Revises: c4e7a9d3b5f8
+Create Date: 2026-10-18 22:03:51.718264
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1b3c5e7a2'
+down_revision: Union[str, None] = 'c4e7a9d3b5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'flows', 'graph_data',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_type=sa.JSON(),
+        postgresql_using='graph_data::jsonb',
+    )
+    # Built without blocking flow saves; CONCURRENTLY can't run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_flows_graph_data', 'flows', ['graph_data'], unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'graph_data': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_flows_graph_data', table_name='flows', postgresql_concurrently=True)
+    op.alter_column(
+        'flows', 'graph_data',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        postgresql_using='graph_data::json',
+    )
@@ -0,0 +1,36 @@
+"""add run queue cancel columns and event_relay
+
+Revision ID: e17b4c9d2f63
+Revises: c5d82f1a9e40
+Create Date: 2026-10-18 16:02:11.804215
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e17b4c9d2f63'
+down_revision: Union[str, None] = 'c5d82f1a9e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('execution_runs', sa.Column('cancel_requested', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('execution_runs', sa.Column('superseded_by', sa.String(length=32), nullable=True))
+    op.create_table('event_relay',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_event_relay_created_at'), 'event_relay', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_event_relay_created_at'), table_name='event_relay')
+    op.drop_table('event_relay')
+    op.drop_column('execution_runs', 'superseded_by')
+    op.drop_column('execution_runs', 'cancel_requested')
@@ -0,0 +1,25 @@
+"""add last_seq to execution_runs
+
+Revision ID: e2a8c6f4d1b9
+Revises: d9f1b3c5e7a2
+Create Date: 2026-10-18 23:12:08.447190
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a8c6f4d1b9'
+down_revision: Union[str, None] = 'd9f1b3c5e7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('execution_runs', sa.Column('last_seq', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('execution_runs', 'last_seq')
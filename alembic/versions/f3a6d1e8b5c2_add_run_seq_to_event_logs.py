@@ -0,0 +1,29 @@
+"""add run_id and seq to event_logs
+
+Revision ID: f3a6d1e8b5c2
+Revises: e17b4c9d2f63
+Create Date: 2026-10-18 19:27:45.113092
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6d1e8b5c2'
+down_revision: Union[str, None] = 'e17b4c9d2f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('event_logs', sa.Column('run_id', sa.String(length=32), nullable=True))
+    op.add_column('event_logs', sa.Column('seq', sa.Integer(), nullable=True))
+    op.create_index('ix_event_logs_run_id_seq', 'event_logs', ['run_id', 'seq'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_logs_run_id_seq', table_name='event_logs')
+    op.drop_column('event_logs', 'seq')
+    op.drop_column('event_logs', 'run_id')
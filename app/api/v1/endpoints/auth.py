@@ -3,7 +3,7 @@ from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.dependency import get_db
-from app.core.security import verify_password, create_access_token, create_refresh_token, decode_token
+from app.core.security import password_hasher, create_access_token, create_refresh_token, decode_token
 from app.models.user import User
 from app.api.v1.schemas.auth import LoginRequest, TokenResponse, RefreshRequest
 
@@ -18,8 +18,11 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
         )
     )
     user = result.scalar_one_or_none()
-    if not user or not verify_password(body.password, user.hashed_password):
+    if not user or not await password_hasher.verify(body.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    if password_hasher.needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(body.password)
+        await db.commit()
     return TokenResponse(
         access_token=create_access_token(user.id),
         refresh_token=create_refresh_token(user.id),
@@ -30,7 +33,7 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
     payload = decode_token(body.refresh_token)
-    if not payload or payload.get("type") != "refresh":
+    if not payload or payload.get("type") != "refresh" or payload.get("scope") is not None:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
     user = await db.get(User, int(payload["sub"]))
     if not user:
@@ -3,7 +3,7 @@ from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.dependency import get_db
-from app.core.security import hash_password, verify_password, create_access_token, create_refresh_token
+from app.core.security import BACKOFFICE_SCOPE, password_hasher, create_access_token, create_refresh_token
 from app.models.backoffice_user import BackofficeUser
 from app.api.v1.schemas.backoffice_auth import (
     BackofficeLoginRequest,
@@ -20,7 +20,7 @@ async def create_backoffice_user(body: BackofficeUserCreate, db: AsyncSession =
     user = BackofficeUser(
         username=body.username,
         email=body.email,
-        hashed_password=hash_password(body.password),
+        hashed_password=await password_hasher.hash(body.password),
     )
     db.add(user)
     await db.commit()
@@ -36,9 +36,12 @@ async def backoffice_login(body: BackofficeLoginRequest, db: AsyncSession = Depe
         )
     )
     user = result.scalar_one_or_none()
-    if not user or not verify_password(body.password, user.hashed_password):
+    if not user or not await password_hasher.verify(body.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if password_hasher.needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(body.password)
+        await db.commit()
     return BackofficeTokenResponse(
-        access_token=create_access_token(user.id),
-        refresh_token=create_refresh_token(user.id),
+        access_token=create_access_token(user.id, scope=BACKOFFICE_SCOPE),
+        refresh_token=create_refresh_token(user.id, scope=BACKOFFICE_SCOPE),
     )
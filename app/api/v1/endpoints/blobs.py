@@ -0,0 +1,24 @@
+"""Serve content-addressed blobs (generated and uploaded images)."""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.storage import blob_store
+
+router = APIRouter(prefix="/blobs", tags=["blobs"])
+
+# Keys are content hashes, so a given URL never changes content.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{key}")
+async def get_blob(key: str):
+    """Return blob bytes. Supports ``Range`` requests and conditional GETs via ETag."""
+    path = blob_store.path_for(key)
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return FileResponse(
+        path,
+        media_type=blob_store.content_type_for(key),
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
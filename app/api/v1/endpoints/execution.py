@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from app.core.auth import get_current_user
 from app.core.di.registry import registry
 from app.modules.execution.manager import ExecutionManager
+from app.modules.execution.providers.limits import limiter_stats
 
 router = APIRouter(prefix="/execution", tags=["execution"])
 
@@ -19,6 +20,7 @@ class ExecutionRequest(BaseModel):
     provider_id: str
     trigger_node_id: str | None = None
     cached_outputs: dict[str, dict] | None = None
+    pipelined: bool = False
 
 
 class ExecutionResponse(BaseModel):
@@ -44,5 +46,29 @@ async def run_execution(
         provider_id=body.provider_id,
         trigger_node_id=body.trigger_node_id,
         cached_outputs=body.cached_outputs,
+        pipelined=body.pipelined,
     )
     return ExecutionResponse(run_id=run_id)
+
+
+class CancelResponse(BaseModel):
+    run_id: str
+    cancelled: bool
+
+
+@router.post("/{run_id}/cancel", response_model=CancelResponse)
+async def cancel_execution(
+    run_id: str,
+    current_user=Depends(get_current_user),
+    manager: ExecutionManager = Depends(registry.get(ExecutionManager)),
+):
+    """Cancel a queued or running execution owned by the current user."""
+    if not await manager.cancel(run_id, current_user.id):
+        raise HTTPException(status_code=404, detail="No active run with that id")
+    return CancelResponse(run_id=run_id, cancelled=True)
+
+
+@router.get("/providers/limits")
+async def provider_limit_stats(current_user=Depends(get_current_user)):
+    """Per-provider call counts, in-flight calls and time spent waiting for a slot."""
+    return limiter_stats()
@@ -1,16 +1,70 @@
+import base64
+import uuid
+from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth import get_current_backoffice_user
 from app.core.db.dependency import get_db
 from app.models.flow import Flow
-from app.api.v1.schemas.flow import FlowSave, FlowResponse, FlowLoadRequest, FlowRecord
+from app.api.v1.schemas.flow import (
+    FlowSave,
+    FlowResponse,
+    FlowLoadRequest,
+    FlowRecord,
+    FlowListRequest,
+    FlowSummary,
+    FlowPage,
+    FlowPatch,
+    FlowPatchResponse,
+    ElementDiff,
+)
 
 router = APIRouter(prefix="/flows", tags=["flows"])
 
 
+def _check_version(flow: Flow, version: int | None) -> None:
+    if version is not None and version != flow.version:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Flow was changed by another save", "version": flow.version},
+        )
+
+
+def _apply_diff(elements: list[dict], diff: ElementDiff) -> list[dict]:
+    """*elements* with *diff* applied, keeping their order (new ones appended)."""
+    by_id = {e.get("id"): i for i, e in enumerate(elements)}
+    result = list(elements)
+    for change in diff.upsert:
+        element_id = change.get("id")
+        if not isinstance(element_id, str):
+            raise HTTPException(status_code=422, detail="Every upserted node and edge needs a string id")
+        if element_id in by_id:
+            index = by_id[element_id]
+            result[index] = {**result[index], **change}
+        else:
+            by_id[element_id] = len(result)
+            result.append(change)
+    removed = set(diff.remove)
+    return [e for e in result if e.get("id") not in removed]
+
+
+def _apply_patch(graph_data: dict, patch: FlowPatch) -> dict:
+    """A new ``graph_data`` with *patch* applied. Edges of removed nodes are dropped."""
+    nodes = _apply_diff(graph_data.get("nodes", []), patch.nodes)
+    edges = _apply_diff(graph_data.get("edges", []), patch.edges)
+    if patch.nodes.remove:
+        node_ids = {n.get("id") for n in nodes}
+        edges = [e for e in edges if e.get("source") in node_ids and e.get("target") in node_ids]
+    patched = {**graph_data, "nodes": nodes, "edges": edges}
+    if patch.providerId is not None:
+        patched["providerId"] = patch.providerId
+    return patched
+
+
 @router.post("/save-flow", response_model=FlowResponse)
 async def save_flow(body: FlowSave, db: AsyncSession = Depends(get_db)):
     graph_data = {
@@ -19,11 +73,13 @@ async def save_flow(body: FlowSave, db: AsyncSession = Depends(get_db)):
         "providerId": body.providerId,
     }
 
-    existing = await db.get(Flow, body.id)
+    existing = await db.get(Flow, body.id, with_for_update=True)
 
     if existing:
+        _check_version(existing, body.version)
         existing.name = body.name
         existing.graph_data = graph_data
+        existing.version += 1
     else:
         existing = Flow(
             id=body.id,
@@ -48,3 +104,119 @@ async def load_flows(body: FlowLoadRequest, db: AsyncSession = Depends(get_db)):
         )
     )
     return result.scalars().all()
+
+
+def _encode_cursor(flow: FlowSummary) -> str:
+    raw = f"{flow.updated_at.isoformat()}|{flow.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        updated_at, flow_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(updated_at), uuid.UUID(flow_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+async def _summary_page(
+    db: AsyncSession,
+    *conditions,
+    limit: int,
+    cursor: str | None,
+) -> FlowPage:
+    """One keyset page of flow summaries matching *conditions*, newest first."""
+    node_count = func.coalesce(func.jsonb_array_length(Flow.graph_data["nodes"]), 0)
+    query = (
+        select(
+            Flow.id, Flow.name, Flow.user_id, Flow.project_id, Flow.updated_at,
+            node_count.label("node_count"),
+        )
+        .where(*conditions)
+        .order_by(Flow.updated_at.desc(), Flow.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(tuple_(Flow.updated_at, Flow.id) < tuple_(*_decode_cursor(cursor)))
+
+    rows = (await db.execute(query)).all()
+    items = [FlowSummary.model_validate(row, from_attributes=True) for row in rows[:limit]]
+    next_cursor = _encode_cursor(items[-1]) if len(rows) > limit else None
+    return FlowPage(items=items, next_cursor=next_cursor)
+
+
+@router.post("/list", response_model=FlowPage)
+async def list_flows(body: FlowListRequest, db: AsyncSession = Depends(get_db)):
+    """A page of the project's flows, most recently updated first.
+
+    Returns summaries only — fetch a flow's graph with ``GET /flows/{id}``.
+    Pass ``next_cursor`` back as ``cursor`` for the following page.
+    """
+    return await _summary_page(
+        db,
+        Flow.user_id == body.user_id,
+        Flow.project_id == body.project_id,
+        limit=body.limit,
+        cursor=body.cursor,
+    )
+
+
+@router.get("/search", response_model=FlowPage)
+async def search_flows(
+    node_type: str | None = None,
+    provider_id: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    _operator=Depends(get_current_backoffice_user),
+):
+    """Flows of all users containing a node of *node_type* and/or using *provider_id*.
+
+    Backoffice only. A node's type is its ``type`` or ``data.type``, as the
+    engine reads it (``node_type_of``). A flow uses a provider if it is the
+    flow's provider or set on one of its nodes (node-type defaults from
+    ``model_defaults`` are not stored in the graph and don't count). Both filters are JSONB containment tests served
+    by the ``graph_data`` GIN index.
+    """
+    conditions = []
+    if node_type is not None:
+        conditions.append(or_(
+            Flow.graph_data.contains({"nodes": [{"type": node_type}]}),
+            Flow.graph_data.contains({"nodes": [{"data": {"type": node_type}}]}),
+        ))
+    if provider_id is not None:
+        conditions.append(or_(
+            Flow.graph_data.contains({"providerId": provider_id}),
+            Flow.graph_data.contains({"nodes": [{"data": {"providerId": provider_id}}]}),
+        ))
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Pass node_type and/or provider_id")
+    return await _summary_page(db, *conditions, limit=limit, cursor=cursor)
+
+
+@router.patch("/{flow_id}", response_model=FlowPatchResponse)
+async def patch_flow(flow_id: uuid.UUID, body: FlowPatch, db: AsyncSession = Depends(get_db)):
+    """Apply node / edge diffs to a saved flow.
+
+    ``body.version`` must be the flow's current version, otherwise nothing is
+    written and 409 returns the current one — reload the flow and retry.
+    """
+    flow = await db.get(Flow, flow_id, with_for_update=True)
+    if not flow:
+        raise HTTPException(status_code=404, detail="Flow not found")
+    _check_version(flow, body.version)
+
+    flow.graph_data = _apply_patch(flow.graph_data, body)
+    if body.name is not None:
+        flow.name = body.name
+    flow.version += 1
+    await db.commit()
+    return flow
+
+
+@router.get("/{flow_id}", response_model=FlowResponse)
+async def get_flow(flow_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    flow = await db.get(Flow, flow_id)
+    if not flow:
+        raise HTTPException(status_code=404, detail="Flow not found")
+    return flow
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth import user_cache
 from app.core.db.dependency import get_db
-from app.core.security import hash_password
+from app.core.security import password_hasher
 from app.models.user import User
 from app.api.v1.schemas.user import UserCreate, UserResponse
 
@@ -15,7 +16,7 @@ async def create_user(body: UserCreate, db: AsyncSession = Depends(get_db)):
     user = User(
         username=body.username,
         email=body.email,
-        hashed_password=hash_password(body.password),
+        hashed_password=await password_hasher.hash(body.password),
     )
     db.add(user)
     await db.commit()
@@ -38,3 +39,4 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
     await db.delete(user)
     await db.commit()
+    user_cache.invalidate(user_id)
@@ -3,10 +3,11 @@ import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 
+from app.core.auth import decode_access_token
 from app.core.di.registry import registry
-from app.core.security import decode_token
 from app.core.ws import ws_manager, WSMessage
 from app.modules.execution.manager import ExecutionManager
+from app.modules.execution.replay import replay_messages
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +16,13 @@ router = APIRouter()
 
 @router.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket, token: str = Query(...)):
-    payload = decode_token(token)
-    if not payload or payload.get("type") != "access":
+    payload = decode_access_token(token)
+    if payload is None or payload.get("scope") is not None:
         await ws.close(code=4001, reason="Invalid or expired token")
         return
 
     user_id = int(payload["sub"])
-    await ws_manager.connect(user_id, ws)
+    conn = await ws_manager.connect(user_id, ws)
 
     try:
         await ws_manager.send_to_user(
@@ -60,11 +61,31 @@ async def websocket_endpoint(ws: WebSocket, token: str = Query(...)):
                     provider_id=msg.data.get("provider_id", ""),
                     trigger_node_id=msg.data.get("trigger_node_id"),
                     cached_outputs=msg.data.get("cached_outputs"),
+                    pipelined=bool(msg.data.get("pipelined", False)),
                 )
                 await ws_manager.send_to_user(
                     user_id,
                     WSMessage(type="execution.started", data={"run_id": run_id}),
                 )
+            elif msg.type == "execution.cancel":
+                exec_manager = registry.resolve(ExecutionManager)
+                run_id = msg.data.get("run_id", "")
+                if not await exec_manager.cancel(run_id, user_id):
+                    logger.info("WS cancel from user %d: no active run %s", user_id, run_id)
+            elif msg.type == "execution.resume":
+                run_id = msg.data.get("run_id", "")
+                try:
+                    last_seq = int(msg.data.get("last_seq") or 0)
+                except (TypeError, ValueError):
+                    logger.warning("WS bad message from user %d: invalid last_seq", user_id)
+                    continue
+                # Missed messages go out before any live ones queued meanwhile
+                async with conn.paused():
+                    missed = await replay_messages(user_id, run_id, last_seq)
+                    conn.send_first(missed + [WSMessage(type="execution.resumed", data={
+                        "run_id": run_id,
+                        "replayed": len(missed),
+                    })])
             else:
                 logger.info("WS recv from user %d: %s", user_id, msg.type)
 
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FlowSave(BaseModel):
@@ -15,6 +15,30 @@ class FlowSave(BaseModel):
     providerId: str | None = None
     updatedAt: int | None = None
     createdAt: int | None = None
+    # Version the client last loaded; rejected with 409 if the flow moved on
+    version: int | None = None
+
+
+class ElementDiff(BaseModel):
+    # Merged into the element with the same ``id`` (top-level keys), or appended
+    upsert: list[dict[str, Any]] = Field(default_factory=list)
+    remove: list[str] = Field(default_factory=list)
+
+
+class FlowPatch(BaseModel):
+    version: int
+    name: str | None = None
+    providerId: str | None = None
+    nodes: ElementDiff = Field(default_factory=ElementDiff)
+    edges: ElementDiff = Field(default_factory=ElementDiff)
+
+
+class FlowPatchResponse(BaseModel):
+    id: UUID
+    version: int
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
 
 
 class FlowLoadRequest(BaseModel):
@@ -22,6 +46,28 @@ class FlowLoadRequest(BaseModel):
     project_id: int
 
 
+class FlowListRequest(BaseModel):
+    user_id: int
+    project_id: int
+    limit: int = Field(default=50, ge=1, le=200)
+    # ``next_cursor`` of the previous page; omit for the first page
+    cursor: str | None = None
+
+
+class FlowSummary(BaseModel):
+    id: UUID
+    name: str
+    user_id: int
+    project_id: int | None
+    updated_at: datetime
+    node_count: int
+
+
+class FlowPage(BaseModel):
+    items: list[FlowSummary]
+    next_cursor: str | None
+
+
 class FlowRecord(BaseModel):
     id: UUID
     name: str
@@ -37,6 +83,7 @@ class FlowResponse(BaseModel):
     user_id: int
     project_id: int | None
     graph_data: dict
+    version: int
     created_at: datetime
     updated_at: datetime
 
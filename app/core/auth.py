@@ -1,22 +1,115 @@
+"""Request authentication with in-process caches.
+
+``get_current_user`` would otherwise cost a JWT decode and a ``users``
+lookup per request. Decoded access tokens are memoized until they expire,
+and users are cached by id for ``AUTH_USER_CACHE_TTL`` seconds.
+``user_cache.invalidate`` drops a user at once — the users module calls it
+on ``user.deactivated``. Other processes pick the change up when their
+entry expires.
+
+Backoffice tokens carry ``scope: backoffice`` and are only accepted by
+``get_current_backoffice_user``.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.dependency import get_db
-from app.core.security import decode_token
+from app.core.security import BACKOFFICE_SCOPE, decode_token
+from app.models.backoffice_user import BackofficeUser
 from app.models.user import User
 
+AUTH_USER_CACHE_TTL = float(os.environ.get("AUTH_USER_CACHE_TTL", "30"))
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "10000"))
+
+K = TypeVar("K")
+V = TypeVar("V")
+
 bearer_scheme = HTTPBearer()
 
 
+class TTLCache(Generic[K, V]):
+    """LRU bounded by entry count; each entry expires after its own TTL."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V, ttl: float) -> None:
+        if ttl <= 0 or self._max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+user_cache: TTLCache[int, User] = TTLCache(AUTH_USER_CACHE_SIZE)
+_token_cache: TTLCache[str, dict] = TTLCache(AUTH_TOKEN_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> dict | None:
+    """The claims of a valid access *token*, or ``None``."""
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "access":
+        return None
+    _token_cache.put(token, payload, payload["exp"] - time.time())
+    return payload
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
 ) -> User:
-    payload = decode_token(credentials.credentials)
-    if not payload or payload.get("type") != "access":
+    payload = decode_access_token(credentials.credentials)
+    if payload is None or payload.get("scope") is not None:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    user_id = int(payload["sub"])
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await db.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        # Detached once the session closes; callers only read its columns
+        user_cache.put(user_id, user, AUTH_USER_CACHE_TTL)
+    return user
+
+
+async def get_current_backoffice_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> BackofficeUser:
+    payload = decode_access_token(credentials.credentials)
+    if payload is None or payload.get("scope") != BACKOFFICE_SCOPE:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    user = await db.get(User, int(payload["sub"]))
+    user = await db.get(BackofficeUser, int(payload["sub"]))
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
@@ -0,0 +1,89 @@
+"""Pluggable transport carrying events between processes.
+
+``EventBus.emit`` always dispatches to the emitting process's own handlers,
+then hands the event to the broker, which delivers it to every *other*
+process that subscribed to the event's user — the processes holding that
+user's WebSocket connections (``ws_manager`` subscribes on a user's first
+connection and unsubscribes on their last). Events without a ``user_id``
+go to every process.
+
+- ``memory`` (default): single process, nothing leaves it.
+- ``postgres``: LISTEN/NOTIFY, one channel per user (``pg_broker.py``).
+- ``socket``: a small hub process, ``python -m app.core.bus.socket_broker``
+  (``socket_broker.py``) — no database round trip per event.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+from typing import Awaitable, Callable
+
+import orjson
+
+from app.core.events import Event
+
+EVENT_BROKER = os.environ.get("EVENT_BROKER", "memory")
+EVENT_BROKER_ADDRESS = os.environ.get("EVENT_BROKER_ADDRESS", "127.0.0.1:7600")
+
+# Lets a process ignore its own events when they come back from the broker
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+BROADCAST_TOPIC = "all"
+
+EventSink = Callable[[Event], Awaitable[None]]
+
+
+def topic_for(event: Event) -> str:
+    user_id = event.payload.get("user_id")
+    return BROADCAST_TOPIC if user_id is None else user_topic(user_id)
+
+
+def user_topic(user_id: int) -> str:
+    return f"user_{user_id}"
+
+
+def encode_event(event: Event) -> bytes:
+    return orjson.dumps({"origin": PROCESS_ID, "event": event.model_dump()})
+
+
+def decode_event(message: dict) -> Event | None:
+    """The event in a decoded broker *message*, or ``None`` if this process sent it."""
+    if message.get("origin") == PROCESS_ID:
+        return None
+    return Event.model_validate(message["event"])
+
+
+class Broker:
+    """Base class and the in-memory (single-process) broker."""
+
+    async def start(self, sink: EventSink) -> None:
+        """Begin delivering events from other processes to *sink*."""
+
+    def publish(self, event: Event) -> None:
+        """Send *event* to the other subscribed processes. Never blocks."""
+
+    def subscribe_user(self, user_id: int) -> None:
+        """Receive events for *user_id* from now on."""
+
+    def unsubscribe_user(self, user_id: int) -> None:
+        """Stop receiving events for *user_id*."""
+
+    async def shutdown(self) -> None:
+        """Send what is still queued, then stop."""
+
+
+class InMemoryBroker(Broker):
+    pass
+
+
+def make_broker(kind: str = EVENT_BROKER) -> Broker:
+    if kind == "memory":
+        return InMemoryBroker()
+    if kind == "postgres":
+        from app.core.bus.pg_broker import PgBroker
+        return PgBroker()
+    if kind == "socket":
+        from app.core.bus.socket_broker import SocketBroker
+        return SocketBroker(EVENT_BROKER_ADDRESS)
+    raise ValueError(f"Unknown EVENT_BROKER '{kind}' — expected memory, postgres or socket")
@@ -1,8 +1,11 @@
 import asyncio
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Callable, Coroutine, Any
 
+from app.core.bus.broker import Broker, InMemoryBroker
+from app.core.bus.persistence import EventLogWriter
+from app.core.bus.sequencing import RunSequencer
 from app.core.events import Event
 
 logger = logging.getLogger(__name__)
@@ -13,6 +16,43 @@ EventHandler = Callable[[Event], Coroutine[Any, Any, None]]
 class EventBus:
     def __init__(self) -> None:
         self._handlers: dict[str, list[EventHandler]] = defaultdict(list)
+        self._writer = EventLogWriter()
+        self._broker: Broker = InMemoryBroker()
+        self.sequencer = RunSequencer()
+        # Per-run FIFO of events awaiting dispatch, drained by one task per run
+        self._lanes: dict[str, deque[Event]] = {}
+        # The loop only holds weak references to tasks — keep lane drainers
+        # and run-less handler calls referenced until they finish
+        self._drainers: dict[str, asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start the background event-log writer (also started lazily on emit)."""
+        self._writer.start()
+
+    async def flush(self) -> None:
+        """Wait until all emitted events have been written to ``event_logs``."""
+        await self._writer.flush()
+
+    async def shutdown(self) -> None:
+        await self._broker.shutdown()
+        await self._writer.shutdown()
+
+    @property
+    def broker(self) -> Broker:
+        return self._broker
+
+    async def use_broker(self, broker: Broker) -> None:
+        """Exchange events with other processes through *broker*."""
+        self._broker = broker
+        await broker.start(self.deliver)
+
+    def subscribe_user(self, user_id: int) -> None:
+        """Receive *user_id*'s events emitted in other processes."""
+        self._broker.subscribe_user(user_id)
+
+    def unsubscribe_user(self, user_id: int) -> None:
+        self._broker.unsubscribe_user(user_id)
 
     def on(self, event_type: str, handler: EventHandler) -> None:
         self._handlers[event_type].append(handler)
@@ -21,33 +61,58 @@ class EventBus:
     def off(self, event_type: str, handler: EventHandler) -> None:
         self._handlers[event_type].remove(handler)
 
-    async def emit(self, event: Event) -> None:
-        asyncio.create_task(self._persist(event))
+    async def emit(self, event: Event, persist: bool = True) -> None:
+        """Dispatch *event* to its handlers.
 
+        Pass ``persist=False`` for high-frequency, transient events (e.g.
+        streaming deltas) that should not be written to ``event_logs``.
+        Events of a run get the run's next ``seq``.
+        """
+        self.sequencer.assign(event)
+        if persist:
+            self._writer.submit(event)
+        self._broker.publish(event)
+        await self.deliver(event)
+
+    async def deliver(self, event: Event) -> None:
+        """Dispatch *event* to local handlers only — no persistence, no broker.
+
+        Used for events received from another process, which already
+        persisted them.
+
+        Events of the same run reach handlers one at a time in emit order
+        (so ``execution.node.running`` can never overtake
+        ``execution.node.completed``); different runs, and events without a
+        run, are dispatched concurrently.
+        """
         handlers = self._handlers.get(event.type, [])
         if not handlers:
             return
         logger.debug("Emitting '%s' to %d handler(s)", event.type, len(handlers))
-        for handler in handlers:
-            asyncio.create_task(self._safe_call(handler, event))
 
-    async def _persist(self, event: Event) -> None:
+        run_id = event.payload.get("run_id")
+        if run_id is None:
+            for handler in handlers:
+                task = asyncio.create_task(self._safe_call(handler, event))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return
+
+        lane = self._lanes.get(run_id)
+        if lane is None:
+            lane = self._lanes[run_id] = deque()
+            self._drainers[run_id] = asyncio.create_task(self._drain_lane(run_id, lane))
+        lane.append(event)
+
+    async def _drain_lane(self, run_id: str, lane: deque[Event]) -> None:
         try:
-            from app.core.db.base import async_session
-            from app.models.event_log import EventLog
-
-            async with async_session() as db:
-                log = EventLog(
-                    event_name=event.type,
-                    payload=event.payload,
-                    user_id=event.payload.get("user_id"),
-                    project_id=event.payload.get("project_id"),
-                    session_id=event.payload.get("session_id"),
-                )
-                db.add(log)
-                await db.commit()
-        except Exception:
-            logger.exception("Failed to persist event %s", event.type)
+            while lane:
+                event = lane.popleft()
+                for handler in list(self._handlers.get(event.type, [])):
+                    await self._safe_call(handler, event)
+        finally:
+            del self._lanes[run_id]
+            del self._drainers[run_id]
 
     async def _safe_call(self, handler: EventHandler, event: Event) -> None:
         try:
@@ -0,0 +1,129 @@
+"""Buffered, batched persistence of events into ``event_logs``.
+
+``EventLogWriter.submit`` never blocks and never touches the database: it
+drops the event into a bounded queue. A single background task drains the
+queue and writes a multi-row INSERT whenever the batch is full or the flush
+window elapses, so logging uses at most one connection regardless of how
+many events a run emits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+from app.core.events import Event
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_QUEUE_SIZE = int(os.environ.get("EVENT_LOG_QUEUE_SIZE", "10000"))
+EVENT_LOG_BATCH_SIZE = int(os.environ.get("EVENT_LOG_BATCH_SIZE", "200"))
+EVENT_LOG_FLUSH_INTERVAL = float(os.environ.get("EVENT_LOG_FLUSH_INTERVAL", "0.5"))
+
+
+class EventLogWriter:
+    def __init__(
+        self,
+        max_queue: int = EVENT_LOG_QUEUE_SIZE,
+        batch_size: int = EVENT_LOG_BATCH_SIZE,
+        flush_interval: float = EVENT_LOG_FLUSH_INTERVAL,
+    ) -> None:
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict] | None = None
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, event: Event) -> None:
+        """Queue *event* for persistence. Drops it if the queue is full."""
+        user_id = event.payload.get("user_id")
+        if user_id is None:
+            # event_logs.user_id is NOT NULL — this row could never be written.
+            return
+
+        self.start()
+        try:
+            self._queue.put_nowait({
+                "event_name": event.type,
+                "payload": event.payload,
+                "user_id": user_id,
+                "project_id": event.payload.get("project_id"),
+                "session_id": event.payload.get("session_id"),
+                "run_id": event.payload.get("run_id"),
+                "seq": event.seq,
+                "created_at": event.timestamp,
+            })
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Event log queue full — %d event(s) dropped", self.dropped)
+
+    async def flush(self) -> None:
+        """Wait until every queued event has been written (or failed)."""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def shutdown(self) -> None:
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    # asyncio.timeout, unlike wait_for, never swallows a cancel
+                    async with asyncio.timeout(timeout):
+                        batch.append(await self._queue.get())
+                except TimeoutError:
+                    break
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, rows: list[dict]) -> None:
+        from sqlalchemy import insert
+        from sqlalchemy.exc import IntegrityError
+
+        from app.core.db.base import async_session
+        from app.models.event_log import EventLog
+
+        try:
+            async with async_session() as db:
+                await db.execute(insert(EventLog), rows)
+                await db.commit()
+            return
+        except IntegrityError:
+            if len(rows) == 1:
+                logger.exception("Failed to persist event %s", rows[0]["event_name"])
+                return
+            logger.warning("Event log batch of %d rejected — retrying row by row", len(rows))
+        except Exception:
+            logger.exception("Failed to persist %d event(s)", len(rows))
+            return
+
+        # One bad row (e.g. a deleted user) must not lose the whole batch.
+        for row in rows:
+            await self._write([row])
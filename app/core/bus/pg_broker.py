@@ -0,0 +1,188 @@
+"""Event broker over Postgres LISTEN/NOTIFY.
+
+Each event is NOTIFYed on its user's channel (``events_user_<id>``), or on
+``events_all`` if it has no user. A process LISTENs on ``events_all`` plus
+the channels of the users connected to it, so it only receives their events.
+
+Publishing never blocks the emitter: events are queued and a background
+task sends them in order, a batch per transaction. Payloads too large for
+a NOTIFY message are stored in ``event_relay`` and the notification
+carries only the row id. Those rows are pruned after
+``EVENT_RELAY_RETENTION`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import orjson
+
+from app.core.bus.broker import (
+    BROADCAST_TOPIC,
+    PROCESS_ID,
+    Broker,
+    EventSink,
+    decode_event,
+    encode_event,
+    topic_for,
+    user_topic,
+)
+from app.core.events import Event
+
+logger = logging.getLogger(__name__)
+
+EVENT_RELAY_QUEUE_SIZE = int(os.environ.get("EVENT_RELAY_QUEUE_SIZE", "10000"))
+EVENT_RELAY_BATCH_SIZE = int(os.environ.get("EVENT_RELAY_BATCH_SIZE", "100"))
+EVENT_RELAY_RETENTION = float(os.environ.get("EVENT_RELAY_RETENTION", "300"))
+
+CHANNEL_PREFIX = "events_"
+
+
+class PgBroker(Broker):
+    def __init__(
+        self,
+        max_queue: int = EVENT_RELAY_QUEUE_SIZE,
+        batch_size: int = EVENT_RELAY_BATCH_SIZE,
+        retention: float = EVENT_RELAY_RETENTION,
+    ) -> None:
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._retention = retention
+        self._outbox: asyncio.Queue[tuple[str, bytes]] | None = None
+        self._inbox: asyncio.Queue[str] = asyncio.Queue()
+        self._publisher: asyncio.Task | None = None
+        self._consumer: asyncio.Task | None = None
+        self._listener = None
+        # LISTEN / UNLISTEN calls in flight, kept referenced until done
+        self._control: set[asyncio.Task] = set()
+        self._last_prune = 0.0
+        self.dropped = 0
+
+    # ── Publishing ──
+
+    def publish(self, event: Event) -> None:
+        """Queue *event* for other processes. Drops it if the queue is full."""
+        if self._outbox is None:
+            self._outbox = asyncio.Queue(maxsize=self._max_queue)
+        if self._publisher is None or self._publisher.done():
+            self._publisher = asyncio.create_task(self._publish_loop())
+        try:
+            self._outbox.put_nowait((CHANNEL_PREFIX + topic_for(event), encode_event(event)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Event broker queue full — %d event(s) dropped", self.dropped)
+
+    async def _publish_loop(self) -> None:
+        while True:
+            batch = [await self._outbox.get()]
+            while len(batch) < self._batch_size and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            try:
+                await self._send(batch)
+            except Exception:
+                logger.exception("Failed to publish %d event(s)", len(batch))
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+
+    async def _send(self, batch: list[tuple[str, bytes]]) -> None:
+        from sqlalchemy import delete, insert
+
+        from app.core.db.base import async_session
+        from app.core.db.notify import NOTIFY_MAX_BYTES, notify
+        from app.models.event_relay import EventRelayEntry
+
+        async with async_session() as db:
+            for channel, message in batch:
+                payload = message.decode()
+                if len(message) > NOTIFY_MAX_BYTES:
+                    ref = (await db.execute(
+                        insert(EventRelayEntry).values(payload=payload).returning(EventRelayEntry.id)
+                    )).scalar_one()
+                    payload = orjson.dumps({"origin": PROCESS_ID, "ref": ref}).decode()
+                await notify(db, channel, payload)
+
+            now = time.monotonic()
+            if now - self._last_prune >= self._retention:
+                self._last_prune = now
+                cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._retention)
+                await db.execute(delete(EventRelayEntry).where(EventRelayEntry.created_at < cutoff))
+            await db.commit()
+
+    # ── Subscribing ──
+
+    async def start(self, sink: EventSink) -> None:
+        from app.core.db.notify import Listener
+
+        if self._listener is None:
+            self._listener = Listener({CHANNEL_PREFIX + BROADCAST_TOPIC: self._inbox.put_nowait})
+            await self._listener.start()
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._consume(sink))
+
+    def subscribe_user(self, user_id: int) -> None:
+        if self._listener is not None:
+            self._spawn(self._listener.add(CHANNEL_PREFIX + user_topic(user_id), self._inbox.put_nowait))
+
+    def unsubscribe_user(self, user_id: int) -> None:
+        if self._listener is not None:
+            self._spawn(self._listener.remove(CHANNEL_PREFIX + user_topic(user_id)))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._control.add(task)
+        task.add_done_callback(self._control_done)
+
+    def _control_done(self, task: asyncio.Task) -> None:
+        self._control.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Event broker subscription change failed", exc_info=task.exception())
+
+    async def _consume(self, sink: EventSink) -> None:
+        while True:
+            raw = await self._inbox.get()
+            try:
+                message = orjson.loads(raw)
+                if "ref" in message and message.get("origin") != PROCESS_ID:
+                    message = await self._load(message["ref"])
+                    if message is None:
+                        continue
+                event = decode_event(message)
+                if event is not None:
+                    await sink(event)
+            except Exception:
+                logger.exception("Failed to deliver brokered event")
+
+    @staticmethod
+    async def _load(ref: int) -> dict | None:
+        from app.core.db.base import async_session
+        from app.models.event_relay import EventRelayEntry
+
+        async with async_session() as db:
+            entry = await db.get(EventRelayEntry, ref)
+        if entry is None:
+            logger.warning("Brokered event %d expired before it was read", ref)
+            return None
+        return orjson.loads(entry.payload)
+
+    async def shutdown(self) -> None:
+        if self._outbox is not None and self._publisher is not None and not self._publisher.done():
+            await self._outbox.join()
+        for task in (self._publisher, self._consumer):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._publisher = self._consumer = None
+        if self._control:
+            await asyncio.gather(*self._control, return_exceptions=True)
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
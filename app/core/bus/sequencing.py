@@ -0,0 +1,73 @@
+"""Per-run sequence numbers for emitted events.
+
+Every event whose payload has a ``run_id`` gets ``seq`` 1, 2, 3, ... in
+emit order, so clients can order events, detect gaps and resume from the
+last one they saw. A run's counter is dropped ``RUN_SEQ_RELEASE_DELAY``
+seconds after its terminal event (late events of a cancelled run keep
+counting until then), or once it has been idle for ``RUN_SEQ_IDLE_TTL``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+from app.core.events import Event, EventTypes
+
+RUN_SEQ_RELEASE_DELAY = float(os.environ.get("RUN_SEQ_RELEASE_DELAY", "60"))
+RUN_SEQ_IDLE_TTL = float(os.environ.get("RUN_SEQ_IDLE_TTL", "86400"))
+
+TERMINAL_EVENT_TYPES = {
+    EventTypes.EXECUTION_COMPLETED,
+    EventTypes.EXECUTION_FAILED,
+    EventTypes.EXECUTION_CANCELLED,
+}
+
+_SWEEP_EVERY = 1000
+
+
+class RunSequencer:
+    def __init__(
+        self,
+        release_delay: float = RUN_SEQ_RELEASE_DELAY,
+        idle_ttl: float = RUN_SEQ_IDLE_TTL,
+    ) -> None:
+        self._release_delay = release_delay
+        self._idle_ttl = idle_ttl
+        # run_id → (last seq, last used)
+        self._counters: dict[str, tuple[int, float]] = {}
+        self._assigned = 0
+
+    def assign(self, event: Event) -> None:
+        """Set ``event.seq`` if the event belongs to a run and has none yet."""
+        run_id = event.payload.get("run_id")
+        if run_id is None or event.seq is not None:
+            return
+        now = time.monotonic()
+        seq = self._counters.get(run_id, (0, now))[0] + 1
+        self._counters[run_id] = (seq, now)
+        event.seq = seq
+
+        self._assigned += 1
+        if self._assigned % _SWEEP_EVERY == 0:
+            cutoff = now - self._idle_ttl
+            for key in [k for k, (_, used) in self._counters.items() if used < cutoff]:
+                del self._counters[key]
+
+        if event.type in TERMINAL_EVENT_TYPES:
+            asyncio.get_running_loop().call_later(self._release_delay, self._release, run_id)
+
+    def seed(self, run_id: str, last_seq: int) -> None:
+        """Continue *run_id* after *last_seq* — for a run whose earlier
+        events were emitted by another process.
+        """
+        current = self._counters.get(run_id, (0, 0.0))[0]
+        self._counters[run_id] = (max(current, last_seq), time.monotonic())
+
+    def last_seqs(self) -> dict[str, int]:
+        """The last seq assigned to each run with a live counter."""
+        return {run_id: seq for run_id, (seq, _) in self._counters.items()}
+
+    def _release(self, run_id: str) -> None:
+        self._counters.pop(run_id, None)
@@ -0,0 +1,235 @@
+"""Event broker over a local socket hub.
+
+Run the hub once per host (or per deployment)::
+
+    python -m app.core.bus.socket_broker    # listens on EVENT_BROKER_ADDRESS
+
+and start API and worker processes with ``EVENT_BROKER=socket``. Every
+process keeps one connection to the hub and exchanges newline-delimited
+JSON frames:
+
+- ``{"op": "sub", "topic": "user_7"}`` / ``{"op": "unsub", ...}``
+- ``{"op": "pub", "topic": "user_7", "message": {...}}``
+
+The hub forwards each ``pub`` frame to the other connections subscribed to
+its topic; every connection is subscribed to the broadcast topic. Clients
+reconnect on their own and re-send their subscriptions. Events published
+while disconnected are dropped.
+
+``EVENT_BROKER_ADDRESS`` is ``host:port`` or ``unix:/path/to.sock``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+
+import orjson
+
+from app.core.bus.broker import (
+    BROADCAST_TOPIC,
+    EVENT_BROKER_ADDRESS,
+    Broker,
+    EventSink,
+    decode_event,
+    encode_event,
+    topic_for,
+    user_topic,
+)
+from app.core.events import Event
+
+logger = logging.getLogger(__name__)
+
+EVENT_BROKER_QUEUE_SIZE = int(os.environ.get("EVENT_BROKER_QUEUE_SIZE", "10000"))
+# Frames carry whole events (image outputs included)
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+# The hub stops forwarding to a peer whose unsent output exceeds this
+MAX_PEER_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+async def _open(address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if address.startswith("unix:"):
+        return await asyncio.open_unix_connection(address[5:], limit=MAX_FRAME_BYTES)
+    host, port = address.rsplit(":", 1)
+    return await asyncio.open_connection(host, int(port), limit=MAX_FRAME_BYTES)
+
+
+class SocketBroker(Broker):
+    def __init__(
+        self,
+        address: str = EVENT_BROKER_ADDRESS,
+        max_queue: int = EVENT_BROKER_QUEUE_SIZE,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self._address = address
+        self._reconnect_delay = reconnect_delay
+        self._outbox: asyncio.Queue[bytes] = asyncio.Queue(maxsize=max_queue)
+        self._topics: set[str] = set()
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+        self._connected = asyncio.Event()
+        self.dropped = 0
+
+    async def start(self, sink: EventSink) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(sink))
+        try:
+            async with asyncio.timeout(5):
+                await self._connected.wait()
+        except TimeoutError:
+            logger.warning("Event broker hub at %s not reachable yet — retrying in background", self._address)
+
+    def publish(self, event: Event) -> None:
+        if self._writer is None:
+            return
+        frame = b'{"op":"pub","topic":"%s","message":%s}\n' % (topic_for(event).encode(), encode_event(event))
+        try:
+            self._outbox.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Event broker queue full — %d event(s) dropped", self.dropped)
+
+    def subscribe_user(self, user_id: int) -> None:
+        topic = user_topic(user_id)
+        self._topics.add(topic)
+        self._control("sub", topic)
+
+    def unsubscribe_user(self, user_id: int) -> None:
+        topic = user_topic(user_id)
+        self._topics.discard(topic)
+        self._control("unsub", topic)
+
+    def _control(self, op: str, topic: str) -> None:
+        if self._writer is not None:
+            # Control frames must not be dropped — they bypass the bounded queue
+            self._writer.write(orjson.dumps({"op": op, "topic": topic}) + b"\n")
+
+    async def _run(self, sink: EventSink) -> None:
+        while True:
+            writer = None
+            try:
+                reader, writer = await _open(self._address)
+                for topic in self._topics:
+                    writer.write(orjson.dumps({"op": "sub", "topic": topic}) + b"\n")
+                self._writer = writer
+                self._connected.set()
+                logger.info("Connected to event broker hub at %s", self._address)
+                sender = asyncio.create_task(self._send(writer))
+                try:
+                    await self._receive(reader, sink)
+                finally:
+                    sender.cancel()
+                logger.warning("Event broker hub closed the connection — reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except OSError as exc:
+                logger.warning("Event broker hub at %s unavailable: %s", self._address, exc)
+            except Exception:
+                logger.exception("Event broker connection failed")
+            finally:
+                self._writer = None
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(self._reconnect_delay)
+
+    async def _send(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            writer.write(await self._outbox.get())
+            while not self._outbox.empty():
+                writer.write(self._outbox.get_nowait())
+            await writer.drain()
+
+    @staticmethod
+    async def _receive(reader: asyncio.StreamReader, sink: EventSink) -> None:
+        while line := await reader.readline():
+            try:
+                event = decode_event(orjson.loads(line)["message"])
+                if event is not None:
+                    await sink(event)
+            except Exception:
+                logger.exception("Failed to deliver brokered event")
+
+    async def shutdown(self) -> None:
+        if self._writer is not None:
+            while not self._outbox.empty():
+                self._writer.write(self._outbox.get_nowait())
+            try:
+                await self._writer.drain()
+            except OSError:
+                pass
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class BrokerHub:
+    """The hub: routes ``pub`` frames to subscribed connections."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.StreamWriter]] = defaultdict(set)
+        self.dropped = 0
+
+    async def serve(self, address: str = EVENT_BROKER_ADDRESS) -> None:
+        if address.startswith("unix:"):
+            server = await asyncio.start_unix_server(self._handle, address[5:], limit=MAX_FRAME_BYTES)
+        else:
+            host, port = address.rsplit(":", 1)
+            server = await asyncio.start_server(self._handle, host, int(port), limit=MAX_FRAME_BYTES)
+        logger.info("Event broker hub listening on %s", address)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        topics = {BROADCAST_TOPIC}
+        self._subscribers[BROADCAST_TOPIC].add(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    frame = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logger.warning("Dropping malformed broker frame")
+                    continue
+                op, topic = frame.get("op"), frame.get("topic")
+                if op == "pub":
+                    for peer in self._subscribers.get(topic, ()):
+                        if peer is writer:
+                            continue
+                        if peer.transport.get_write_buffer_size() > MAX_PEER_BUFFER_BYTES:
+                            self.dropped += 1
+                            if self.dropped == 1 or self.dropped % 1000 == 0:
+                                logger.warning("Slow broker peer — %d frame(s) dropped", self.dropped)
+                            continue
+                        peer.write(line)
+                elif op == "sub":
+                    topics.add(topic)
+                    self._subscribers[topic].add(writer)
+                elif op == "unsub" and topic != BROADCAST_TOPIC:
+                    topics.discard(topic)
+                    self._unsubscribe(topic, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for topic in topics:
+                self._unsubscribe(topic, writer)
+            writer.close()
+
+    def _unsubscribe(self, topic: str, writer: asyncio.StreamWriter) -> None:
+        subscribers = self._subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(writer)
+            if not subscribers:
+                del self._subscribers[topic]
+
+
+if __name__ == "__main__":
+    from app.core.logger import setup_logging
+
+    setup_logging()
+    asyncio.run(BrokerHub().serve())
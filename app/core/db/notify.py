@@ -0,0 +1,113 @@
+"""Postgres LISTEN/NOTIFY helpers.
+
+``notify`` sends inside the caller's transaction, so the message is
+delivered only if (and when) it commits. ``Listener`` holds one dedicated
+asyncpg connection outside the SQLAlchemy pool and reconnects (and
+re-LISTENs) if it drops; channels can be added and removed while it runs.
+Callbacks run on the event loop and must not block.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.base import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_MAX_BYTES = 7999
+
+NotifyCallback = Callable[[str], None]
+
+
+async def notify(db: AsyncSession, channel: str, payload: str = "") -> None:
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+class Listener:
+    def __init__(self, channels: dict[str, NotifyCallback], reconnect_delay: float = 1.0) -> None:
+        self._channels = dict(channels)
+        self._reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        self._conn = None
+        self._callbacks: dict[str, Callable] = {}
+        # Serializes LISTEN/UNLISTEN on the shared connection
+        self._lock = asyncio.Lock()
+
+    async def add(self, channel: str, callback: NotifyCallback) -> None:
+        async with self._lock:
+            if channel in self._channels:
+                return
+            self._channels[channel] = callback
+            if self._conn is not None:
+                await self._listen(self._conn, channel, callback)
+
+    async def remove(self, channel: str) -> None:
+        async with self._lock:
+            self._channels.pop(channel, None)
+            on_notify = self._callbacks.pop(channel, None)
+            if self._conn is not None and on_notify is not None:
+                try:
+                    await self._conn.remove_listener(channel, on_notify)
+                except Exception:
+                    logger.exception("UNLISTEN %s failed", channel)
+
+    async def start(self) -> None:
+        """Connect and LISTEN; returns once the first connection is listening."""
+        if self._task is None or self._task.done():
+            self._ready.clear()
+            self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        dsn = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                async with self._lock:
+                    self._callbacks = {}
+                    for channel, callback in self._channels.items():
+                        await self._listen(conn, channel, callback)
+                    self._conn = conn
+                self._ready.set()
+                await lost.wait()
+                logger.warning("LISTEN connection lost — reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("LISTEN connection failed — retrying in %.0fs", self._reconnect_delay)
+            finally:
+                self._conn = None
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            # Notifications sent while disconnected are lost; callers poll as a backstop
+            self._ready.set()
+            await asyncio.sleep(self._reconnect_delay)
+
+    async def _listen(self, conn, channel: str, callback: NotifyCallback) -> None:
+        def on_notify(_conn, _pid, _channel, payload, cb=callback) -> None:
+            cb(payload)
+
+        await conn.add_listener(channel, on_notify)
+        self._callbacks[channel] = on_notify
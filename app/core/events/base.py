@@ -9,3 +9,5 @@ class Event(BaseModel):
     type: str
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     payload: dict = Field(default_factory=dict)
+    # Position within its run (events with a ``run_id``), assigned on emit
+    seq: int | None = None
@@ -11,6 +11,8 @@ class EventTypes:
     EXECUTION_STARTED = "execution.started"
     EXECUTION_COMPLETED = "execution.completed"
     EXECUTION_FAILED = "execution.failed"
+    EXECUTION_QUEUED = "execution.queued"
+    EXECUTION_CANCELLED = "execution.cancelled"
 
     # Execution — node level
     NODE_PENDING = "execution.node.pending"
@@ -18,3 +20,4 @@ class EventTypes:
     NODE_COMPLETED = "execution.node.completed"
     NODE_FAILED = "execution.node.failed"
     NODE_SKIPPED = "execution.node.skipped"
+    NODE_DELTA = "execution.node.delta"
@@ -1,3 +1,6 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -8,23 +11,72 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "4"))
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
+class PasswordHasher:
+    """bcrypt on a bounded thread pool, off the event loop.
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+    A bcrypt round trip takes ~200 ms at the default work factor; run inline
+    it would stall every WebSocket and execution in the process. At most
+    ``PASSWORD_HASH_WORKERS`` hashes run at once, the rest wait their turn.
+    """
 
+    def __init__(self, rounds: int = BCRYPT_ROUNDS, workers: int = PASSWORD_HASH_WORKERS) -> None:
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
 
-def create_access_token(user_id: int) -> str:
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self._verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether *hashed* was made with a different work factor than ``rounds``."""
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=self.rounds)).decode()
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+password_hasher = PasswordHasher()
+
+
+# ``scope`` claim of tokens issued to backoffice users — their ids are a
+# separate sequence from users.id, so the tokens must not be interchangeable
+BACKOFFICE_SCOPE = "backoffice"
+
+
+def _encode(user_id: int, token_type: str, expire: datetime, scope: str | None) -> str:
+    claims = {"sub": str(user_id), "exp": expire, "type": token_type}
+    if scope is not None:
+        claims["scope"] = scope
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def create_access_token(user_id: int, scope: str | None = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    return jwt.encode({"sub": str(user_id), "exp": expire, "type": "access"}, SECRET_KEY, algorithm=ALGORITHM)
+    return _encode(user_id, "access", expire, scope)
 
 
-def create_refresh_token(user_id: int) -> str:
+def create_refresh_token(user_id: int, scope: str | None = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    return jwt.encode({"sub": str(user_id), "exp": expire, "type": "refresh"}, SECRET_KEY, algorithm=ALGORITHM)
+    return _encode(user_id, "refresh", expire, scope)
 
 
 def decode_token(token: str) -> dict:
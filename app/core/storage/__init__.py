@@ -0,0 +1,3 @@
+from app.core.storage.blob_store import LocalBlobStore, blob_store, blob_url, parse_blob_url
+
+__all__ = ["LocalBlobStore", "blob_store", "blob_url", "parse_blob_url"]
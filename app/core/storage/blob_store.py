@@ -0,0 +1,87 @@
+"""Content-addressed blob store for images produced or consumed by runs.
+
+Blobs are keyed by ``<sha256>.<ext>`` and stored on the local filesystem
+under ``BLOB_STORE_DIR``. Node outputs and events carry only the short blob
+URL returned by ``blob_url``; the bytes are served by the ``/blobs`` endpoint.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import re
+from pathlib import Path
+
+BLOB_STORE_DIR = os.environ.get("BLOB_STORE_DIR", "data/blobs")
+BLOB_URL_PREFIX = "/api/v1/blobs/"
+
+EXTENSIONS: dict[str, str] = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+CONTENT_TYPES: dict[str, str] = {ext: ct for ct, ext in EXTENSIONS.items()}
+
+_KEY_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,8}$")
+_DATA_URI_RE = re.compile(r"data:([^;]+);base64,(.+)", re.DOTALL)
+
+
+def blob_url(key: str) -> str:
+    return f"{BLOB_URL_PREFIX}{key}"
+
+
+def parse_blob_url(value: str) -> str | None:
+    """Return the blob key if *value* is a blob URL, else ``None``."""
+    if not value.startswith(BLOB_URL_PREFIX):
+        return None
+    key = value[len(BLOB_URL_PREFIX):]
+    return key if _KEY_RE.match(key) else None
+
+
+class LocalBlobStore:
+    def __init__(self, root: str = BLOB_STORE_DIR) -> None:
+        self._root = Path(root)
+
+    def path_for(self, key: str) -> Path | None:
+        """Filesystem path for *key*, or ``None`` if the key is malformed."""
+        if not _KEY_RE.match(key):
+            return None
+        return self._root / key[:2] / key
+
+    def content_type_for(self, key: str) -> str:
+        return CONTENT_TYPES.get(key.rsplit(".", 1)[-1], "application/octet-stream")
+
+    async def put(self, data: bytes, content_type: str) -> str:
+        """Store *data* and return its key. Storing the same bytes twice is a no-op."""
+        ext = EXTENSIONS.get(content_type, "bin")
+        key = f"{hashlib.sha256(data).hexdigest()}.{ext}"
+        await asyncio.to_thread(self._write, self.path_for(key), data)
+        return key
+
+    async def get(self, key: str) -> bytes:
+        path = self.path_for(key)
+        if path is None:
+            raise KeyError(key)
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    async def put_data_uri(self, data_uri: str) -> str:
+        """Store a ``data:<type>;base64,...`` URI (or raw base64 PNG) and return its key."""
+        match = _DATA_URI_RE.match(data_uri)
+        content_type, b64 = (match.group(1), match.group(2)) if match else ("image/png", data_uri)
+        return await self.put(base64.b64decode(b64), content_type)
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+blob_store = LocalBlobStore()
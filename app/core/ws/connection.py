@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from enum import Enum
+
+from fastapi import WebSocket
+
+from app.core.ws.models import WSMessage
+
+logger = logging.getLogger(__name__)
+
+WS_SEND_QUEUE_SIZE = int(os.environ.get("WS_SEND_QUEUE_SIZE", "1024"))
+
+# Message types where only the latest message per (type, run_id, node_id) matters
+COALESCABLE_TYPES = {"execution.node.status"}
+
+# Message types a full queue may shed, lowest rank first. Everything else
+# (node outputs, terminal run events, ...) is never dropped: the UI would
+# be left stuck, so the socket is closed instead and the client resumes.
+EVICTION_RANKS = {
+    "execution.node.delta": 0,
+    "execution.node.status": 1,
+    "execution.queued": 1,
+}
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's outbound queue is full.
+
+    - ``drop``: discard the oldest sheddable message (see ``EVICTION_RANKS``).
+    - ``coalesce``: replace a queued message with the same coalesce key
+      (e.g. an older status of the same node); otherwise drop as above.
+    - ``disconnect``: close the socket — the client is expected to reconnect.
+
+    ``drop`` and ``coalesce`` disconnect too when nothing sheddable is left.
+    """
+
+    DROP = "drop"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+WS_SLOW_CONSUMER_POLICY = SlowConsumerPolicy(
+    os.environ.get("WS_SLOW_CONSUMER_POLICY", SlowConsumerPolicy.COALESCE.value)
+)
+
+
+def coalesce_key(message: WSMessage) -> tuple | None:
+    if message.type not in COALESCABLE_TYPES:
+        return None
+    return (message.type, message.data.get("run_id"), message.data.get("node_id"))
+
+
+class ClientConnection:
+    """One WebSocket with its own bounded outbound queue and writer task.
+
+    ``send`` never awaits the socket, so a stalled client only ever fills its
+    own queue and cannot delay delivery to anyone else.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        ws: WebSocket,
+        max_queue: int = WS_SEND_QUEUE_SIZE,
+        policy: SlowConsumerPolicy = WS_SLOW_CONSUMER_POLICY,
+    ) -> None:
+        self.user_id = user_id
+        self.ws = ws
+        self._max_queue = max_queue
+        self._policy = policy
+        # (coalesce key, eviction rank, encoded message)
+        self._queue: deque[tuple[tuple | None, int | None, str]] = deque()
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        # Referenced so the close isn't garbage-collected while in progress
+        self._close_task: asyncio.Task | None = None
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self.closed = False
+        self.dropped = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._writer())
+
+    def stop(self) -> None:
+        self.closed = True
+        if self._task is not None:
+            self._task.cancel()
+
+    def send(self, message: WSMessage, encoded: str | None = None) -> None:
+        """Queue *message*. Pass *encoded* (``message.encode()``) when sending
+        the same message to several connections so it is serialized once.
+        """
+        if self.closed:
+            return
+
+        key = coalesce_key(message)
+        rank = EVICTION_RANKS.get(message.type)
+        item = (key, rank, encoded if encoded is not None else message.encode())
+
+        if len(self._queue) >= self._max_queue:
+            if self._policy is SlowConsumerPolicy.DISCONNECT:
+                self._disconnect()
+                return
+            if self._policy is SlowConsumerPolicy.COALESCE and key is not None:
+                for i, (queued_key, _, _) in enumerate(self._queue):
+                    if queued_key == key:
+                        self._queue[i] = item
+                        return
+            if not self._make_room(rank):
+                return
+
+        self._queue.append(item)
+        self._ready.set()
+
+    def _make_room(self, rank: int | None) -> bool:
+        """Shed the oldest lowest-ranked queued message, unless the incoming
+        one (of *rank*) is the least important. Returns whether to queue it.
+        """
+        victim = None
+        for i, (_, queued_rank, _) in enumerate(self._queue):
+            if queued_rank is not None and (victim is None or queued_rank < self._queue[victim][1]):
+                victim = i
+                if queued_rank == 0:
+                    break
+        self.dropped += 1
+        if victim is not None and (rank is None or self._queue[victim][1] <= rank):
+            del self._queue[victim]
+            return True
+        if rank is None:
+            self._disconnect()
+        return False
+
+    def _disconnect(self) -> None:
+        logger.warning("WS slow consumer: disconnecting user %d", self.user_id)
+        self.stop()
+        if self._close_task is None:
+            self._close_task = asyncio.create_task(self._close(code=1013, reason="Slow consumer"))
+
+    @asynccontextmanager
+    async def paused(self) -> AsyncIterator[None]:
+        """Hold outgoing messages (they keep queueing) for the duration."""
+        self._resumed.clear()
+        try:
+            yield
+        finally:
+            self._resumed.set()
+
+    def send_first(self, messages: list[WSMessage]) -> None:
+        """Queue *messages*, in order, ahead of everything already queued.
+
+        Used to replay missed messages before the live ones that arrived
+        while the connection was ``paused``. Not subject to the queue bound.
+        """
+        if self.closed or not messages:
+            return
+        self._queue.extendleft((None, None, m.encode()) for m in reversed(messages))
+        self._ready.set()
+
+    async def _writer(self) -> None:
+        while True:
+            await self._resumed.wait()
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            _, _, payload = self._queue.popleft()
+            try:
+                await self.ws.send_text(payload)
+            except Exception:
+                logger.warning("Failed to send to user %d — stopping writer", self.user_id)
+                self.closed = True
+                return
+
+    async def _close(self, code: int, reason: str) -> None:
+        try:
+            await self.ws.close(code=code, reason=reason)
+        except Exception:
+            logger.debug("Failed to close WS of user %d", self.user_id, exc_info=True)
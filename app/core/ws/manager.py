@@ -3,6 +3,8 @@ from collections import defaultdict
 
 from fastapi import WebSocket
 
+from app.core.bus import event_bus
+from app.core.ws.connection import ClientConnection
 from app.core.ws.models import WSMessage
 
 logger = logging.getLogger(__name__)
@@ -10,29 +12,47 @@ logger = logging.getLogger(__name__)
 
 class ConnectionManager:
     def __init__(self) -> None:
-        self._connections: dict[int, list[WebSocket]] = defaultdict(list)
+        self._connections: dict[int, list[ClientConnection]] = defaultdict(list)
 
-    async def connect(self, user_id: int, ws: WebSocket) -> None:
+    async def connect(self, user_id: int, ws: WebSocket) -> ClientConnection:
         await ws.accept()
-        self._connections[user_id].append(ws)
+        conn = ClientConnection(user_id, ws)
+        conn.start()
+        if not self._connections.get(user_id):
+            # First socket of this user here — route their events to this process
+            event_bus.subscribe_user(user_id)
+        self._connections[user_id].append(conn)
         logger.info("WS connected: user %d (%d total)", user_id, self.count)
+        return conn
 
     def disconnect(self, user_id: int, ws: WebSocket) -> None:
-        self._connections[user_id].remove(ws)
-        if not self._connections[user_id]:
+        conns = self._connections.get(user_id, [])
+        for conn in conns:
+            if conn.ws is ws:
+                conn.stop()
+                conns.remove(conn)
+                break
+        else:
+            return
+        if not conns:
             del self._connections[user_id]
+            event_bus.unsubscribe_user(user_id)
         logger.info("WS disconnected: user %d (%d total)", user_id, self.count)
 
     async def send_to_user(self, user_id: int, message: WSMessage) -> None:
-        for ws in self._connections.get(user_id, []):
-            try:
-                await ws.send_json(message.model_dump())
-            except Exception:
-                logger.warning("Failed to send to user %d", user_id)
+        """Queue *message* on every connection of *user_id*. Never blocks on sockets."""
+        conns = self._connections.get(user_id)
+        if not conns:
+            return
+        encoded = message.encode()
+        for conn in conns:
+            conn.send(message, encoded)
 
     async def broadcast(self, message: WSMessage) -> None:
-        for user_id in list(self._connections):
-            await self.send_to_user(user_id, message)
+        encoded = message.encode()
+        for conns in self._connections.values():
+            for conn in conns:
+                conn.send(message, encoded)
 
     @property
     def count(self) -> int:
@@ -1,6 +1,14 @@
+import orjson
 from pydantic import BaseModel, Field
 
 
 class WSMessage(BaseModel):
     type: str
     data: dict = Field(default_factory=dict)
+
+    def encode(self) -> str:
+        """Serialize to the JSON text frame sent over the wire.
+
+        Encode once and reuse the result for every recipient socket.
+        """
+        return orjson.dumps({"type": self.type, "data": self.data}).decode()
@@ -4,8 +4,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import router as v1_router
+from app.core.bus import event_bus
+from app.core.bus.broker import make_broker
 from app.core.di.discovery import discover_handlers, discover_managers
+from app.core.di.registry import registry
 from app.core.logger import setup_logging
+from app.core.security import password_hasher
+from app.modules.execution.admission import run_scheduler
+from app.modules.execution.manager import ExecutionManager
+from app.modules.execution.run_queue import EXECUTION_BACKEND, ExecutionBackend
+from app.modules.execution.run_store import run_store
 
 
 @asynccontextmanager
@@ -13,7 +21,18 @@ async def lifespan(app: FastAPI):
     setup_logging()
     discover_managers("app.modules")
     discover_handlers("app.modules")
+    event_bus.start()
+    await event_bus.use_broker(make_broker())
+    run_store.start()
+    # With the queue backend, runs are resumed by app.worker processes
+    if EXECUTION_BACKEND is ExecutionBackend.LOCAL:
+        await registry.resolve(ExecutionManager).resume_stale_runs()
     yield
+    # Cancel running runs before their rows are released to other workers
+    await run_scheduler.shutdown()
+    await run_store.shutdown()
+    await event_bus.shutdown()
+    password_hasher.shutdown()
 
 
 def create_app() -> FastAPI:
@@ -9,6 +9,10 @@ from app.models.component_output_schema import ComponentOutputSchema
 from app.models.flow import Flow
 from app.models.consistent_character import ConsistentCharacter
 from app.models.event_log import EventLog
+from app.models.node_output_cache import NodeOutputCacheEntry
+from app.models.execution_run import ExecutionRun
+from app.models.execution_node_state import ExecutionNodeState
+from app.models.event_relay import EventRelayEntry
 
 __all__ = [
     "User",
@@ -22,4 +26,8 @@ __all__ = [
     "Flow",
     "ConsistentCharacter",
     "EventLog",
+    "NodeOutputCacheEntry",
+    "ExecutionRun",
+    "ExecutionNodeState",
+    "EventRelayEntry",
 ]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, Integer, Uuid, ForeignKey, JSON
+from sqlalchemy import String, DateTime, Integer, Uuid, ForeignKey, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,6 +9,10 @@ from app.core.db import Base
 
 class EventLog(Base):
     __tablename__ = "event_logs"
+    __table_args__ = (
+        # Replay of a run's events after a WebSocket reconnect
+        Index("ix_event_logs_run_id_seq", "run_id", "seq"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid, primary_key=True, default=uuid.uuid4
@@ -24,6 +28,8 @@ class EventLog(Base):
     session_id: Mapped[str | None] = mapped_column(
         String(255), nullable=True, index=True
     )
+    run_id: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    seq: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class EventRelayEntry(Base):
+    """Payload of a relayed event too large for a NOTIFY message (8000 bytes)."""
+
+    __tablename__ = "event_relay"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    payload: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+    )
@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import String, Boolean, DateTime, Integer, ForeignKey, JSON, Text, false
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class ExecutionRun(Base):
+    __tablename__ = "execution_runs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), index=True
+    )
+    flow_id: Mapped[str] = mapped_column(String(255), index=True)
+    # queued | running | completed | failed | cancelled
+    status: Mapped[str] = mapped_column(String(20), index=True, default="queued")
+    # Everything needed to re-plan the run: nodes, edges, provider_id, ...
+    request: Mapped[dict] = mapped_column(JSON)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    worker_id: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, index=True
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    # Set by the API process; the owning worker cancels the run on its next poll
+    cancel_requested: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false()
+    )
+    superseded_by: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # Last event seq of the run as of its owner's latest heartbeat (or release);
+    # whoever takes the run over continues numbering after it
+    last_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
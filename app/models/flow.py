@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, Integer, Uuid, ForeignKey, JSON
+from sqlalchemy import String, DateTime, Integer, Uuid, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,6 +10,17 @@ from app.core.db import Base
 
 class Flow(Base):
     __tablename__ = "flows"
+    __table_args__ = (
+        # Keyset pagination of a project's flows (POST /flows/list)
+        Index("ix_flows_user_project_updated_at", "user_id", "project_id", "updated_at", "id"),
+        # Containment queries on the graph (GET /flows/search)
+        Index(
+            "ix_flows_graph_data",
+            "graph_data",
+            postgresql_using="gin",
+            postgresql_ops={"graph_data": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid, primary_key=True, default=uuid.uuid4
@@ -20,7 +32,9 @@ class Flow(Base):
     project_id: Mapped[int | None] = mapped_column(
         Integer, ForeignKey("projects.id"), nullable=True, index=True
     )
-    graph_data: Mapped[dict] = mapped_column(JSON)
+    graph_data: Mapped[dict] = mapped_column(JSONB)
+    # Bumped on every save; writers send the version they edited (409 if stale)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
@@ -0,0 +1,19 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import String, DateTime, Integer, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class NodeOutputCacheEntry(Base):
+    __tablename__ = "node_output_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    node_type: Mapped[str] = mapped_column(String(100), index=True)
+    output: Mapped[dict] = mapped_column(JSON)
+    size_bytes: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
@@ -0,0 +1,245 @@
+"""Admission control and fair-share scheduling of execution runs.
+
+Every run goes through ``run_scheduler`` instead of a bare
+``asyncio.create_task``. At most ``EXECUTION_MAX_CONCURRENT_RUNS`` runs
+execute at once, with per-user (and optional per-tenant) caps. Runs that
+can't start yet wait in a queue ordered by weighted fair queuing: each
+user's runs get virtual finish tags, so a user with 50 queued runs does
+not hold back a user who just submitted one. Queued runs receive
+``execution.queued`` events with their current position.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.core.bus import event_bus
+from app.core.events import Event, EventTypes
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_MAX_CONCURRENT_RUNS = int(os.environ.get("EXECUTION_MAX_CONCURRENT_RUNS", "16"))
+EXECUTION_MAX_RUNS_PER_USER = int(os.environ.get("EXECUTION_MAX_RUNS_PER_USER", "2"))
+# 0 = unlimited
+EXECUTION_MAX_RUNS_PER_TENANT = int(os.environ.get("EXECUTION_MAX_RUNS_PER_TENANT", "0"))
+EXECUTION_MAX_QUEUED_PER_USER = int(os.environ.get("EXECUTION_MAX_QUEUED_PER_USER", "10"))
+
+
+class AdmissionRejected(Exception):
+    """Raised by ``RunScheduler.submit`` when a user's queue is full."""
+
+
+@dataclass
+class _QueuedRun:
+    run_id: str
+    user_id: int
+    tenant_id: str | None
+    run: Callable[[], Awaitable[None]]
+    start_tag: float
+    finish_tag: float
+    seq: int
+    position: int | None = None
+    task: asyncio.Task | None = None
+
+
+@dataclass
+class SchedulerStats:
+    admitted: int = 0
+    queued: int = 0
+    rejected: int = 0
+    max_queue_depth: int = 0
+
+
+class RunScheduler:
+    def __init__(
+        self,
+        max_concurrent: int = EXECUTION_MAX_CONCURRENT_RUNS,
+        max_per_user: int = EXECUTION_MAX_RUNS_PER_USER,
+        max_per_tenant: int = EXECUTION_MAX_RUNS_PER_TENANT,
+        max_queued_per_user: int = EXECUTION_MAX_QUEUED_PER_USER,
+        tenant_of: Callable[[int], str | None] = lambda user_id: None,
+        weight_of: Callable[[int], float] = lambda user_id: 1.0,
+    ) -> None:
+        self._max_concurrent = max_concurrent
+        self._max_per_user = max_per_user
+        self._max_per_tenant = max_per_tenant
+        self._max_queued_per_user = max_queued_per_user
+        self._tenant_of = tenant_of
+        self._weight_of = weight_of
+
+        self._queue: list[_QueuedRun] = []
+        self._running: dict[str, _QueuedRun] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._running_per_user: dict[int, int] = {}
+        self._running_per_tenant: dict[str, int] = {}
+        # Weighted fair queuing: global virtual time + each user's last finish tag
+        self._vtime = 0.0
+        self._user_finish: dict[int, float] = {}
+        self._seq = itertools.count()
+        self.stats = SchedulerStats()
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._queue)
+
+    @property
+    def free_slots(self) -> int:
+        """Runs that could be submitted now without waiting in the queue
+        (ignoring per-user caps).
+        """
+        return max(0, self._max_concurrent - len(self._running) - len(self._queue))
+
+    def is_running(self, run_id: str) -> bool:
+        return run_id in self._running
+
+    async def submit(self, run_id: str, user_id: int, run: Callable[[], Awaitable[None]]) -> None:
+        """Admit *run* now or queue it. Never waits for the run itself.
+
+        Raises ``AdmissionRejected`` if *user_id* already has
+        ``max_queued_per_user`` runs waiting.
+        """
+        queued_for_user = sum(1 for q in self._queue if q.user_id == user_id)
+        if self._max_queued_per_user and queued_for_user >= self._max_queued_per_user:
+            self.stats.rejected += 1
+            raise AdmissionRejected(
+                f"Too many queued runs ({queued_for_user}) — wait for one to finish",
+            )
+
+        weight = max(self._weight_of(user_id), 1e-6)
+        start_tag = max(self._vtime, self._user_finish.get(user_id, 0.0))
+        finish_tag = start_tag + 1.0 / weight
+        self._user_finish[user_id] = finish_tag
+
+        self._queue.append(_QueuedRun(
+            run_id=run_id,
+            user_id=user_id,
+            tenant_id=self._tenant_of(user_id),
+            run=run,
+            start_tag=start_tag,
+            finish_tag=finish_tag,
+            seq=next(self._seq),
+        ))
+        await self._dispatch()
+
+    async def cancel(self, run_id: str, user_id: int | None = None) -> bool:
+        """Cancel a queued or running run. Returns ``False`` if *run_id* is
+        unknown (or finished) or belongs to a different user.
+        """
+        for entry in self._queue:
+            if entry.run_id == run_id:
+                if user_id is not None and entry.user_id != user_id:
+                    return False
+                self._queue.remove(entry)
+                await self._dispatch()
+                return True
+
+        entry = self._running.get(run_id)
+        if entry is None or (user_id is not None and entry.user_id != user_id):
+            return False
+        # Cancels the run's whole task tree; _run releases the slot
+        entry.task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        """Drop queued runs and cancel running ones, without marking them
+        finished — their ``execution_runs`` rows stay active for another
+        worker to resume.
+        """
+        self._queue.clear()
+        tasks = [entry.task for entry in self._running.values() if entry.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _dispatch(self) -> None:
+        self._queue.sort(key=lambda q: (q.finish_tag, q.seq))
+
+        still_queued: list[_QueuedRun] = []
+        for entry in self._queue:
+            if len(self._running) < self._max_concurrent and self._has_quota(entry):
+                self._start(entry)
+            else:
+                still_queued.append(entry)
+        self._queue = still_queued
+
+        depth = len(self._queue)
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+        for position, entry in enumerate(self._queue, start=1):
+            if entry.position == position:
+                continue
+            first = entry.position is None
+            if first:
+                self.stats.queued += 1
+            entry.position = position
+            # Only the initial queueing is worth logging; position updates are transient
+            await event_bus.emit(Event(
+                type=EventTypes.EXECUTION_QUEUED,
+                payload={
+                    "run_id": entry.run_id, "user_id": entry.user_id,
+                    "position": position, "queue_depth": depth,
+                },
+            ), persist=first)
+
+    def _has_quota(self, entry: _QueuedRun) -> bool:
+        if self._max_per_user and self._running_per_user.get(entry.user_id, 0) >= self._max_per_user:
+            return False
+        if (
+            self._max_per_tenant
+            and entry.tenant_id is not None
+            and self._running_per_tenant.get(entry.tenant_id, 0) >= self._max_per_tenant
+        ):
+            return False
+        return True
+
+    def _start(self, entry: _QueuedRun) -> None:
+        self._vtime = max(self._vtime, entry.start_tag)
+        self._running[entry.run_id] = entry
+        self._running_per_user[entry.user_id] = self._running_per_user.get(entry.user_id, 0) + 1
+        if entry.tenant_id is not None:
+            self._running_per_tenant[entry.tenant_id] = self._running_per_tenant.get(entry.tenant_id, 0) + 1
+        self.stats.admitted += 1
+
+        task = entry.task = asyncio.create_task(self._run(entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, entry: _QueuedRun) -> None:
+        try:
+            await entry.run()
+        except Exception:
+            logger.exception("Run %s raised outside the runner", entry.run_id)
+        finally:
+            self._release(entry)
+            await self._dispatch()
+
+    def _release(self, entry: _QueuedRun) -> None:
+        self._running.pop(entry.run_id, None)
+        self._decrement(self._running_per_user, entry.user_id)
+        if entry.tenant_id is not None:
+            self._decrement(self._running_per_tenant, entry.tenant_id)
+
+        # Forget finish tags of idle users so the map doesn't grow forever
+        busy = {q.user_id for q in self._queue} | set(self._running_per_user)
+        for user_id in [u for u, tag in self._user_finish.items() if u not in busy and tag <= self._vtime]:
+            del self._user_finish[user_id]
+
+    @staticmethod
+    def _decrement(counts: dict, key) -> None:
+        remaining = counts.get(key, 0) - 1
+        if remaining > 0:
+            counts[key] = remaining
+        else:
+            counts.pop(key, None)
+
+
+run_scheduler = RunScheduler()
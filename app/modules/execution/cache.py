@@ -0,0 +1,182 @@
+"""Content-addressed cache for node outputs, shared across runs.
+
+A node's cache key hashes everything its output depends on: node type,
+resolved provider/model/temperature, the relevant ``node_data`` fields and
+the upstream outputs. Two runs that would send the same provider request
+therefore share one entry.
+
+Entries live in an in-memory LRU bounded by serialized size. Set
+``NODE_CACHE_PERSIST=1`` to also read through to / write behind into the
+``node_output_cache`` table, so outputs survive restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+from app.modules.execution.config.cache_keys import CACHE_KEY_FIELDS, SEEDED_NODE_TYPES
+from app.modules.execution.models import NodeOutput, ResolvedModel
+
+logger = logging.getLogger(__name__)
+
+NODE_CACHE_MAX_BYTES = int(os.environ.get("NODE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+NODE_CACHE_PERSIST = os.environ.get("NODE_CACHE_PERSIST", "").lower() in ("1", "true", "yes")
+
+
+def _digest(value: object) -> str:
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def hash_output(output: NodeOutput) -> str:
+    """Hash the content of *output*, ignoring timing."""
+    return _digest(output.model_dump(exclude_none=True, exclude={"duration_ms"}))
+
+
+def is_cacheable(node_type: str, node_data: dict) -> bool:
+    if node_type in SEEDED_NODE_TYPES:
+        return node_data.get("seed") is not None
+    return node_type in CACHE_KEY_FIELDS
+
+
+def compute_cache_key(
+    node_type: str,
+    resolved: ResolvedModel,
+    node_data: dict,
+    text_inputs: list[NodeOutput],
+    adapter_inputs: list[NodeOutput],
+) -> str:
+    """Return the content address of a node execution."""
+    fields = CACHE_KEY_FIELDS.get(node_type, ())
+    return _digest({
+        "node_type": node_type,
+        "provider_id": resolved.provider_id,
+        "model": resolved.model,
+        "temperature": resolved.temperature,
+        "data": {f: node_data.get(f) for f in fields},
+        "text_inputs": [hash_output(o) for o in text_inputs],
+        "adapter_inputs": [hash_output(o) for o in adapter_inputs],
+    })
+
+
+class NodeOutputCache:
+    def __init__(self, max_bytes: int = NODE_CACHE_MAX_BYTES, persist: bool = NODE_CACHE_PERSIST) -> None:
+        self._max_bytes = max_bytes
+        self._persist = persist
+        self._entries: OrderedDict[str, tuple[NodeOutput, int]] = OrderedDict()
+        self._size = 0
+        self._in_flight: dict[str, asyncio.Future] = {}
+        # Write-behind saves — referenced until done so they can't be collected mid-write
+        self._saves: set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    async def get(self, key: str) -> NodeOutput | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].model_copy()
+
+        output = await self._load(key) if self._persist else None
+        if output is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._store(key, output)
+        return output.model_copy()
+
+    async def put(self, key: str, node_type: str, output: NodeOutput) -> None:
+        if output.error:
+            return
+        size = self._store(key, output)
+        if self._persist and size:
+            task = asyncio.create_task(self._save(key, node_type, output, size))
+            self._saves.add(task)
+            task.add_done_callback(self._saves.discard)
+
+    def in_flight(self, key: str) -> asyncio.Future | None:
+        """Future for *key* if a node with that key is executing right now.
+
+        Resolves to the output, or ``None`` if that execution failed.
+        """
+        future = self._in_flight.get(key)
+        return future if future is not None and not future.done() else None
+
+    def begin(self, key: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        return future
+
+    def end(self, key: str, future: asyncio.Future, output: NodeOutput | None) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.done():
+            future.set_result(output.model_copy() if output and not output.error else None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _store(self, key: str, output: NodeOutput) -> int:
+        size = len(output.model_dump_json(exclude_none=True))
+        if size > self._max_bytes:
+            return 0
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[1]
+        self._entries[key] = (output.model_copy(), size)
+        self._size += size
+
+        while self._size > self._max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= evicted
+        return size
+
+    async def _load(self, key: str) -> NodeOutput | None:
+        try:
+            from app.core.db.base import async_session
+            from app.models.node_output_cache import NodeOutputCacheEntry
+
+            async with async_session() as db:
+                row = await db.get(NodeOutputCacheEntry, key)
+                return NodeOutput(**row.output) if row else None
+        except Exception:
+            logger.exception("Failed to load cached output %s", key)
+            return None
+
+    async def _save(self, key: str, node_type: str, output: NodeOutput, size: int) -> None:
+        try:
+            from sqlalchemy.dialects.postgresql import insert
+
+            from app.core.db.base import async_session
+            from app.models.node_output_cache import NodeOutputCacheEntry
+
+            async with async_session() as db:
+                await db.execute(
+                    insert(NodeOutputCacheEntry)
+                    .values(
+                        key=key,
+                        node_type=node_type,
+                        output=output.model_dump(exclude_none=True),
+                        size_bytes=size,
+                    )
+                    .on_conflict_do_nothing(index_elements=["key"])
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to persist cached output %s", key)
+
+
+node_output_cache = NodeOutputCache()
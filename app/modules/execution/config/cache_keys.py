@@ -0,0 +1,27 @@
+"""Per-node-type ``node_data`` fields that affect a node's output.
+
+Only node types listed here are cached — they are the ones that call a
+provider. Anything else (layout, labels, UI status) is left out of the key
+so that cosmetic edits don't invalidate cached outputs.
+
+Node types in ``SEEDED_NODE_TYPES`` produce a new sample on every run
+unless their ``node_data`` pins a ``seed``, which is passed to the provider
+and is then part of the key. They are only cached when seeded.
+
+``storyTeller`` is not cached at all: the text providers take no seed, so a
+story is a fresh high-temperature sample on every run.
+"""
+
+from __future__ import annotations
+
+CACHE_KEY_FIELDS: dict[str, tuple[str, ...]] = {
+    "initialPrompt":  ("text",),
+    "promptEnhancer": ("notes",),
+    "translator":     ("language",),
+    "grammarFix":     ("style",),
+    "compressor":     (),
+    "imageGenerator": ("prompt", "width", "height", "seed"),
+    "imageDescriber": ("image",),
+}
+
+SEEDED_NODE_TYPES: frozenset[str] = frozenset({"imageGenerator"})
@@ -0,0 +1,32 @@
+"""Per-node-type execution time budgets (seconds).
+
+A node that exceeds its budget is failed with ``NODE_FAILED`` instead of
+holding the run open until the provider gives up. Types not listed use
+``NODE_TIMEOUT_SECONDS``; a budget of 0 disables the timeout.
+"""
+
+from __future__ import annotations
+
+import os
+
+NODE_TIMEOUT_SECONDS = float(os.environ.get("NODE_TIMEOUT_SECONDS", "90"))
+
+NODE_TIMEOUTS: dict[str, float] = {
+    "consistentCharacter": 5,
+    "sceneBuilder":        5,
+    "textOutput":          5,
+    "initialPrompt":       60,
+    "promptEnhancer":      60,
+    "translator":          60,
+    "grammarFix":          60,
+    "compressor":          60,
+    "storyTeller":         120,
+    "imageDescriber":      90,
+    # Flux generations are polled for up to 120 s after submission
+    "imageGenerator":      150,
+}
+
+
+def timeout_for(node_type: str) -> float | None:
+    seconds = NODE_TIMEOUTS.get(node_type, NODE_TIMEOUT_SECONDS)
+    return seconds if seconds > 0 else None
@@ -0,0 +1,35 @@
+"""Per-provider (and optional per-model) concurrency and rate limits.
+
+Keys of each entry (all optional, 0 or missing = unlimited):
+
+- ``max_concurrent``: simultaneous in-flight calls
+- ``requests_per_minute``: request bucket refill rate
+- ``tokens_per_minute``: token bucket refill rate (text providers; tokens
+  are estimated before the call and settled afterwards)
+- ``burst_seconds``: bucket capacity, in seconds of refill (default 10)
+
+``MODEL_LIMITS`` entries apply on top of their provider's limits.
+Set ``PROVIDER_LIMITS_DISABLED=1`` to turn all limits off (e.g. for load tests
+against mocks).
+"""
+
+from __future__ import annotations
+
+import os
+
+PROVIDER_LIMITS_DISABLED = os.environ.get("PROVIDER_LIMITS_DISABLED", "").lower() in ("1", "true", "yes")
+
+PROVIDER_LIMITS: dict[str, dict[str, float]] = {
+    "mistral":         {"max_concurrent": 8, "requests_per_minute": 300, "tokens_per_minute": 500_000},
+    "glm":             {"max_concurrent": 4, "requests_per_minute": 60,  "tokens_per_minute": 100_000},
+    "openrouter":      {"max_concurrent": 8, "requests_per_minute": 120, "tokens_per_minute": 200_000},
+    "huggingface":     {"max_concurrent": 4, "requests_per_minute": 60,  "tokens_per_minute": 100_000},
+    "claude":          {"max_concurrent": 8, "requests_per_minute": 50,  "tokens_per_minute": 40_000},
+    "blackforestlabs": {"max_concurrent": 4, "requests_per_minute": 60},
+}
+
+MODEL_LIMITS: dict[str, dict[str, dict[str, float]]] = {
+    "mistral": {
+        "labs-mistral-small-creative": {"max_concurrent": 4},
+    },
+}
@@ -1,9 +1,13 @@
-"""Executor function type definition."""
+"""Executor function type definitions."""
 
 from __future__ import annotations
 
 from typing import Awaitable, Callable
 
 from app.modules.execution.models import NodeExecutionContext, NodeOutput
+from app.modules.execution.streaming import TextStream
 
 ExecutorFn = Callable[[NodeExecutionContext], Awaitable[NodeOutput]]
+
+# Pipelined executors consume their upstream's text while it streams
+PipelinedExecutorFn = Callable[[NodeExecutionContext, TextStream], Awaitable[NodeOutput]]
@@ -2,19 +2,17 @@
 
 from __future__ import annotations
 
+import base64
 import logging
-import os
 import re
 import time
 
-from anthropic import AsyncAnthropic
-
+from app.core.storage import blob_store, blob_url, parse_blob_url
 from app.modules.execution.models import NodeExecutionContext, NodeOutput
+from app.modules.execution.providers.registry import get_text_provider
 
 logger = logging.getLogger(__name__)
 
-_client: AsyncAnthropic | None = None
-
 DEFAULT_VISION_MODEL = "claude-sonnet-4-20250514"
 
 SYSTEM_PROMPT = (
@@ -25,13 +23,6 @@ SYSTEM_PROMPT = (
 )
 
 
-def _get_client() -> AsyncAnthropic:
-    global _client
-    if _client is None:
-        _client = AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY", ""))
-    return _client
-
-
 def _parse_data_uri(data_uri: str) -> tuple[str, str]:
     """Extract (media_type, base64_data) from a data URI.
 
@@ -51,16 +42,23 @@ async def image_describer(ctx: NodeExecutionContext) -> NodeOutput:
     if not image_value:
         return NodeOutput(error="No image provided for description")
 
-    media_type, base64_data = _parse_data_uri(image_value)
+    # Accept either an inline data URI (fresh upload) or a blob URL.
+    key = parse_blob_url(image_value)
+    if key:
+        media_type = blob_store.content_type_for(key)
+        base64_data = base64.b64encode(await blob_store.get(key)).decode("ascii")
+    else:
+        media_type, base64_data = _parse_data_uri(image_value)
+        key = await blob_store.put_data_uri(image_value)
     model = ctx.model or DEFAULT_VISION_MODEL
 
-    client = _get_client()
-    response = await client.messages.create(
+    # Through the shared Claude client, so vision calls wait under the same limits
+    description = await get_text_provider("claude").chat(
         model=model,
         max_tokens=2500,
         temperature=ctx.temperature,
-        system=SYSTEM_PROMPT,
         messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
             {
                 "role": "user",
                 "content": [
@@ -80,12 +78,10 @@ async def image_describer(ctx: NodeExecutionContext) -> NodeOutput:
             },
         ],
     )
-
-    description = response.content[0].text
     duration = (time.perf_counter() - start) * 1000
 
     return NodeOutput(
         text=description,
-        image=image_value,
+        image=blob_url(key),
         duration_ms=duration,
     )
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import base64
 import time
 
+from app.core.storage import blob_store, blob_url
 from app.modules.execution.executors.utils import merge_input_text
 from app.modules.execution.models import NodeExecutionContext, NodeOutput
 from app.modules.execution.providers.image_registry import get_image_provider
@@ -22,6 +24,8 @@ async def image_generator(ctx: NodeExecutionContext) -> NodeOutput:
 
     width = ctx.node_data.get("width") or None
     height = ctx.node_data.get("height") or None
+    # A pinned seed makes the image reproducible (and the node cacheable)
+    seed = ctx.node_data.get("seed")
 
     provider = get_image_provider(ctx.provider_id)
     result = await provider.generate(
@@ -29,13 +33,15 @@ async def image_generator(ctx: NodeExecutionContext) -> NodeOutput:
         model=ctx.model,
         width=int(width) if width else None,
         height=int(height) if height else None,
+        seed=int(seed) if seed is not None else None,
     )
 
+    # Keep the bytes out of outputs/events — they carry only the blob URL.
+    key = await blob_store.put(base64.b64decode(result.image_base64), result.content_type)
     duration = (time.perf_counter() - start) * 1000
-    image_data = f"data:{result.content_type};base64,{result.image_base64}"
 
     return NodeOutput(
         text=prompt,
-        image=image_data,
+        image=blob_url(key),
         duration_ms=duration,
     )
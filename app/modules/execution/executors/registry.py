@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from app.modules.execution.executors.base import ExecutorFn
+from app.modules.execution.executors.base import ExecutorFn, PipelinedExecutorFn
 from app.modules.execution.executors.data_sources import (
     consistent_character,
     scene_builder,
@@ -13,10 +13,12 @@ from app.modules.execution.executors.output import text_output
 from app.modules.execution.executors.text_processing import (
     compressor,
     grammar_fix,
+    grammar_fix_pipelined,
     initial_prompt,
     prompt_enhancer,
     story_teller,
     translator,
+    translator_pipelined,
 )
 
 EXECUTORS: dict[str, ExecutorFn] = {
@@ -38,9 +40,30 @@ EXECUTORS: dict[str, ExecutorFn] = {
 }
 
 
+# Node types that can start on partial upstream text in pipelined runs
+PIPELINED_EXECUTORS: dict[str, PipelinedExecutorFn] = {
+    "translator": translator_pipelined,
+    "grammarFix": grammar_fix_pipelined,
+}
+
+# Node types whose text output streams while they run
+STREAMING_NODE_TYPES: set[str] = {
+    "initialPrompt",
+    "promptEnhancer",
+    "translator",
+    "storyTeller",
+    "grammarFix",
+    "compressor",
+}
+
+
 def register_executor(node_type: str, fn: ExecutorFn) -> None:
     EXECUTORS[node_type] = fn
 
 
 def get_executor(node_type: str) -> ExecutorFn | None:
     return EXECUTORS.get(node_type)
+
+
+def get_pipelined_executor(node_type: str) -> PipelinedExecutorFn | None:
+    return PIPELINED_EXECUTORS.get(node_type)
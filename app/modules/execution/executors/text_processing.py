@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
+from typing import AsyncIterator, Callable
 
 from app.modules.execution.executors.utils import (
     LANGUAGE_NAMES,
@@ -17,10 +19,77 @@ from app.modules.execution.prompts.inject_persona import build_inject_persona_me
 from app.modules.execution.prompts.storyteller import build_storyteller_messages
 from app.modules.execution.prompts.translate import build_translate_messages
 from app.modules.execution.providers.registry import get_text_provider
+from app.modules.execution.streaming import TextStream
 
 COMPRESSION_THRESHOLD = 2500
 
 
+async def _complete(
+    ctx: NodeExecutionContext,
+    messages: list[dict],
+    stream: bool = True,
+) -> str:
+    """Call the node's text provider, streaming deltas to ``ctx.on_delta`` if set.
+
+    Only the call that produces the node's final text should stream.
+    """
+    provider = get_text_provider(ctx.provider_id)
+    if not (stream and ctx.on_delta):
+        return await provider.chat(
+            messages=messages,
+            model=ctx.model,
+            temperature=ctx.temperature,
+            max_tokens=2500,
+        )
+
+    parts: list[str] = []
+    async for delta in provider.chat_stream(
+        messages=messages,
+        model=ctx.model,
+        temperature=ctx.temperature,
+        max_tokens=2500,
+    ):
+        parts.append(delta)
+        await ctx.on_delta(delta)
+    return "".join(parts)
+
+
+async def _transform_chunks(
+    ctx: NodeExecutionContext,
+    chunks: AsyncIterator[str],
+    build_messages: Callable[[str], list[dict]],
+) -> str:
+    """Run one provider call per upstream chunk, starting each as soon as
+    the chunk arrives. Results are emitted and joined in chunk order.
+    """
+    tasks: list[asyncio.Task] = []
+    emitted = 0
+
+    async def emit_ready() -> None:
+        nonlocal emitted
+        while emitted < len(tasks) and tasks[emitted].done():
+            result = tasks[emitted].result()
+            if ctx.on_delta:
+                await ctx.on_delta(result if emitted == 0 else f"\n\n{result}")
+            emitted += 1
+
+    try:
+        async for chunk in chunks:
+            tasks.append(asyncio.create_task(
+                _complete(ctx, build_messages(chunk), stream=False),
+            ))
+            await emit_ready()
+        for task in tasks[emitted:]:
+            await task
+            await emit_ready()
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return "\n\n".join(task.result() for task in tasks)
+
+
 async def _inject_personas_if_present(
     text: str,
     ctx: NodeExecutionContext,
@@ -31,14 +100,7 @@ async def _inject_personas_if_present(
         return text
 
     messages = build_inject_persona_messages(personas, text)
-    provider = get_text_provider(ctx.provider_id)
-    result = await provider.chat(
-        messages=messages,
-        model=ctx.model,
-        temperature=ctx.temperature,
-        max_tokens=2500,
-    )
-    return result
+    return await _complete(ctx, messages)
 
 
 async def initial_prompt(ctx: NodeExecutionContext) -> NodeOutput:
@@ -62,13 +124,8 @@ async def prompt_enhancer(ctx: NodeExecutionContext) -> NodeOutput:
     notes = ctx.node_data.get("notes") or None
 
     messages = build_enhance_messages(text, notes)
-    provider = get_text_provider(ctx.provider_id)
-    enhanced = await provider.chat(
-        messages=messages,
-        model=ctx.model,
-        temperature=ctx.temperature,
-        max_tokens=2500,
-    )
+    # Stream here only if no persona injection follows
+    enhanced = await _complete(ctx, messages, stream=not extract_personas(ctx.adapter_inputs))
 
     enhanced = await _inject_personas_if_present(enhanced, ctx)
     duration = (time.perf_counter() - start) * 1000
@@ -89,12 +146,29 @@ async def translator(ctx: NodeExecutionContext) -> NodeOutput:
 
     language = LANGUAGE_NAMES.get(lang_code, lang_code)
     messages = build_translate_messages(text, language)
-    provider = get_text_provider(ctx.provider_id)
-    translated = await provider.chat(
-        messages=messages,
-        model=ctx.model,
-        temperature=ctx.temperature,
-        max_tokens=2500,
+    translated = await _complete(ctx, messages)
+    duration = (time.perf_counter() - start) * 1000
+
+    return NodeOutput(text=translated, duration_ms=duration)
+
+
+async def translator_pipelined(
+    ctx: NodeExecutionContext,
+    upstream: TextStream,
+) -> NodeOutput:
+    """Translate upstream text paragraph by paragraph while it streams."""
+    start = time.perf_counter()
+    lang_code = ctx.node_data.get("language") or ""
+
+    if not lang_code:
+        # No language selected → pass-through, text unchanged
+        text = await upstream.result()
+        duration = (time.perf_counter() - start) * 1000
+        return NodeOutput(text=text, duration_ms=duration)
+
+    language = LANGUAGE_NAMES.get(lang_code, lang_code)
+    translated = await _transform_chunks(
+        ctx, upstream.paragraphs(), lambda chunk: build_translate_messages(chunk, language),
     )
     duration = (time.perf_counter() - start) * 1000
 
@@ -108,13 +182,8 @@ async def story_teller(ctx: NodeExecutionContext) -> NodeOutput:
     tags = ctx.node_data.get("tags") or None
 
     messages = build_storyteller_messages(text, tags)
-    provider = get_text_provider(ctx.provider_id)
-    story = await provider.chat(
-        messages=messages,
-        model=ctx.model,
-        temperature=ctx.temperature,
-        max_tokens=2500,
-    )
+    # Stream here only if no persona injection follows
+    story = await _complete(ctx, messages, stream=not extract_personas(ctx.adapter_inputs))
 
     story = await _inject_personas_if_present(story, ctx)
     duration = (time.perf_counter() - start) * 1000
@@ -129,12 +198,22 @@ async def grammar_fix(ctx: NodeExecutionContext) -> NodeOutput:
     style = ctx.node_data.get("style") or None
 
     messages = build_grammar_fix_messages(text, style)
-    provider = get_text_provider(ctx.provider_id)
-    fixed = await provider.chat(
-        messages=messages,
-        model=ctx.model,
-        temperature=ctx.temperature,
-        max_tokens=2500,
+    fixed = await _complete(ctx, messages)
+    duration = (time.perf_counter() - start) * 1000
+
+    return NodeOutput(text=fixed, duration_ms=duration)
+
+
+async def grammar_fix_pipelined(
+    ctx: NodeExecutionContext,
+    upstream: TextStream,
+) -> NodeOutput:
+    """Fix grammar paragraph by paragraph while upstream text streams."""
+    start = time.perf_counter()
+    style = ctx.node_data.get("style") or None
+
+    fixed = await _transform_chunks(
+        ctx, upstream.paragraphs(), lambda chunk: build_grammar_fix_messages(chunk, style),
     )
     duration = (time.perf_counter() - start) * 1000
 
@@ -151,13 +230,7 @@ async def compressor(ctx: NodeExecutionContext) -> NodeOutput:
         return NodeOutput(text=text, duration_ms=duration)
 
     messages = build_compress_messages(text)
-    provider = get_text_provider(ctx.provider_id)
-    compressed = await provider.chat(
-        messages=messages,
-        model=ctx.model,
-        temperature=ctx.temperature,
-        max_tokens=2500,
-    )
+    compressed = await _complete(ctx, messages)
     duration = (time.perf_counter() - start) * 1000
 
     return NodeOutput(text=compressed, duration_ms=duration)
@@ -0,0 +1,68 @@
+"""Compiled graph — node and edge indexes built once per run.
+
+``compile_graph`` makes a single pass over nodes and a single pass over
+edges. Topological sort, traversal and the runner all read from the same
+``CompiledGraph`` instead of re-scanning the raw edge list per node.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from app.modules.execution.graph.edge_classification import is_adapter_edge
+
+
+@dataclass
+class CompiledGraph:
+    """Adjacency indexes for the executable (non-group, deduplicated) nodes."""
+
+    # Executable node IDs in their original order
+    node_ids: list[str] = field(default_factory=list)
+    # Normalized node dicts: ``type`` resolved, ``data`` never None
+    nodes_by_id: dict[str, dict] = field(default_factory=dict)
+    # Source IDs per target, split by target handle (includes edges from
+    # nodes outside the executable set, matching edge_classification)
+    text_inputs: dict[str, list[str]] = field(default_factory=dict)
+    adapter_inputs: dict[str, list[str]] = field(default_factory=dict)
+    # Edges where both ends are executable nodes
+    parents: dict[str, list[str]] = field(default_factory=dict)
+    children: dict[str, list[str]] = field(default_factory=dict)
+
+
+def node_type_of(node: dict) -> str:
+    """Return a node's type from ``type`` or ``data.type``."""
+    return node.get("type") or (node.get("data") or {}).get("type") or ""
+
+
+def compile_graph(nodes: list[dict], edges: list[dict]) -> CompiledGraph:
+    """Index *nodes* and *edges* for planning and execution.
+
+    Group nodes are dropped and duplicate node IDs keep their first occurrence.
+    """
+    graph = CompiledGraph()
+
+    for n in nodes:
+        nid = n["id"]
+        ntype = node_type_of(n)
+        if ntype == "group" or nid in graph.nodes_by_id:
+            continue
+        graph.node_ids.append(nid)
+        graph.nodes_by_id[nid] = {**n, "type": ntype, "data": n.get("data") or {}}
+        graph.text_inputs[nid] = []
+        graph.adapter_inputs[nid] = []
+        graph.parents[nid] = []
+        graph.children[nid] = []
+
+    for e in edges:
+        src, tgt = e["source"], e["target"]
+        if tgt not in graph.nodes_by_id:
+            continue
+        if is_adapter_edge(e):
+            graph.adapter_inputs[tgt].append(src)
+        else:
+            graph.text_inputs[tgt].append(src)
+        if src in graph.nodes_by_id:
+            graph.parents[tgt].append(src)
+            graph.children[src].append(tgt)
+
+    return graph
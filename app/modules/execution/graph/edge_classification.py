@@ -1,21 +1,30 @@
 """Classify edges as text-input or adapter-input based on target handle prefix."""
 
 
+def is_adapter_edge(edge: dict) -> bool:
+    """Return True if *edge* targets an adapter handle."""
+    return (edge.get("targetHandle") or "").startswith("adapter-")
+
+
 def get_text_input_node_ids(node_id: str, edges: list[dict]) -> list[str]:
-    """Return source node IDs for edges targeting text handles of *node_id*."""
+    """Return source node IDs for edges targeting text handles of *node_id*.
+
+    Scans every edge — prefer ``CompiledGraph.text_inputs`` when planning a run.
+    """
     return [
         e["source"]
         for e in edges
-        if e["target"] == node_id
-        and not (e.get("targetHandle") or "").startswith("adapter-")
+        if e["target"] == node_id and not is_adapter_edge(e)
     ]
 
 
 def get_adapter_input_node_ids(node_id: str, edges: list[dict]) -> list[str]:
-    """Return source node IDs for edges targeting adapter handles of *node_id*."""
+    """Return source node IDs for edges targeting adapter handles of *node_id*.
+
+    Scans every edge — prefer ``CompiledGraph.adapter_inputs`` when planning a run.
+    """
     return [
         e["source"]
         for e in edges
-        if e["target"] == node_id
-        and (e.get("targetHandle") or "").startswith("adapter-")
+        if e["target"] == node_id and is_adapter_edge(e)
     ]
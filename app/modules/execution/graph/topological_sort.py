@@ -1,61 +1,32 @@
 """Kahn's topological sort with cycle detection.
 
-Filters out group nodes, deduplicates by ID, and returns an ordered list
-of ExecutionSteps with classified input/adapter dependencies.
+Works on a ``CompiledGraph`` (group nodes already filtered, IDs deduplicated)
+and returns an ordered list of ExecutionSteps with classified input/adapter
+dependencies.
 """
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import deque
 
-from app.modules.execution.graph.edge_classification import (
-    get_adapter_input_node_ids,
-    get_text_input_node_ids,
-)
+from app.modules.execution.graph.compiled import CompiledGraph
 from app.modules.execution.models import ExecutionStep
 
 
-def topological_sort(
-    nodes: list[dict],
-    edges: list[dict],
-) -> list[ExecutionStep]:
+def topological_sort(graph: CompiledGraph) -> list[ExecutionStep]:
     """Run Kahn's algorithm and return execution steps in dependency order.
 
     Raises ``ValueError`` if the graph contains a cycle.
     """
-    # Filter out group nodes and deduplicate
-    seen_ids: set[str] = set()
-    filtered: list[dict] = []
-    for n in nodes:
-        nid = n["id"]
-        ntype = n.get("type") or (n.get("data") or {}).get("type") or ""
-        if ntype == "group" or nid in seen_ids:
-            continue
-        seen_ids.add(nid)
-        filtered.append(n)
-
-    node_ids = {n["id"] for n in filtered}
-
-    # Build adjacency and in-degree maps (only for edges within filtered set)
-    in_degree: dict[str, int] = {nid: 0 for nid in node_ids}
-    dependents: dict[str, list[str]] = defaultdict(list)
-
-    for e in edges:
-        src, tgt = e["source"], e["target"]
-        if src in node_ids and tgt in node_ids:
-            in_degree[tgt] += 1
-            dependents[src].append(tgt)
+    in_degree: dict[str, int] = {
+        nid: len(graph.parents[nid]) for nid in graph.node_ids
+    }
 
     # Seed the queue with zero-in-degree nodes
     queue: deque[str] = deque(
         nid for nid, deg in in_degree.items() if deg == 0
     )
 
-    type_by_id: dict[str, str] = {}
-    for n in filtered:
-        ntype = n.get("type") or (n.get("data") or {}).get("type") or ""
-        type_by_id[n["id"]] = ntype
-
     sorted_steps: list[ExecutionStep] = []
 
     while queue:
@@ -63,17 +34,17 @@ def topological_sort(
         sorted_steps.append(
             ExecutionStep(
                 node_id=nid,
-                node_type=type_by_id[nid],
-                input_node_ids=get_text_input_node_ids(nid, edges),
-                adapter_node_ids=get_adapter_input_node_ids(nid, edges),
+                node_type=graph.nodes_by_id[nid]["type"],
+                input_node_ids=list(graph.text_inputs[nid]),
+                adapter_node_ids=list(graph.adapter_inputs[nid]),
             )
         )
-        for dep in dependents[nid]:
+        for dep in graph.children[nid]:
             in_degree[dep] -= 1
             if in_degree[dep] == 0:
                 queue.append(dep)
 
-    if len(sorted_steps) != len(node_ids):
+    if len(sorted_steps) != len(graph.node_ids):
         raise ValueError("Graph contains a cycle")
 
     return sorted_steps
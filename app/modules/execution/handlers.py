@@ -1,17 +1,21 @@
 """Event handlers that bridge execution events to WebSocket.
 
-Auto-discovered by ``discover_handlers("app.modules")``. Each handler
-receives a domain event from the EventBus and pushes a WSMessage to
-the user's WebSocket connections.
+Auto-discovered by ``discover_handlers("app.modules")``. Each execution
+event is turned into a WSMessage by ``build_ws_message`` and pushed to the
+user's WebSocket connections — and kept in ``replay_buffer`` for clients
+that reconnect. Every message carries the event's run ``seq``; the
+EventBus delivers a run's events in order.
 """
 
 from __future__ import annotations
 
 import logging
+from typing import Callable
 
 from app.core.events import Event, EventTypes, subscribe
 from app.core.ws.manager import ws_manager
 from app.core.ws.models import WSMessage
+from app.modules.execution.replay import replay_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -19,97 +23,81 @@ logger = logging.getLogger(__name__)
 # ── Run-level events ──
 
 
-@subscribe(EventTypes.EXECUTION_STARTED)
-async def on_execution_started(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.started", data={
-            "run_id": event.payload["run_id"],
-        }),
-    )
+def _started(p: dict) -> dict:
+    return {"run_id": p["run_id"], "resumed": p.get("resumed", False)}
 
 
-@subscribe(EventTypes.EXECUTION_COMPLETED)
-async def on_execution_completed(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.completed", data={
-            "run_id": event.payload["run_id"],
-            "outputs": event.payload.get("outputs", {}),
-        }),
-    )
+def _completed(p: dict) -> dict:
+    return {"run_id": p["run_id"], "outputs": p.get("outputs", {})}
 
 
-@subscribe(EventTypes.EXECUTION_FAILED)
-async def on_execution_failed(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.failed", data={
-            "run_id": event.payload["run_id"],
-            "error": event.payload.get("error", "Unknown error"),
-        }),
-    )
+def _failed(p: dict) -> dict:
+    return {"run_id": p["run_id"], "error": p.get("error", "Unknown error")}
+
+
+def _queued(p: dict) -> dict:
+    return {"run_id": p["run_id"], "position": p["position"], "queue_depth": p.get("queue_depth")}
+
+
+def _cancelled(p: dict) -> dict:
+    return {"run_id": p["run_id"], "superseded_by": p.get("superseded_by")}
 
 
 # ── Node-level events ──
 
 
-@subscribe(EventTypes.NODE_PENDING)
-async def on_node_pending(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.node.status", data={
-            "run_id": event.payload["run_id"],
-            "node_id": event.payload["node_id"],
-            "status": "pending",
-        }),
-    )
-
-
-@subscribe(EventTypes.NODE_RUNNING)
-async def on_node_running(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.node.status", data={
-            "run_id": event.payload["run_id"],
-            "node_id": event.payload["node_id"],
-            "status": "running",
-        }),
-    )
-
-
-@subscribe(EventTypes.NODE_COMPLETED)
-async def on_node_completed(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.node.completed", data={
-            "run_id": event.payload["run_id"],
-            "node_id": event.payload["node_id"],
-            "output": event.payload.get("output", {}),
-        }),
-    )
-
-
-@subscribe(EventTypes.NODE_FAILED)
-async def on_node_failed(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.node.failed", data={
-            "run_id": event.payload["run_id"],
-            "node_id": event.payload["node_id"],
-            "error": event.payload.get("error", "Unknown error"),
-        }),
-    )
-
-
-@subscribe(EventTypes.NODE_SKIPPED)
-async def on_node_skipped(event: Event) -> None:
-    await ws_manager.send_to_user(
-        event.payload["user_id"],
-        WSMessage(type="execution.node.status", data={
-            "run_id": event.payload["run_id"],
-            "node_id": event.payload["node_id"],
-            "status": "skipped",
-            "error": event.payload.get("reason", ""),
-        }),
-    )
+def _node_status(status: str) -> Callable[[dict], dict]:
+    def build(p: dict) -> dict:
+        return {"run_id": p["run_id"], "node_id": p["node_id"], "status": status}
+    return build
+
+
+def _node_completed(p: dict) -> dict:
+    return {"run_id": p["run_id"], "node_id": p["node_id"], "output": p.get("output", {})}
+
+
+def _node_failed(p: dict) -> dict:
+    return {"run_id": p["run_id"], "node_id": p["node_id"], "error": p.get("error", "Unknown error")}
+
+
+def _node_skipped(p: dict) -> dict:
+    return {**_node_status("skipped")(p), "error": p.get("reason", "")}
+
+
+def _node_delta(p: dict) -> dict:
+    return {"run_id": p["run_id"], "node_id": p["node_id"], "delta": p["delta"]}
+
+
+# event type → (WS message type, data builder)
+WS_MESSAGES: dict[str, tuple[str, Callable[[dict], dict]]] = {
+    EventTypes.EXECUTION_STARTED:   ("execution.started", _started),
+    EventTypes.EXECUTION_COMPLETED: ("execution.completed", _completed),
+    EventTypes.EXECUTION_FAILED:    ("execution.failed", _failed),
+    EventTypes.EXECUTION_QUEUED:    ("execution.queued", _queued),
+    EventTypes.EXECUTION_CANCELLED: ("execution.cancelled", _cancelled),
+    EventTypes.NODE_PENDING:        ("execution.node.status", _node_status("pending")),
+    EventTypes.NODE_RUNNING:        ("execution.node.status", _node_status("running")),
+    EventTypes.NODE_COMPLETED:      ("execution.node.completed", _node_completed),
+    EventTypes.NODE_FAILED:         ("execution.node.failed", _node_failed),
+    EventTypes.NODE_SKIPPED:        ("execution.node.status", _node_skipped),
+    EventTypes.NODE_DELTA:          ("execution.node.delta", _node_delta),
+}
+
+
+def build_ws_message(event: Event) -> WSMessage | None:
+    """The WebSocket message for an execution *event*, or ``None`` if it has none."""
+    entry = WS_MESSAGES.get(event.type)
+    if entry is None:
+        return None
+    ws_type, build = entry
+    data = build(event.payload)
+    data["seq"] = event.seq
+    return WSMessage(type=ws_type, data=data)
+
+
+@subscribe(*WS_MESSAGES)
+async def on_execution_event(event: Event) -> None:
+    user_id = event.payload["user_id"]
+    message = build_ws_message(event)
+    replay_buffer.record(user_id, event.payload["run_id"], event.seq, message)
+    await ws_manager.send_to_user(user_id, message)
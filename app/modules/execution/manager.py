@@ -6,18 +6,53 @@ a singleton in the ServiceRegistry.
 
 from __future__ import annotations
 
-import asyncio
 import logging
+import os
+from enum import Enum
 from uuid import uuid4
 
 from app.core.bus import event_bus
 from app.core.events import Event, EventTypes
-from app.modules.execution.runner import run_execution
+from app.modules.execution.admission import AdmissionRejected, run_scheduler
+from app.modules.execution.run_queue import EXECUTION_BACKEND, ExecutionBackend, run_queue
+from app.modules.execution.run_store import run_store
+from app.modules.execution.runner import drain_run, run_execution
 
 logger = logging.getLogger(__name__)
 
 
+class SupersedePolicy(str, Enum):
+    """What happens to a user's active run when they start another run of the same flow.
+
+    - ``cancel``: cancel the old run outright.
+    - ``reuse``: stop scheduling the old run's remaining nodes and mute its
+      events, but let its in-flight nodes finish — the new run awaits them
+      instead of calling the provider again when their inputs match.
+    - ``none``: leave both runs alone.
+    """
+
+    CANCEL = "cancel"
+    REUSE = "reuse"
+    NONE = "none"
+
+
+EXECUTION_SUPERSEDE_POLICY = SupersedePolicy(
+    os.environ.get("EXECUTION_SUPERSEDE_POLICY", SupersedePolicy.CANCEL.value)
+)
+
+
 class ExecutionManager:
+    def __init__(
+        self,
+        supersede_policy: SupersedePolicy = EXECUTION_SUPERSEDE_POLICY,
+        backend: ExecutionBackend = EXECUTION_BACKEND,
+    ) -> None:
+        self._supersede_policy = supersede_policy
+        self._backend = backend
+        # Latest run per (user_id, flow_id), and the reverse mapping
+        self._active: dict[tuple[int, str], str] = {}
+        self._run_keys: dict[str, tuple[int, str]] = {}
+
     async def run(
         self,
         user_id: int,
@@ -27,56 +62,194 @@ class ExecutionManager:
         provider_id: str,
         trigger_node_id: str | None = None,
         cached_outputs: dict[str, dict] | None = None,
+        pipelined: bool = False,
     ) -> str:
         """Start an execution run. Returns *run_id* immediately.
 
-        The actual execution runs as a background asyncio task. Status
-        updates flow through the EventBus → WS handlers.
+        The run is handed to the admission scheduler, which starts it as a
+        background task once global and per-user capacity allows. Status
+        updates (including queue position) flow through the EventBus → WS
+        handlers. With the ``queue`` backend it is enqueued for an executor
+        worker instead, whose events are relayed back.
         """
         run_id = uuid4().hex
-
+        request = {
+            "nodes": nodes,
+            "edges": edges,
+            "provider_id": provider_id,
+            "trigger_node_id": trigger_node_id,
+            "cached_outputs": cached_outputs,
+            "pipelined": pipelined,
+        }
         await event_bus.emit(Event(
             type=EventTypes.EXECUTION_STARTED,
-            payload={
-                "run_id": run_id,
-                "user_id": user_id,
-                "flow_id": flow_id,
-            },
+            payload={"run_id": run_id, "user_id": user_id, "flow_id": flow_id},
         ))
 
-        asyncio.create_task(
-            self._execute(
-                run_id, user_id, flow_id, nodes, edges,
-                provider_id, trigger_node_id, cached_outputs,
-            )
-        )
-
+        if self._backend is ExecutionBackend.QUEUE:
+            await self._enqueue(run_id, user_id, flow_id, request)
+        else:
+            await run_store.create(run_id, user_id, flow_id, request)
+            await self._start(run_id, user_id, flow_id, request)
         return run_id
 
-    async def _execute(
+    async def resume_stale_runs(self, limit: int | None = None) -> int:
+        """Claim and start up to *limit* runs with no live worker — runs
+        abandoned by a crashed or redeployed worker, or (for queue workers)
+        newly queued ones.
+
+        Completed nodes are passed as ``cached_outputs`` so only unfinished
+        work is executed again; runs whose cancellation was pending are
+        announced as cancelled. Returns the number of claimed runs.
+        """
+        runs = await run_store.claim_stale(limit)
+        for run in runs:
+            if run.cancelled:
+                event_bus.sequencer.seed(run.run_id, max(run.last_seq, 1))
+                await self._emit_cancelled(run.run_id, run.user_id, run.superseded_by)
+                continue
+            request = dict(run.request)
+            request["cached_outputs"] = {**(request.get("cached_outputs") or {}), **run.completed}
+            resumed = run.status == "running"
+            if resumed:
+                logger.info(
+                    "Resuming run %s (%d node(s) already complete)", run.run_id, len(run.completed),
+                )
+            # Continue after the events other processes emitted for it — at
+            # least its execution.started (seq 1), from the process that accepted it
+            event_bus.sequencer.seed(run.run_id, max(run.last_seq, 1))
+            await self._start(run.run_id, run.user_id, run.flow_id, request, resumed=resumed)
+        return len(runs)
+
+    async def _enqueue(self, run_id: str, user_id: int, flow_id: str, request: dict) -> None:
+        try:
+            await run_queue.enqueue(run_id, user_id, flow_id, request)
+        except Exception as exc:
+            logger.exception("Failed to enqueue run %s", run_id)
+            await event_bus.emit(Event(
+                type=EventTypes.EXECUTION_FAILED,
+                payload={"run_id": run_id, "user_id": user_id, "error": f"Could not queue run: {exc}"},
+            ))
+            return
+
+        # Runs live in other processes — there is no in-flight work here to reuse
+        if flow_id and self._supersede_policy is not SupersedePolicy.NONE:
+            for old_run_id in await run_queue.supersede(user_id, flow_id, run_id):
+                await self._emit_cancelled(old_run_id, user_id, run_id, seed=True)
+
+    async def _start(
         self,
         run_id: str,
         user_id: int,
         flow_id: str,
-        nodes: list[dict],
-        edges: list[dict],
-        provider_id: str,
-        trigger_node_id: str | None,
-        cached_outputs: dict[str, dict] | None,
+        request: dict,
+        resumed: bool = False,
     ) -> None:
+        if resumed:
+            await event_bus.emit(Event(
+                type=EventTypes.EXECUTION_STARTED,
+                payload={"run_id": run_id, "user_id": user_id, "flow_id": flow_id, "resumed": True},
+            ))
+
+        if flow_id:
+            previous = self._active.get((user_id, flow_id))
+            self._track(run_id, user_id, flow_id)
+            if previous:
+                await self._supersede(previous, run_id, user_id)
+
+        try:
+            await run_scheduler.submit(
+                run_id, user_id,
+                lambda: self._execute(run_id, user_id, flow_id, request),
+            )
+        except AdmissionRejected as exc:
+            self._forget(run_id)
+            await run_store.finish(run_id, "failed", str(exc))
+            await event_bus.emit(Event(
+                type=EventTypes.EXECUTION_FAILED,
+                payload={"run_id": run_id, "user_id": user_id, "error": str(exc)},
+            ))
+
+    async def cancel(self, run_id: str, user_id: int, superseded_by: str | None = None) -> bool:
+        """Cancel *user_id*'s run, whether queued or running.
+
+        Cancelling a running run cancels its node tasks, which aborts their
+        provider HTTP calls and Flux polling. Returns ``False`` if the run is
+        unknown, already finished, or owned by someone else.
+        """
+        if self._backend is ExecutionBackend.QUEUE:
+            outcome = await run_queue.request_cancel(run_id, user_id, superseded_by)
+            # A "requested" cancel is carried out (and announced) by the run's worker
+            if outcome == "cancelled":
+                await self._emit_cancelled(run_id, user_id, superseded_by, seed=True)
+            return outcome is not None
+
+        if not await run_scheduler.cancel(run_id, user_id):
+            return False
+
+        self._forget(run_id)
+        await run_store.finish(run_id, "cancelled")
+        await self._emit_cancelled(run_id, user_id, superseded_by)
+        return True
+
+    async def _supersede(self, old_run_id: str, new_run_id: str, user_id: int) -> None:
+        policy = self._supersede_policy
+        if policy is SupersedePolicy.NONE:
+            return
+
+        # A run that hasn't started has nothing in flight to reuse
+        if policy is SupersedePolicy.CANCEL or not run_scheduler.is_running(old_run_id):
+            await self.cancel(old_run_id, user_id, superseded_by=new_run_id)
+            return
+
+        logger.info("Run %s superseded by %s — draining", old_run_id, new_run_id)
+        self._forget(old_run_id)
+        drain_run(old_run_id)
+        await run_store.finish(old_run_id, "cancelled")
+        await self._emit_cancelled(old_run_id, user_id, new_run_id)
+
+    async def _emit_cancelled(
+        self,
+        run_id: str,
+        user_id: int,
+        superseded_by: str | None,
+        seed: bool = False,
+    ) -> None:
+        """Announce the cancellation. With *seed*, the run was numbered by
+        other processes — continue its seq from the durable record.
+        """
+        if seed:
+            event_bus.sequencer.seed(run_id, await run_store.last_seq(run_id))
+        payload = {"run_id": run_id, "user_id": user_id}
+        if superseded_by:
+            payload["superseded_by"] = superseded_by
+        await event_bus.emit(Event(type=EventTypes.EXECUTION_CANCELLED, payload=payload))
+
+    def _track(self, run_id: str, user_id: int, flow_id: str) -> None:
+        self._active[(user_id, flow_id)] = run_id
+        self._run_keys[run_id] = (user_id, flow_id)
+
+    def _forget(self, run_id: str) -> None:
+        key = self._run_keys.pop(run_id, None)
+        if key is not None and self._active.get(key) == run_id:
+            del self._active[key]
+
+    async def _execute(self, run_id: str, user_id: int, flow_id: str, request: dict) -> None:
         try:
             await run_execution(
                 run_id=run_id,
                 user_id=user_id,
                 flow_id=flow_id,
-                nodes=nodes,
-                edges=edges,
-                provider_id=provider_id,
-                trigger_node_id=trigger_node_id,
-                cached_outputs=cached_outputs,
+                nodes=request["nodes"],
+                edges=request["edges"],
+                provider_id=request["provider_id"],
+                trigger_node_id=request.get("trigger_node_id"),
+                cached_outputs=request.get("cached_outputs"),
+                pipelined=request.get("pipelined", False),
             )
         except Exception as exc:
             logger.exception("Execution %s failed unexpectedly", run_id)
+            await run_store.finish(run_id, "failed", str(exc))
             await event_bus.emit(Event(
                 type=EventTypes.EXECUTION_FAILED,
                 payload={
@@ -85,3 +258,5 @@ class ExecutionManager:
                     "error": str(exc),
                 },
             ))
+        finally:
+            self._forget(run_id)
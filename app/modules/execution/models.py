@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
+from typing import Awaitable, Callable
 
 from pydantic import BaseModel, Field
 
@@ -43,6 +44,8 @@ class NodeExecutionContext(BaseModel):
     temperature: float = 0.7
     run_id: str = ""
     user_id: int = 0
+    # Set by the runner to receive streamed output text as it is generated
+    on_delta: Callable[[str], Awaitable[None]] | None = Field(default=None, exclude=True)
 
 
 class ResolvedModel(BaseModel):
@@ -58,3 +61,4 @@ class ExecutionRequest(BaseModel):
     provider_id: str
     trigger_node_id: str | None = None
     cached_outputs: dict[str, dict] | None = None
+    pipelined: bool = False
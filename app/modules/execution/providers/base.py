@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
 
 class TextProvider(Protocol):
@@ -13,3 +13,13 @@ class TextProvider(Protocol):
         temperature: float = 0.7,
         max_tokens: int = 2500,
     ) -> str: ...
+
+    def chat_stream(
+        self,
+        messages: list[dict],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2500,
+    ) -> AsyncIterator[str]:
+        """Yield the completion as incremental text deltas."""
+        ...
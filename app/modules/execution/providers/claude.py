@@ -4,17 +4,25 @@ from __future__ import annotations
 
 import logging
 import os
+from typing import AsyncIterator
 
 from anthropic import AsyncAnthropic
 
+from app.modules.execution.providers.limits import (
+    ProviderLimiter,
+    count_tokens,
+    estimate_tokens,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class ClaudeProvider:
-    def __init__(self) -> None:
+    def __init__(self, limiter: ProviderLimiter | None = None) -> None:
         self._client = AsyncAnthropic(
             api_key=os.environ.get("ANTHROPIC_API_KEY", ""),
         )
+        self._limiter = limiter or ProviderLimiter("claude")
 
     async def chat(
         self,
@@ -23,25 +31,55 @@ class ClaudeProvider:
         temperature: float = 0.7,
         max_tokens: int = 2500,
     ) -> str:
-        # Anthropic separates system from user/assistant messages
-        system_msg = ""
-        chat_messages: list[dict] = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system_msg = msg["content"]
-            else:
-                chat_messages.append(msg)
-
         logger.debug("Claude chat: model=%s", model)
+        async with self._limiter.slot(model, estimate_tokens(messages, max_tokens)) as reservation:
+            response = await self._client.messages.create(
+                **_build_kwargs(messages, model, temperature, max_tokens),
+            )
+            usage = response.usage
+            reservation.settle(usage.input_tokens + usage.output_tokens)
+        return response.content[0].text
 
-        kwargs: dict = dict(
-            model=model,
-            messages=chat_messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-        if system_msg:
-            kwargs["system"] = system_msg
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        model: str = "claude-sonnet-4-20250514",
+        temperature: float = 0.7,
+        max_tokens: int = 2500,
+    ) -> AsyncIterator[str]:
+        logger.debug("Claude chat stream: model=%s", model)
+        async with self._limiter.slot(model, estimate_tokens(messages, max_tokens)) as reservation:
+            parts: list[str] = []
+            async with self._client.messages.stream(
+                **_build_kwargs(messages, model, temperature, max_tokens),
+            ) as stream:
+                async for text in stream.text_stream:
+                    parts.append(text)
+                    yield text
+            reservation.settle(count_tokens(messages, "".join(parts)))
 
-        response = await self._client.messages.create(**kwargs)
-        return response.content[0].text
+
+def _build_kwargs(
+    messages: list[dict],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+) -> dict:
+    # Anthropic separates system from user/assistant messages
+    system_msg = ""
+    chat_messages: list[dict] = []
+    for msg in messages:
+        if msg["role"] == "system":
+            system_msg = msg["content"]
+        else:
+            chat_messages.append(msg)
+
+    kwargs: dict = dict(
+        model=model,
+        messages=chat_messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    if system_msg:
+        kwargs["system"] = system_msg
+    return kwargs
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import base64
 import logging
 import os
@@ -10,15 +9,14 @@ from math import gcd
 
 import httpx
 
+from app.modules.execution.providers.flux_poller import FluxResultPoller
 from app.modules.execution.providers.image_base import ImageResult
+from app.modules.execution.providers.limits import ProviderLimiter
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.fireworks.ai/inference/v1/workflows"
 DEFAULT_MODEL = "flux-kontext-pro"
-MAX_POLL_ATTEMPTS = 60
-POLL_INTERVAL = 2.0
-TERMINAL_STATUSES = {"Error", "Content Moderated", "Request Moderated"}
 
 ASPECT_RATIO_MAP: dict[tuple[int, int], str] = {
     (1024, 1024): "1:1",
@@ -32,7 +30,7 @@ ASPECT_RATIO_MAP: dict[tuple[int, int], str] = {
 class FluxImageProvider:
     """Async Flux image provider using the Fireworks AI workflow API."""
 
-    def __init__(self, api_key: str = "") -> None:
+    def __init__(self, api_key: str = "", limiter: ProviderLimiter | None = None) -> None:
         self._api_key = api_key or os.environ.get("FIREWORKS_API_KEY", "")
         self._client = httpx.AsyncClient(
             timeout=httpx.Timeout(30.0, read=60.0),
@@ -41,6 +39,9 @@ class FluxImageProvider:
                 "Content-Type": "application/json",
             },
         )
+        # One poller per provider multiplexes every in-flight generation
+        self._poller = FluxResultPoller(self._client)
+        self._limiter = limiter or ProviderLimiter("blackforestlabs")
 
     async def generate(
         self,
@@ -50,6 +51,7 @@ class FluxImageProvider:
         output_format: str = "png",
         width: int | None = None,
         height: int | None = None,
+        seed: int | None = None,
     ) -> ImageResult:
         resolved_model = model or DEFAULT_MODEL
         resolved_aspect = _resolve_aspect_ratio(aspect_ratio, width, height)
@@ -59,46 +61,34 @@ class FluxImageProvider:
             "Flux generate: model=%s, aspect=%s", resolved_model, resolved_aspect,
         )
 
-        # Step 1: Submit generation request
-        resp = await self._client.post(
-            url,
-            json={
-                "prompt": prompt,
-                "output_format": output_format,
-                "aspect_ratio": resolved_aspect,
-                "safety_tolerance": 6,
-            },
-        )
-        resp.raise_for_status()
-        request_id = resp.json()["request_id"]
-
-        # Step 2: Poll for result
-        result_url = f"{url}/get_result"
-        for _ in range(MAX_POLL_ATTEMPTS):
-            result_resp = await self._client.post(
-                result_url, json={"id": request_id},
-            )
-            data = result_resp.json()
-            status = data.get("status")
-
-            if status == "Ready":
-                image_url = data["result"]["sample"]
-                img_resp = await self._client.get(image_url)
-                img_resp.raise_for_status()
-                image_b64 = base64.b64encode(img_resp.content).decode("ascii")
-                return ImageResult(
-                    image_base64=image_b64,
-                    content_type=f"image/{output_format}",
-                    prompt_used=prompt,
-                )
-
-            if status in TERMINAL_STATUSES:
-                raise RuntimeError(f"Flux generation failed: {status} — {data}")
-
-            await asyncio.sleep(POLL_INTERVAL)
-
-        raise RuntimeError(
-            f"Flux generation timed out after {MAX_POLL_ATTEMPTS * POLL_INTERVAL}s",
+        body = {
+            "prompt": prompt,
+            "output_format": output_format,
+            "aspect_ratio": resolved_aspect,
+            "safety_tolerance": 6,
+        }
+        if seed is not None:
+            body["seed"] = seed
+
+        # A slot covers the whole generation — max_concurrent bounds in-flight jobs
+        async with self._limiter.slot(resolved_model):
+            # Step 1: Submit generation request
+            resp = await self._client.post(url, json=body)
+            resp.raise_for_status()
+            request_id = resp.json()["request_id"]
+
+            # Step 2: Wait for the shared poller to see the result
+            data = await self._poller.wait(f"{url}/get_result", request_id)
+
+        # Step 3: Download the image
+        image_url = data["result"]["sample"]
+        img_resp = await self._client.get(image_url)
+        img_resp.raise_for_status()
+        image_b64 = base64.b64encode(img_resp.content).decode("ascii")
+        return ImageResult(
+            image_base64=image_b64,
+            content_type=f"image/{output_format}",
+            prompt_used=prompt,
         )
 
 
@@ -0,0 +1,171 @@
+"""Shared result poller for in-flight Flux generations.
+
+One background task per provider polls every pending ``request_id`` and
+resolves a future per request, instead of one fixed-interval loop per image.
+
+Polling adapts to observed completion times: the first poll for a request
+is scheduled shortly before the expected completion time (an EMA of past
+generations), polls are dense around that point and back off exponentially
+for stragglers. Outbound polls are capped at ``FLUX_MAX_POLLS_PER_SECOND``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GENERATION_TIMEOUT = 120.0
+MIN_POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 5.0
+BACKOFF_FACTOR = 1.5
+INITIAL_EXPECTED_SECONDS = 8.0
+EXPECTED_EMA_ALPHA = 0.2
+FLUX_MAX_POLLS_PER_SECOND = float(os.environ.get("FLUX_MAX_POLLS_PER_SECOND", "10"))
+TERMINAL_STATUSES = {"Error", "Content Moderated", "Request Moderated"}
+
+
+@dataclass
+class _PendingRequest:
+    request_id: str
+    result_url: str
+    future: asyncio.Future
+    submitted_at: float
+    deadline: float
+    next_poll_at: float
+    interval: float = MIN_POLL_INTERVAL
+    attempts: int = 0
+
+
+@dataclass
+class PollerStats:
+    polls: int = 0
+    completed: int = 0
+    expected_seconds: float = INITIAL_EXPECTED_SECONDS
+
+
+class FluxResultPoller:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_polls_per_second: float = FLUX_MAX_POLLS_PER_SECOND,
+        timeout: float = GENERATION_TIMEOUT,
+    ) -> None:
+        self._client = client
+        self._min_spacing = 1.0 / max_polls_per_second if max_polls_per_second > 0 else 0.0
+        self._timeout = timeout
+        self._pending: dict[str, _PendingRequest] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._in_flight: set[asyncio.Task] = set()
+        self.stats = PollerStats()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def wait(self, result_url: str, request_id: str) -> dict:
+        """Wait until *request_id* is ``Ready`` and return the final result payload.
+
+        Raises ``RuntimeError`` on a terminal failure status or timeout.
+        Cancelling the caller stops polling for this request.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending = _PendingRequest(
+            request_id=request_id,
+            result_url=result_url,
+            future=loop.create_future(),
+            submitted_at=now,
+            deadline=now + self._timeout,
+            next_poll_at=now + max(MIN_POLL_INTERVAL, 0.8 * self.stats.expected_seconds),
+        )
+        self._pending[request_id] = pending
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+        try:
+            return await pending.future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            now = loop.time()
+            for p in list(self._pending.values()):
+                if not p.future.done() and now >= p.deadline:
+                    p.future.set_exception(RuntimeError(
+                        f"Flux generation timed out after {self._timeout:.0f}s",
+                    ))
+
+            due = sorted(
+                (p for p in self._pending.values()
+                 if not p.future.done() and p.next_poll_at <= now),
+                key=lambda p: p.next_poll_at,
+            )
+            if not due:
+                upcoming = [p.next_poll_at for p in self._pending.values() if not p.future.done()]
+                delay = min(min(upcoming, default=now + MIN_POLL_INTERVAL) - now, MIN_POLL_INTERVAL * 4)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), max(delay, 0.0))
+                except TimeoutError:
+                    pass
+                continue
+
+            for p in due:
+                # Not due again until this poll reschedules it
+                p.next_poll_at = float("inf")
+                task = asyncio.create_task(self._poll(p))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+                await asyncio.sleep(self._min_spacing)
+
+    async def _poll(self, p: _PendingRequest) -> None:
+        loop = asyncio.get_running_loop()
+        p.attempts += 1
+        self.stats.polls += 1
+        try:
+            resp = await self._client.post(p.result_url, json={"id": p.request_id})
+            data = resp.json()
+        except Exception as exc:
+            if not p.future.done():
+                p.future.set_exception(exc)
+            return
+
+        status = data.get("status")
+        if p.future.done():
+            return
+
+        if status == "Ready":
+            self._record_completion(loop.time() - p.submitted_at)
+            p.future.set_result(data)
+            return
+
+        if status in TERMINAL_STATUSES:
+            p.future.set_exception(RuntimeError(f"Flux generation failed: {status} — {data}"))
+            return
+
+        # Dense polling around the expected completion time, backoff after it
+        elapsed = loop.time() - p.submitted_at
+        if elapsed < 1.2 * self.stats.expected_seconds:
+            p.interval = MIN_POLL_INTERVAL
+        else:
+            p.interval = min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, p.interval * BACKOFF_FACTOR))
+        p.next_poll_at = loop.time() + p.interval
+        self._wakeup.set()
+
+    def _record_completion(self, seconds: float) -> None:
+        stats = self.stats
+        stats.completed += 1
+        stats.expected_seconds += EXPECTED_EMA_ALPHA * (seconds - stats.expected_seconds)
+        logger.debug(
+            "Flux result ready after %.1fs (expected now %.1fs)", seconds, stats.expected_seconds,
+        )
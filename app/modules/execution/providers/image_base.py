@@ -24,4 +24,5 @@ class ImageProvider(Protocol):
         output_format: str = "png",
         width: int | None = None,
         height: int | None = None,
+        seed: int | None = None,
     ) -> ImageResult: ...
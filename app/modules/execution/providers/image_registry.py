@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 
 from app.modules.execution.providers.flux import FluxImageProvider
+from app.modules.execution.providers.limits import limiter_for
 
 ImageProviderInstance = FluxImageProvider
 
@@ -17,6 +18,7 @@ def _init_image_providers() -> None:
 
     _image_providers["blackforestlabs"] = FluxImageProvider(
         api_key=os.environ.get("FIREWORKS_API_KEY", ""),
+        limiter=limiter_for("blackforestlabs"),
     )
 
 
@@ -0,0 +1,223 @@
+"""Client-side concurrency and rate limiting for provider calls.
+
+Each provider client owns a ``ProviderLimiter``. Every call first takes a
+slot: the per-model semaphore, the provider semaphore, then a request and
+an (estimated) token from the token buckets. Calls that would exceed the
+provider's limits wait here instead of being sent and rejected with a 429,
+so throughput stays at the provider's ceiling under bursts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from app.modules.execution.config.provider_limits import (
+    MODEL_LIMITS,
+    PROVIDER_LIMITS,
+    PROVIDER_LIMITS_DISABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BURST_SECONDS = 10.0
+# Upper bound of what one image content block costs (Claude: ~1.6k tokens)
+IMAGE_TOKENS_ESTIMATE = 1600
+# Waits longer than this are logged — the limit is probably too tight
+SLOW_WAIT_SECONDS = 5.0
+
+
+class TokenBucket:
+    """Refills at *per_minute* / 60 per second up to *capacity*. Waiters are served FIFO."""
+
+    def __init__(self, per_minute: float, burst_seconds: float = DEFAULT_BURST_SECONDS) -> None:
+        self._rate = per_minute / 60.0
+        self.capacity = max(1.0, self._rate * burst_seconds)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Take *amount* tokens, waiting for them. Returns the amount taken,
+        which is clamped to ``capacity``.
+        """
+        # A single call larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            if self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= amount
+        return amount
+
+    def refund(self, amount: float) -> None:
+        """Return over-reserved tokens."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+@dataclass
+class LimiterStats:
+    calls: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.calls += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.calls, 3) if self.calls else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+        }
+
+
+class _Limits:
+    def __init__(self, config: dict[str, float]) -> None:
+        burst = float(config.get("burst_seconds", DEFAULT_BURST_SECONDS))
+        max_concurrent = int(config.get("max_concurrent", 0))
+        rpm = float(config.get("requests_per_minute", 0))
+        tpm = float(config.get("tokens_per_minute", 0))
+        self.semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+        self.requests = TokenBucket(rpm, burst) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, burst) if tpm > 0 else None
+
+
+class Reservation:
+    """Handed out by ``ProviderLimiter.slot``; lets the caller settle token usage."""
+
+    def __init__(self, taken: list[tuple[TokenBucket, float]], reserved: int) -> None:
+        # (bucket, tokens actually taken from it) — less than reserved when clamped
+        self._taken = taken
+        self.reserved = reserved
+
+    def settle(self, actual_tokens: int) -> None:
+        """Refund what was taken beyond *actual_tokens*. Never adds back more
+        than was taken, nor charges for an underestimate.
+        """
+        for i, (bucket, taken) in enumerate(self._taken):
+            refund = max(0.0, taken - actual_tokens)
+            bucket.refund(refund)
+            self._taken[i] = (bucket, taken - refund)
+        self.reserved = min(self.reserved, actual_tokens)
+
+
+class ProviderLimiter:
+    def __init__(
+        self,
+        name: str,
+        config: dict[str, float] | None = None,
+        model_config: dict[str, dict[str, float]] | None = None,
+    ) -> None:
+        self.name = name
+        self._limits = _Limits(config or {})
+        self._model_config = model_config or {}
+        self._model_limits: dict[str, _Limits] = {}
+        self.stats = LimiterStats()
+
+    @asynccontextmanager
+    async def slot(self, model: str = "", tokens: int = 0) -> AsyncIterator[Reservation]:
+        """Hold a call slot for *model*, reserving *tokens* estimated tokens."""
+        layers = [self._limits]
+        if model in self._model_config:
+            if model not in self._model_limits:
+                self._model_limits[model] = _Limits(self._model_config[model])
+            layers.insert(0, self._model_limits[model])
+
+        acquired: list[asyncio.Semaphore] = []
+        start = time.monotonic()
+        self.stats.waiting += 1
+        try:
+            for layer in layers:
+                if layer.semaphore is not None:
+                    await layer.semaphore.acquire()
+                    acquired.append(layer.semaphore)
+            taken: list[tuple[TokenBucket, float]] = []
+            for layer in layers:
+                if layer.requests is not None:
+                    await layer.requests.acquire()
+                if layer.tokens is not None and tokens:
+                    taken.append((layer.tokens, await layer.tokens.acquire(tokens)))
+        except BaseException:
+            for sem in acquired:
+                sem.release()
+            raise
+        finally:
+            self.stats.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.stats.record_wait(waited)
+        if waited >= SLOW_WAIT_SECONDS:
+            logger.info("%s call (model=%s) waited %.1fs for a slot", self.name, model or "-", waited)
+
+        self.stats.in_flight += 1
+        try:
+            yield Reservation(taken, tokens)
+        finally:
+            self.stats.in_flight -= 1
+            for sem in acquired:
+                sem.release()
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    """Rough upper bound for a chat call: ~4 characters per prompt token,
+    ``IMAGE_TOKENS_ESTIMATE`` per image, plus the output budget.
+    """
+    chars = 0
+    images = 0
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict):
+                    chars += len(part.get("text", ""))
+                    images += part.get("type") == "image"
+    return chars // 4 + images * IMAGE_TOKENS_ESTIMATE + max_tokens
+
+
+def count_tokens(messages: list[dict], completion: str) -> int:
+    """Approximate tokens actually used, for settling a reservation."""
+    return estimate_tokens(messages, 0) + len(completion) // 4
+
+
+_limiters: dict[str, ProviderLimiter] = {}
+
+
+def limiter_for(provider_id: str) -> ProviderLimiter:
+    """Build (and register for stats) the limiter for *provider_id*
+    from ``config/provider_limits.py``.
+    """
+    if PROVIDER_LIMITS_DISABLED:
+        limiter = ProviderLimiter(provider_id)
+    else:
+        limiter = ProviderLimiter(
+            provider_id,
+            PROVIDER_LIMITS.get(provider_id),
+            MODEL_LIMITS.get(provider_id),
+        )
+    _limiters[provider_id] = limiter
+    return limiter
+
+
+def limiter_stats() -> dict[str, dict]:
+    return {name: limiter.stats.snapshot() for name, limiter in _limiters.items()}
@@ -3,16 +3,30 @@
 from __future__ import annotations
 
 import logging
+from typing import AsyncIterator
 
 from openai import AsyncOpenAI
 
+from app.modules.execution.providers.limits import (
+    ProviderLimiter,
+    count_tokens,
+    estimate_tokens,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class OpenAICompatProvider:
-    def __init__(self, base_url: str, api_key: str, default_model: str = "") -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        default_model: str = "",
+        limiter: ProviderLimiter | None = None,
+    ) -> None:
         self._client = AsyncOpenAI(base_url=base_url, api_key=api_key)
         self._default_model = default_model
+        self._limiter = limiter or ProviderLimiter(base_url)
 
     async def chat(
         self,
@@ -24,10 +38,45 @@ class OpenAICompatProvider:
         resolved_model = model or self._default_model
         logger.debug("OpenAI-compat chat: model=%s", resolved_model)
 
-        response = await self._client.chat.completions.create(
-            model=resolved_model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-        return response.choices[0].message.content or ""
+        async with self._limiter.slot(
+            resolved_model, estimate_tokens(messages, max_tokens),
+        ) as reservation:
+            response = await self._client.chat.completions.create(
+                model=resolved_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            text = response.choices[0].message.content or ""
+            usage = getattr(response, "usage", None)
+            reservation.settle(
+                usage.total_tokens if usage and usage.total_tokens else count_tokens(messages, text),
+            )
+        return text
+
+    async def chat_stream(
+        self,
+        messages: list[dict],
+        model: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 2500,
+    ) -> AsyncIterator[str]:
+        resolved_model = model or self._default_model
+        logger.debug("OpenAI-compat chat stream: model=%s", resolved_model)
+
+        async with self._limiter.slot(
+            resolved_model, estimate_tokens(messages, max_tokens),
+        ) as reservation:
+            stream = await self._client.chat.completions.create(
+                model=resolved_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            parts: list[str] = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            reservation.settle(count_tokens(messages, "".join(parts)))
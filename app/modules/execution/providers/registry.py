@@ -6,9 +6,14 @@ import os
 from typing import Union
 
 from app.modules.execution.providers.claude import ClaudeProvider
+from app.modules.execution.providers.limits import limiter_for
 from app.modules.execution.providers.openai_compat import OpenAICompatProvider
+from app.modules.execution.providers.singleflight import (
+    SINGLE_FLIGHT_ENABLED,
+    SingleFlightTextProvider,
+)
 
-TextProviderInstance = Union[OpenAICompatProvider, ClaudeProvider]
+TextProviderInstance = Union[OpenAICompatProvider, ClaudeProvider, SingleFlightTextProvider]
 
 _providers: dict[str, TextProviderInstance] = {}
 
@@ -20,20 +25,29 @@ def _init_providers() -> None:
     _providers["mistral"] = OpenAICompatProvider(
         base_url="https://api.mistral.ai/v1",
         api_key=os.environ.get("MISTRAL_API_KEY", ""),
+        limiter=limiter_for("mistral"),
     )
     _providers["glm"] = OpenAICompatProvider(
         base_url="https://api.z.ai/api/coding/paas/v4",
         api_key=os.environ.get("GLM_API_KEY", ""),
+        limiter=limiter_for("glm"),
     )
     _providers["openrouter"] = OpenAICompatProvider(
         base_url="https://openrouter.ai/api/v1",
         api_key=os.environ.get("OPENROUTER_API_KEY", ""),
+        limiter=limiter_for("openrouter"),
     )
     _providers["huggingface"] = OpenAICompatProvider(
         base_url="https://router.huggingface.co/v1",
         api_key=os.environ.get("HF_API_KEY", ""),
+        limiter=limiter_for("huggingface"),
     )
-    _providers["claude"] = ClaudeProvider()
+    _providers["claude"] = ClaudeProvider(limiter=limiter_for("claude"))
+
+    # Identical concurrent calls share one request
+    if SINGLE_FLIGHT_ENABLED:
+        for provider_id, provider in list(_providers.items()):
+            _providers[provider_id] = SingleFlightTextProvider(provider_id, provider)
 
 
 def get_text_provider(provider_id: str) -> TextProviderInstance:
@@ -0,0 +1,158 @@
+"""Single-flight deduplication of identical in-flight text provider calls.
+
+``SingleFlightTextProvider`` wraps a provider client. Concurrent calls with
+the same ``(provider, model, messages, temperature, max_tokens)`` share one
+upstream request: the first caller starts it, later callers join it. Joined
+streams replay what was already streamed and then follow the live stream.
+
+Calls at or above ``SINGLE_FLIGHT_MAX_TEMPERATURE`` (e.g. ``storyTeller``
+at 0.95) always go out on their own — callers expect distinct samples.
+The shared request is cancelled once every caller waiting on it has gone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from app.modules.execution.streaming import TextStream, UpstreamFailed
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_ENABLED = os.environ.get("SINGLE_FLIGHT_ENABLED", "1").lower() in ("1", "true", "yes")
+SINGLE_FLIGHT_MAX_TEMPERATURE = float(os.environ.get("SINGLE_FLIGHT_MAX_TEMPERATURE", "0.9"))
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task | None = None
+    stream: TextStream | None = None
+    error: BaseException | None = None
+    waiters: int = 0
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    shared: int = 0
+    bypassed: int = 0
+    in_flight: int = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls, "shared": self.shared,
+            "bypassed": self.bypassed, "in_flight": self.in_flight,
+        }
+
+
+class SingleFlightTextProvider:
+    def __init__(
+        self,
+        provider_id: str,
+        provider: Any,
+        max_temperature: float = SINGLE_FLIGHT_MAX_TEMPERATURE,
+    ) -> None:
+        self.provider_id = provider_id
+        self._inner = provider
+        self._max_temperature = max_temperature
+        self._chats: dict[str, _Flight] = {}
+        self._streams: dict[str, _Flight] = {}
+        self.stats = SingleFlightStats()
+
+    async def chat(self, messages: list[dict], **kwargs: Any) -> str:
+        self.stats.calls += 1
+        if not self._shareable(kwargs):
+            self.stats.bypassed += 1
+            return await self._inner.chat(messages=messages, **kwargs)
+
+        key = self._key(messages, kwargs)
+        flight = self._chats.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.create_task(self._inner.chat(messages=messages, **kwargs)))
+            self._track(self._chats, key, flight)
+        else:
+            self.stats.shared += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            self._leave(self._chats, key, flight)
+
+    async def chat_stream(self, messages: list[dict], **kwargs: Any) -> AsyncIterator[str]:
+        self.stats.calls += 1
+        if not self._shareable(kwargs):
+            self.stats.bypassed += 1
+            async for delta in self._inner.chat_stream(messages=messages, **kwargs):
+                yield delta
+            return
+
+        key = self._key(messages, kwargs)
+        flight = self._streams.get(key)
+        if flight is None:
+            flight = _Flight(stream=TextStream())
+            flight.task = asyncio.create_task(self._pump(flight, messages, kwargs))
+            self._track(self._streams, key, flight)
+        else:
+            self.stats.shared += 1
+
+        flight.waiters += 1
+        try:
+            async for delta in flight.stream.deltas():
+                yield delta
+        except UpstreamFailed:
+            raise flight.error from None
+        finally:
+            self._leave(self._streams, key, flight)
+
+    async def _pump(self, flight: _Flight, messages: list[dict], kwargs: dict) -> None:
+        stream = flight.stream
+        try:
+            async for delta in self._inner.chat_stream(messages=messages, **kwargs):
+                stream.append(delta)
+        except asyncio.CancelledError:
+            flight.error = asyncio.CancelledError()
+            stream.fail("cancelled")
+            raise
+        except Exception as exc:
+            # Re-raised to every joined caller; nothing awaits this task itself
+            flight.error = exc
+            stream.fail(str(exc))
+            return
+        stream.finish(stream.text)
+
+    def _shareable(self, kwargs: dict) -> bool:
+        return float(kwargs.get("temperature", 0.7)) < self._max_temperature
+
+    def _key(self, messages: list[dict], kwargs: dict) -> str:
+        raw = json.dumps(
+            [self.provider_id, messages, sorted(kwargs.items())],
+            sort_keys=True, separators=(",", ":"), default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _track(self, flights: dict[str, _Flight], key: str, flight: _Flight) -> None:
+        flights[key] = flight
+        self.stats.in_flight += 1
+
+        def done(_: asyncio.Task) -> None:
+            self.stats.in_flight -= 1
+            if flights.get(key) is flight:
+                del flights[key]
+
+        flight.task.add_done_callback(done)
+
+    @staticmethod
+    def _leave(flights: dict[str, _Flight], key: str, flight: _Flight) -> None:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Nobody is listening any more — don't pay for the rest, and
+            # don't let a new caller join the cancelled request
+            if flights.get(key) is flight:
+                del flights[key]
+            flight.task.cancel()
@@ -0,0 +1,105 @@
+"""Replay of missed execution messages after a WebSocket reconnect.
+
+``replay_buffer`` keeps the last ``RUN_REPLAY_BUFFER_EVENTS`` WS messages
+of each of the ``RUN_REPLAY_MAX_RUNS`` most recently active runs this
+process delivered. A client that reconnects sends
+``execution.resume {run_id, last_seq}`` and gets every message after
+``last_seq`` — from the buffer if it still reaches back that far, otherwise
+from ``event_logs`` (persisted events only: streamed deltas are not
+replayed from there, the ``execution.node.completed`` output has the full
+text).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from app.core.events import Event
+from app.core.ws.models import WSMessage
+
+logger = logging.getLogger(__name__)
+
+RUN_REPLAY_BUFFER_EVENTS = int(os.environ.get("RUN_REPLAY_BUFFER_EVENTS", "512"))
+RUN_REPLAY_MAX_RUNS = int(os.environ.get("RUN_REPLAY_MAX_RUNS", "1000"))
+
+
+@dataclass
+class _RunBuffer:
+    user_id: int
+    messages: deque[tuple[int, WSMessage]] = field(default_factory=deque)
+
+
+class RunReplayBuffer:
+    def __init__(
+        self,
+        max_events: int = RUN_REPLAY_BUFFER_EVENTS,
+        max_runs: int = RUN_REPLAY_MAX_RUNS,
+    ) -> None:
+        self._max_events = max_events
+        self._max_runs = max_runs
+        self._runs: OrderedDict[str, _RunBuffer] = OrderedDict()
+
+    def record(self, user_id: int, run_id: str, seq: int | None, message: WSMessage) -> None:
+        if seq is None:
+            return
+        buffer = self._runs.get(run_id)
+        if buffer is None:
+            buffer = self._runs[run_id] = _RunBuffer(user_id, deque(maxlen=self._max_events))
+            if len(self._runs) > self._max_runs:
+                self._runs.popitem(last=False)
+        else:
+            self._runs.move_to_end(run_id)
+        buffer.messages.append((seq, message))
+
+    def since(self, user_id: int, run_id: str, last_seq: int) -> tuple[list[WSMessage], bool]:
+        """Buffered messages after *last_seq*, and whether the buffer reaches
+        back far enough that nothing in between is missing.
+        """
+        buffer = self._runs.get(run_id)
+        if buffer is None or buffer.user_id != user_id or not buffer.messages:
+            return [], False
+        complete = buffer.messages[0][0] <= last_seq + 1
+        return [m for seq, m in buffer.messages if seq > last_seq], complete
+
+
+replay_buffer = RunReplayBuffer()
+
+
+async def replay_messages(user_id: int, run_id: str, last_seq: int) -> list[WSMessage]:
+    """Every message of *user_id*'s run *run_id* after *last_seq*, in order."""
+    buffered, complete = replay_buffer.since(user_id, run_id, last_seq)
+    if complete:
+        return buffered
+
+    from app.modules.execution.handlers import build_ws_message
+
+    by_seq: dict[int, WSMessage] = {}
+    try:
+        from sqlalchemy import select
+
+        from app.core.db.base import async_session
+        from app.models.event_log import EventLog
+
+        async with async_session() as db:
+            rows = (await db.execute(
+                select(EventLog.event_name, EventLog.payload, EventLog.seq)
+                .where(
+                    EventLog.run_id == run_id,
+                    EventLog.user_id == user_id,
+                    EventLog.seq > last_seq,
+                )
+                .order_by(EventLog.seq)
+            )).all()
+        for name, payload, seq in rows:
+            message = build_ws_message(Event(type=name, payload=payload, seq=seq))
+            if message is not None:
+                by_seq[seq] = message
+    except Exception:
+        logger.exception("Failed to load events of run %s for replay", run_id)
+
+    # Buffered messages win: they include the deltas event_logs doesn't have
+    by_seq.update((m.data["seq"], m) for m in buffered)
+    return [by_seq[seq] for seq in sorted(by_seq)]
@@ -0,0 +1,168 @@
+"""Postgres-backed run queue for executing runs in separate worker processes.
+
+With ``EXECUTION_BACKEND=queue`` the API process does not execute runs.
+``ExecutionManager.run`` records the run unowned in ``execution_runs`` and
+NOTIFYs ``RUN_QUEUE_CHANNEL``. Executor workers (``python -m app.worker``)
+claim runs with ``SELECT ... FOR UPDATE SKIP LOCKED`` (``run_store.claim_stale``)
+up to their free capacity, execute them, and publish their events through
+the event broker to the API processes holding the users' sockets. A worker
+that dies stops heartbeating; its runs become claimable again after
+``RUN_STALE_AFTER`` and resume from their checkpoints.
+
+Cancellation crosses processes through the ``cancel_requested`` flag. A run
+with no live worker is cancelled in place; a claimed run is flagged and its
+worker cancels it — woken by ``RUN_CONTROL_CHANNEL``, with polling every
+``RUN_QUEUE_POLL_INTERVAL`` as a backstop for missed notifications. If
+that worker dies first, the worker that claims the stale run cancels it.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Literal
+
+from app.modules.execution.run_store import ACTIVE_STATUSES, run_store
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionBackend(str, Enum):
+    LOCAL = "local"
+    QUEUE = "queue"
+
+
+EXECUTION_BACKEND = ExecutionBackend(os.environ.get("EXECUTION_BACKEND", ExecutionBackend.LOCAL.value))
+RUN_QUEUE_POLL_INTERVAL = float(os.environ.get("RUN_QUEUE_POLL_INTERVAL", "2"))
+
+RUN_QUEUE_CHANNEL = "execution_runs"
+RUN_CONTROL_CHANNEL = "execution_control"
+
+CancelOutcome = Literal["cancelled", "requested"]
+
+
+@dataclass
+class CancelRequest:
+    run_id: str
+    user_id: int
+    superseded_by: str | None
+
+
+class RunQueue:
+    async def enqueue(self, run_id: str, user_id: int, flow_id: str, request: dict) -> None:
+        """Add a run for any worker to claim. Raises if it can't be recorded."""
+        from app.core.db.base import async_session
+        from app.core.db.notify import notify
+        from app.models.execution_run import ExecutionRun
+
+        async with async_session() as db:
+            db.add(ExecutionRun(
+                id=run_id,
+                user_id=user_id,
+                flow_id=flow_id,
+                status="queued",
+                request=request,
+            ))
+            await notify(db, RUN_QUEUE_CHANNEL, run_id)
+            await db.commit()
+
+    async def request_cancel(
+        self,
+        run_id: str,
+        user_id: int,
+        superseded_by: str | None = None,
+    ) -> CancelOutcome | None:
+        """Cancel *user_id*'s run.
+
+        Returns ``"cancelled"`` if the run had no live worker and is now
+        cancelled, ``"requested"`` if its worker was asked to cancel it (and
+        will emit ``execution.cancelled``), or ``None`` if there is no such
+        active run.
+        """
+        from sqlalchemy import select
+
+        from app.core.db.base import async_session
+        from app.models.execution_run import ExecutionRun
+
+        async with async_session() as db:
+            run = (await db.execute(
+                select(ExecutionRun)
+                .where(
+                    ExecutionRun.id == run_id,
+                    ExecutionRun.user_id == user_id,
+                    ExecutionRun.status.in_(ACTIVE_STATUSES),
+                )
+                .with_for_update()
+            )).scalar_one_or_none()
+            if run is None:
+                return None
+            outcome = await self._cancel_locked(db, run, superseded_by)
+            await db.commit()
+        return outcome
+
+    async def supersede(self, user_id: int, flow_id: str, new_run_id: str) -> list[str]:
+        """Cancel *user_id*'s other active runs of *flow_id*.
+
+        Returns the ids of runs cancelled in place; the rest are cancelled
+        by their workers.
+        """
+        from sqlalchemy import select
+
+        from app.core.db.base import async_session
+        from app.models.execution_run import ExecutionRun
+
+        cancelled: list[str] = []
+        async with async_session() as db:
+            runs = (await db.execute(
+                select(ExecutionRun)
+                .where(
+                    ExecutionRun.user_id == user_id,
+                    ExecutionRun.flow_id == flow_id,
+                    ExecutionRun.id != new_run_id,
+                    ExecutionRun.status.in_(ACTIVE_STATUSES),
+                    ExecutionRun.cancel_requested.is_(False),
+                )
+                .with_for_update()
+            )).scalars().all()
+            for run in runs:
+                if await self._cancel_locked(db, run, new_run_id) == "cancelled":
+                    cancelled.append(run.id)
+            await db.commit()
+        return cancelled
+
+    async def cancel_requests(self, worker_id: str) -> list[CancelRequest]:
+        """Active runs owned by *worker_id* that the API asked to cancel."""
+        from sqlalchemy import select
+
+        from app.core.db.base import async_session
+        from app.models.execution_run import ExecutionRun
+
+        async with async_session() as db:
+            rows = (await db.execute(
+                select(ExecutionRun.id, ExecutionRun.user_id, ExecutionRun.superseded_by)
+                .where(
+                    ExecutionRun.worker_id == worker_id,
+                    ExecutionRun.cancel_requested.is_(True),
+                    ExecutionRun.status.in_(ACTIVE_STATUSES),
+                )
+            )).all()
+        return [CancelRequest(*row) for row in rows]
+
+    @staticmethod
+    async def _cancel_locked(db, run, superseded_by: str | None) -> CancelOutcome:
+        from app.core.db.notify import notify
+
+        run.superseded_by = superseded_by
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=run_store.stale_after)
+        if run.worker_id is None or run.heartbeat_at is None or run.heartbeat_at < cutoff:
+            run.status = "cancelled"
+            return "cancelled"
+        run.cancel_requested = True
+        await notify(db, RUN_CONTROL_CHANNEL, run.id)
+        return "requested"
+
+
+run_queue = RunQueue()
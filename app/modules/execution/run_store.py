@@ -0,0 +1,360 @@
+"""Durable run state — run rows and per-node checkpoints in the database.
+
+Every run gets an ``execution_runs`` row holding its request (enough to
+re-plan the graph) and owned by this worker, whose heartbeat keeps it
+fresh. Each completed node is checkpointed into ``execution_node_states``
+(write-behind, never blocking the run).
+
+On startup a worker claims runs left ``queued``/``running`` by a worker
+whose heartbeat went stale (crash) or that released them on shutdown
+(deploy), and resumes them with completed node outputs passed as
+``cached_outputs`` — finished nodes, including expensive image
+generations, are not run again.
+
+With ``EXECUTION_BACKEND=queue`` runs are created unowned and the same
+claim is how executor workers take them off the queue (see
+``run_queue.py``).
+
+Persistence failures are logged and never fail a run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from app.modules.execution.models import NodeOutput
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_DURABLE_RUNS = os.environ.get("EXECUTION_DURABLE_RUNS", "1").lower() in ("1", "true", "yes")
+EXECUTION_WORKER_ID = os.environ.get("EXECUTION_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+RUN_HEARTBEAT_INTERVAL = float(os.environ.get("RUN_HEARTBEAT_INTERVAL", "10"))
+RUN_STALE_AFTER = float(os.environ.get("RUN_STALE_AFTER", "60"))
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+@dataclass
+class ResumableRun:
+    run_id: str
+    user_id: int
+    flow_id: str
+    request: dict
+    # "running" if a previous worker had already started it
+    status: str = "queued"
+    # Last event seq emitted for the run — its events continue after it
+    last_seq: int = 0
+    # Cancelled while it had no live worker — announce it instead of resuming
+    cancelled: bool = False
+    superseded_by: str | None = None
+    completed: dict[str, dict] = field(default_factory=dict)
+
+
+class RunStore:
+    def __init__(
+        self,
+        enabled: bool = EXECUTION_DURABLE_RUNS,
+        worker_id: str = EXECUTION_WORKER_ID,
+        heartbeat_interval: float = RUN_HEARTBEAT_INTERVAL,
+        stale_after: float = RUN_STALE_AFTER,
+    ) -> None:
+        self.enabled = enabled
+        self.worker_id = worker_id
+        self._heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._pending: dict[str, set[asyncio.Task]] = {}
+        self._heartbeat_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.enabled and (self._heartbeat_task is None or self._heartbeat_task.done()):
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    async def shutdown(self) -> None:
+        """Stop heartbeating and release this worker's active runs so the
+        next worker resumes them right away instead of waiting out the
+        staleness window.
+        """
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        for tasks in list(self._pending.values()):
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if not self.enabled:
+            return
+        try:
+            from sqlalchemy import update
+
+            from app.core.db.base import async_session
+            from app.models.execution_run import ExecutionRun
+
+            async with async_session() as db:
+                await self._record_last_seqs(db)
+                await db.execute(
+                    update(ExecutionRun)
+                    .where(
+                        ExecutionRun.worker_id == self.worker_id,
+                        ExecutionRun.status.in_(ACTIVE_STATUSES),
+                    )
+                    .values(worker_id=None, heartbeat_at=None)
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to release active runs of worker %s", self.worker_id)
+
+    async def create(
+        self,
+        run_id: str,
+        user_id: int,
+        flow_id: str,
+        request: dict,
+        owned: bool = True,
+    ) -> None:
+        """Record a new run, owned by this worker unless *owned* is false
+        (left for a queue worker to claim).
+        """
+        if not self.enabled:
+            return
+        try:
+            from app.core.db.base import async_session
+            from app.models.execution_run import ExecutionRun
+
+            async with async_session() as db:
+                db.add(ExecutionRun(
+                    id=run_id,
+                    user_id=user_id,
+                    flow_id=flow_id,
+                    status="queued",
+                    request=request,
+                    worker_id=self.worker_id if owned else None,
+                    heartbeat_at=datetime.now(timezone.utc) if owned else None,
+                ))
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to record run %s", run_id)
+
+    async def mark_running(self, run_id: str) -> None:
+        await self._set_status(run_id, "running")
+
+    def checkpoint(self, run_id: str, node_id: str, output: NodeOutput) -> None:
+        """Record a completed node in the background."""
+        if not self.enabled or output.error:
+            return
+        task = asyncio.create_task(self._save_node(run_id, node_id, output))
+        tasks = self._pending.setdefault(run_id, set())
+        tasks.add(task)
+
+        def done(t: asyncio.Task) -> None:
+            tasks.discard(t)
+            if not tasks and self._pending.get(run_id) is tasks:
+                del self._pending[run_id]
+
+        task.add_done_callback(done)
+
+    async def finish(self, run_id: str, status: str, error: str | None = None) -> None:
+        """Mark the run terminal once its outstanding checkpoints are written."""
+        pending = self._pending.get(run_id)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self._set_status(run_id, status, error)
+
+    async def claim_stale(self, limit: int | None = None) -> list[ResumableRun]:
+        """Take ownership of up to *limit* active runs that have no live
+        worker (unowned, released or stale) and return them with their
+        completed node outputs.
+
+        Runs among them whose cancellation was requested (their worker died
+        before carrying it out) are marked cancelled instead and returned
+        with ``cancelled`` set.
+        """
+        if not self.enabled:
+            return []
+        try:
+            from sqlalchemy import or_, select
+
+            from app.core.db.base import async_session
+            from app.models.execution_node_state import ExecutionNodeState
+            from app.models.execution_run import ExecutionRun
+
+            now = datetime.now(timezone.utc)
+            cutoff = now - timedelta(seconds=self.stale_after)
+            async with async_session() as db:
+                runs = (await db.execute(
+                    select(ExecutionRun)
+                    .where(
+                        ExecutionRun.status.in_(ACTIVE_STATUSES),
+                        or_(
+                            ExecutionRun.worker_id.is_(None),
+                            ExecutionRun.heartbeat_at.is_(None),
+                            ExecutionRun.heartbeat_at < cutoff,
+                        ),
+                    )
+                    .order_by(ExecutionRun.created_at)
+                    .limit(limit)
+                    # Several workers may claim at once — each run goes to one of them
+                    .with_for_update(skip_locked=True)
+                )).scalars().all()
+                if not runs:
+                    return []
+
+                claimed = {
+                    run.id: ResumableRun(
+                        run.id, run.user_id, run.flow_id, run.request, run.status, run.last_seq,
+                        cancelled=run.cancel_requested,
+                        superseded_by=run.superseded_by,
+                    )
+                    for run in runs
+                }
+                for run in runs:
+                    if run.cancel_requested:
+                        run.status = "cancelled"
+                    else:
+                        run.worker_id = self.worker_id
+                        run.heartbeat_at = now
+
+                states = (await db.execute(
+                    select(ExecutionNodeState).where(
+                        ExecutionNodeState.run_id.in_(claimed),
+                        ExecutionNodeState.status == "completed",
+                    )
+                )).scalars().all()
+                for state in states:
+                    claimed[state.run_id].completed[state.node_id] = state.output
+                for run_id, logged in await self._logged_last_seqs(db, list(claimed)):
+                    claimed[run_id].last_seq = max(claimed[run_id].last_seq, logged or 0)
+                await db.commit()
+
+            return list(claimed.values())
+        except Exception:
+            logger.exception("Failed to claim stale runs")
+            return []
+
+    async def last_seq(self, run_id: str) -> int:
+        """The last event seq known to have been emitted for *run_id* by any
+        process — from its heartbeated ``last_seq`` and ``event_logs``.
+        """
+        if not self.enabled:
+            return 0
+        try:
+            from sqlalchemy import select
+
+            from app.core.db.base import async_session
+            from app.models.execution_run import ExecutionRun
+
+            async with async_session() as db:
+                recorded = (await db.execute(
+                    select(ExecutionRun.last_seq).where(ExecutionRun.id == run_id)
+                )).scalar_one_or_none() or 0
+                logged = [seq or 0 for _, seq in await self._logged_last_seqs(db, [run_id])]
+            return max([recorded, *logged])
+        except Exception:
+            logger.exception("Failed to read last seq of run %s", run_id)
+            return 0
+
+    @staticmethod
+    async def _logged_last_seqs(db, run_ids: list[str]) -> list[tuple[str, int | None]]:
+        from sqlalchemy import func, select
+
+        from app.models.event_log import EventLog
+
+        return (await db.execute(
+            select(EventLog.run_id, func.max(EventLog.seq))
+            .where(EventLog.run_id.in_(run_ids))
+            .group_by(EventLog.run_id)
+        )).all()
+
+    async def _record_last_seqs(self, db) -> None:
+        """Store the current seq of this worker's active runs. Streamed
+        deltas are never logged, so ``event_logs`` alone can lag behind.
+        """
+        from sqlalchemy import bindparam, func, update
+
+        from app.core.bus import event_bus
+        from app.models.execution_run import ExecutionRun
+
+        runs = ExecutionRun.__table__
+        last_seqs = event_bus.sequencer.last_seqs()
+        if not last_seqs:
+            return
+        await db.execute(
+            update(runs)
+            .where(
+                runs.c.id == bindparam("b_run_id"),
+                runs.c.worker_id == self.worker_id,
+                runs.c.status.in_(ACTIVE_STATUSES),
+            )
+            .values(last_seq=func.greatest(runs.c.last_seq, bindparam("b_last_seq"))),
+            [{"b_run_id": run_id, "b_last_seq": seq} for run_id, seq in last_seqs.items()],
+        )
+
+    async def _save_node(self, run_id: str, node_id: str, output: NodeOutput) -> None:
+        try:
+            from sqlalchemy.dialects.postgresql import insert
+
+            from app.core.db.base import async_session
+            from app.models.execution_node_state import ExecutionNodeState
+
+            values = {
+                "status": "completed",
+                "output": output.model_dump(exclude_none=True),
+                "updated_at": datetime.now(timezone.utc),
+            }
+            async with async_session() as db:
+                await db.execute(
+                    insert(ExecutionNodeState)
+                    .values(run_id=run_id, node_id=node_id, **values)
+                    .on_conflict_do_update(index_elements=["run_id", "node_id"], set_=values)
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to checkpoint node %s of run %s", node_id, run_id)
+
+    async def _set_status(self, run_id: str, status: str, error: str | None = None) -> None:
+        if not self.enabled:
+            return
+        try:
+            from sqlalchemy import update
+
+            from app.core.db.base import async_session
+            from app.models.execution_run import ExecutionRun
+
+            async with async_session() as db:
+                await db.execute(
+                    update(ExecutionRun)
+                    # A finished run stays finished (e.g. a late cancel after completion)
+                    .where(ExecutionRun.id == run_id, ExecutionRun.status.in_(ACTIVE_STATUSES))
+                    .values(status=status, error=error, heartbeat_at=datetime.now(timezone.utc))
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to set run %s to %s", run_id, status)
+
+    async def _heartbeat_loop(self) -> None:
+        from sqlalchemy import update
+
+        from app.core.db.base import async_session
+        from app.models.execution_run import ExecutionRun
+
+        while True:
+            await asyncio.sleep(self._heartbeat_interval)
+            try:
+                async with async_session() as db:
+                    await db.execute(
+                        update(ExecutionRun)
+                        .where(
+                            ExecutionRun.worker_id == self.worker_id,
+                            ExecutionRun.status.in_(ACTIVE_STATUSES),
+                        )
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    await self._record_last_seqs(db)
+                    await db.commit()
+            except Exception:
+                logger.exception("Run heartbeat failed")
+
+
+run_store = RunStore()
@@ -9,17 +9,43 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from typing import Awaitable, Callable
 
 from app.core.bus import event_bus
 from app.core.events import Event, EventTypes
+from app.modules.execution.cache import compute_cache_key, is_cacheable, node_output_cache
 from app.modules.execution.config.model_defaults import resolve_model_for_node
-from app.modules.execution.executors.registry import get_executor
-from app.modules.execution.graph.topological_sort import group_by_levels, topological_sort
+from app.modules.execution.config.node_timeouts import timeout_for
+from app.modules.execution.executors.registry import (
+    STREAMING_NODE_TYPES,
+    get_executor,
+    get_pipelined_executor,
+)
+from app.modules.execution.graph.compiled import compile_graph, node_type_of
+from app.modules.execution.graph.topological_sort import topological_sort
 from app.modules.execution.graph.traversal import get_downstream_nodes, get_upstream_nodes
 from app.modules.execution.models import ExecutionStep, NodeExecutionContext, NodeOutput
+from app.modules.execution.run_store import run_store
+from app.modules.execution.scheduling import run_when_ready
+from app.modules.execution.streaming import DeltaCoalescer, TextStream, UpstreamFailed
 
 logger = logging.getLogger(__name__)
 
+# Runs being wound down after a newer run superseded them: no new nodes
+# start and nothing more is emitted, but in-flight nodes finish so the newer
+# run can pick up their outputs (see ``NodeOutputCache.in_flight``).
+_draining: set[str] = set()
+
+
+def drain_run(run_id: str) -> None:
+    _draining.add(run_id)
+
+
+async def _emit(event: Event, persist: bool = True) -> None:
+    if event.payload.get("run_id") in _draining:
+        return
+    await event_bus.emit(event, persist=persist)
+
 
 async def run_execution(
     run_id: str,
@@ -30,26 +56,29 @@ async def run_execution(
     provider_id: str,
     trigger_node_id: str | None = None,
     cached_outputs: dict[str, dict] | None = None,
+    pipelined: bool = False,
 ) -> dict[str, NodeOutput]:
     """Execute a graph and emit events for every state transition.
 
+    With *pipelined*, eligible nodes (see ``PIPELINED_EXECUTORS``) start as
+    soon as their upstream text node starts and process its output
+    paragraph by paragraph while it streams.
+
     Returns the final outputs map.
     """
     cached_outputs = cached_outputs or {}
     outputs: dict[str, NodeOutput] = {}
 
-    # Index nodes by ID and extract type
-    nodes_by_id: dict[str, dict] = {}
-    for n in nodes:
-        nid = n["id"]
-        ntype = n.get("type") or (n.get("data") or {}).get("type") or ""
-        nodes_by_id[nid] = {**n, "type": ntype, "data": n.get("data") or {}}
+    # ── Compile adjacency indexes once for the whole run ──
+    graph = compile_graph(nodes, edges)
+    nodes_by_id = graph.nodes_by_id
 
     # ── Topological sort ──
     try:
-        steps = topological_sort(nodes, edges)
+        steps = topological_sort(graph)
     except ValueError as exc:
-        await event_bus.emit(Event(
+        await run_store.finish(run_id, "failed", str(exc))
+        await _emit(Event(
             type=EventTypes.EXECUTION_FAILED,
             payload={"run_id": run_id, "user_id": user_id, "error": str(exc)},
         ))
@@ -57,8 +86,8 @@ async def run_execution(
 
     # ── Partial re-execution filter ──
     if trigger_node_id:
-        downstream = get_downstream_nodes(trigger_node_id, nodes, edges)
-        upstream = get_upstream_nodes(trigger_node_id, nodes, edges)
+        downstream = get_downstream_nodes(trigger_node_id, graph)
+        upstream = get_upstream_nodes(trigger_node_id, graph)
         execution_set = {trigger_node_id} | downstream
 
         # Pre-populate cached upstream nodes
@@ -70,35 +99,112 @@ async def run_execution(
 
         steps = [s for s in steps if s.node_id in execution_set]
 
-    # ── Level grouping for parallelism ──
-    levels = group_by_levels(steps)
-
     # ── Emit pending for all nodes ──
     for step in steps:
         if step.node_id not in outputs:  # skip pre-cached
-            await event_bus.emit(Event(
+            await _emit(Event(
                 type=EventTypes.NODE_PENDING,
                 payload={"run_id": run_id, "user_id": user_id, "node_id": step.node_id},
             ))
 
-    # ── Execute level by level ──
-    for level in levels:
-        tasks = [
-            _execute_node(step, outputs, nodes_by_id, provider_id, run_id, user_id, cached_outputs)
-            for step in level
-        ]
-        await asyncio.gather(*tasks)
-
-    # ── Final event ──
-    serialized = {nid: out.model_dump(exclude_none=True) for nid, out in outputs.items()}
-    await event_bus.emit(Event(
-        type=EventTypes.EXECUTION_COMPLETED,
-        payload={"run_id": run_id, "user_id": user_id, "outputs": serialized},
-    ))
+    # ── Pipelined consumers read their upstream's text while it streams ──
+    streams: dict[str, TextStream] = {}
+    pipelined_ids: set[str] = set()
+    if pipelined:
+        step_types = {s.node_id: s.node_type for s in steps}
+        for step in steps:
+            if _can_pipeline(step, step_types, cached_outputs):
+                streams.setdefault(step.input_node_ids[0], TextStream())
+                pipelined_ids.add(step.node_id)
+
+    # ── Execute each node as soon as its dependencies finish ──
+    # The trigger node is always re-run; everything else may hit the cache.
+    async def run_step(step: ExecutionStep) -> None:
+        if run_id in _draining:
+            return
+        stream = streams.get(step.node_id)
+        on_text = stream.append if stream is not None else None
+        try:
+            if step.node_id in pipelined_ids:
+                await _execute_pipelined_node(
+                    step, streams[step.input_node_ids[0]], outputs, nodes_by_id,
+                    provider_id, run_id, user_id,
+                    read_cache=step.node_id != trigger_node_id, on_text=on_text,
+                )
+            else:
+                await _execute_node(
+                    step, outputs, nodes_by_id, provider_id, run_id, user_id, cached_outputs,
+                    read_cache=step.node_id != trigger_node_id, on_text=on_text,
+                )
+        finally:
+            if stream is not None:
+                output = outputs.get(step.node_id)
+                if output is None or output.error:
+                    stream.fail(f"Upstream node {step.node_id} failed")
+                else:
+                    stream.finish(output.text or "")
+
+    await run_store.mark_running(run_id)
+    try:
+        await run_when_ready(steps, run_step, early_start=pipelined_ids)
+
+        # ── Final event ──
+        if run_id not in _draining:
+            await run_store.finish(run_id, "completed")
+        serialized = {nid: out.model_dump(exclude_none=True) for nid, out in outputs.items()}
+        await _emit(Event(
+            type=EventTypes.EXECUTION_COMPLETED,
+            payload={"run_id": run_id, "user_id": user_id, "outputs": serialized},
+        ))
+    finally:
+        _draining.discard(run_id)
 
     return outputs
 
 
+def _can_pipeline(
+    step: ExecutionStep,
+    step_types: dict[str, str],
+    cached_outputs: dict[str, dict],
+) -> bool:
+    """A node is pipelined when it has a pipelined executor and exactly one
+    text input, produced in this run by a node type that streams text.
+    """
+    if get_pipelined_executor(step.node_type) is None:
+        return False
+    if step.adapter_node_ids or len(set(step.input_node_ids)) != 1:
+        return False
+    if step.node_id in cached_outputs:
+        return False
+    return step_types.get(step.input_node_ids[0]) in STREAMING_NODE_TYPES
+
+
+def _delta_emitter(
+    run_id: str,
+    user_id: int,
+    node_id: str,
+    on_text: Callable[[str], None] | None,
+) -> tuple[DeltaCoalescer, Callable]:
+    """Build the coalesced delta stream for a node, optionally mirrored into
+    ``on_text`` (the node's own ``TextStream`` for pipelined consumers).
+    """
+    async def emit_delta(text: str) -> None:
+        await _emit(Event(
+            type=EventTypes.NODE_DELTA,
+            payload={"run_id": run_id, "user_id": user_id, "node_id": node_id, "delta": text},
+        ), persist=False)
+
+    deltas = DeltaCoalescer(emit_delta)
+    if on_text is None:
+        return deltas, deltas.push
+
+    async def on_delta(text: str) -> None:
+        on_text(text)
+        await deltas.push(text)
+
+    return deltas, on_delta
+
+
 async def _execute_node(
     step: ExecutionStep,
     outputs: dict[str, NodeOutput],
@@ -107,6 +213,8 @@ async def _execute_node(
     run_id: str,
     user_id: int,
     cached_outputs: dict[str, dict],
+    read_cache: bool = True,
+    on_text: Callable[[str], None] | None = None,
 ) -> None:
     """Execute a single node, updating the shared outputs map."""
     node_id = step.node_id
@@ -119,7 +227,7 @@ async def _execute_node(
     if node_id in cached_outputs:
         output = NodeOutput(**cached_outputs[node_id])
         outputs[node_id] = output
-        await event_bus.emit(Event(
+        await _emit(Event(
             type=EventTypes.NODE_COMPLETED,
             payload={
                 "run_id": run_id, "user_id": user_id,
@@ -135,7 +243,7 @@ async def _execute_node(
         if dep_output and dep_output.error:
             reason = f"Upstream node {dep_id} failed"
             outputs[node_id] = NodeOutput(error=reason)
-            await event_bus.emit(Event(
+            await _emit(Event(
                 type=EventTypes.NODE_SKIPPED,
                 payload={"run_id": run_id, "user_id": user_id, "node_id": node_id, "reason": reason},
             ))
@@ -145,7 +253,7 @@ async def _execute_node(
     executor = get_executor(step.node_type)
     if not executor:
         outputs[node_id] = NodeOutput(error=f"No executor for type: {step.node_type}")
-        await event_bus.emit(Event(
+        await _emit(Event(
             type=EventTypes.NODE_SKIPPED,
             payload={
                 "run_id": run_id, "user_id": user_id,
@@ -163,6 +271,34 @@ async def _execute_node(
     node_data = node_info.get("data") or {}
     resolved = resolve_model_for_node(node_data, step.node_type, flow_provider_id)
 
+    # ── Content-addressed output cache ──
+    cache_key: str | None = None
+    if is_cacheable(step.node_type, node_data):
+        cache_key = compute_cache_key(
+            step.node_type, resolved, node_data, text_inputs, adapter_inputs,
+        )
+        hit = await node_output_cache.get(cache_key) if read_cache else None
+        if hit is None and read_cache:
+            # Same node already running elsewhere (e.g. in a superseded run)?
+            pending = node_output_cache.in_flight(cache_key)
+            if pending is not None:
+                shared = await asyncio.shield(pending)
+                hit = shared.model_copy() if shared is not None else None
+        if hit is not None:
+            outputs[node_id] = hit
+            run_store.checkpoint(run_id, node_id, hit)
+            await _emit(Event(
+                type=EventTypes.NODE_COMPLETED,
+                payload={
+                    "run_id": run_id, "user_id": user_id,
+                    "node_id": node_id, "output": hit.model_dump(exclude_none=True),
+                },
+            ))
+            return
+
+    # ── Stream partial text as coalesced delta events (not persisted) ──
+    deltas, on_delta = _delta_emitter(run_id, user_id, node_id, on_text)
+
     ctx = NodeExecutionContext(
         node_id=node_id,
         node_type=step.node_type,
@@ -174,23 +310,32 @@ async def _execute_node(
         temperature=resolved.temperature,
         run_id=run_id,
         user_id=user_id,
+        on_delta=on_delta,
     )
 
     # ── Emit running ──
-    await event_bus.emit(Event(
+    await _emit(Event(
         type=EventTypes.NODE_RUNNING,
         payload={"run_id": run_id, "user_id": user_id, "node_id": node_id},
     ))
 
     # ── Execute ──
+    # Identical nodes (same cache key) in other runs can await this one
+    in_flight = node_output_cache.begin(cache_key) if cache_key else None
     try:
         start = time.perf_counter()
-        output = await executor(ctx)
+        try:
+            output = await _with_timeout(executor(ctx), timeout_for(step.node_type))
+        finally:
+            await deltas.flush()
         if output.duration_ms is None:
             output.duration_ms = (time.perf_counter() - start) * 1000
         outputs[node_id] = output
+        run_store.checkpoint(run_id, node_id, output)
+        if cache_key:
+            await node_output_cache.put(cache_key, step.node_type, output)
 
-        await event_bus.emit(Event(
+        await _emit(Event(
             type=EventTypes.NODE_COMPLETED,
             payload={
                 "run_id": run_id, "user_id": user_id,
@@ -200,7 +345,154 @@ async def _execute_node(
     except Exception as exc:
         logger.exception("Executor failed for node %s", node_id)
         outputs[node_id] = NodeOutput(error=str(exc))
-        await event_bus.emit(Event(
+        await _emit(Event(
             type=EventTypes.NODE_FAILED,
             payload={"run_id": run_id, "user_id": user_id, "node_id": node_id, "error": str(exc)},
         ))
+    finally:
+        if in_flight is not None:
+            node_output_cache.end(cache_key, in_flight, outputs.get(node_id))
+
+
+async def _execute_pipelined_node(
+    step: ExecutionStep,
+    upstream: TextStream,
+    outputs: dict[str, NodeOutput],
+    nodes_by_id: dict[str, dict],
+    flow_provider_id: str,
+    run_id: str,
+    user_id: int,
+    read_cache: bool = True,
+    on_text: Callable[[str], None] | None = None,
+) -> None:
+    """Execute a node on its upstream's text while that text streams.
+
+    Started as soon as the upstream node starts. If the upstream fails, the
+    node is skipped; if the upstream's final text does not match what was
+    streamed, the node re-runs on the final text with its regular executor.
+    If the upstream finishes before a paragraph streams (e.g. a cache hit),
+    the node is looked up in the output cache first.
+    """
+    node_id = step.node_id
+    upstream_id = step.input_node_ids[0]
+    executor = get_pipelined_executor(step.node_type)
+
+    node_info = nodes_by_id.get(node_id, {})
+    node_data = node_info.get("data") or {}
+    resolved = resolve_model_for_node(node_data, step.node_type, flow_provider_id)
+
+    cacheable = is_cacheable(step.node_type, node_data)
+    if cacheable and read_cache:
+        await upstream.ready()
+        upstream_output = outputs.get(upstream_id)
+        if upstream.done and upstream_output is not None and not upstream_output.error:
+            cache_key = compute_cache_key(step.node_type, resolved, node_data, [upstream_output], [])
+            hit = await node_output_cache.get(cache_key)
+            if hit is not None:
+                outputs[node_id] = hit
+                run_store.checkpoint(run_id, node_id, hit)
+                await _emit(Event(
+                    type=EventTypes.NODE_COMPLETED,
+                    payload={
+                        "run_id": run_id, "user_id": user_id,
+                        "node_id": node_id, "output": hit.model_dump(exclude_none=True),
+                    },
+                ))
+                return
+
+    deltas, on_delta = _delta_emitter(run_id, user_id, node_id, on_text)
+
+    # Started alongside its upstream, so the budget covers the upstream too
+    upstream_type = node_type_of(nodes_by_id.get(upstream_id, {}))
+    own, upstream_budget = timeout_for(step.node_type), timeout_for(upstream_type)
+    budget = own + upstream_budget if own and upstream_budget else None
+
+    ctx = NodeExecutionContext(
+        node_id=node_id,
+        node_type=step.node_type,
+        node_data=node_data,
+        provider_id=resolved.provider_id,
+        model=resolved.model,
+        temperature=resolved.temperature,
+        run_id=run_id,
+        user_id=user_id,
+        on_delta=on_delta,
+    )
+
+    await _emit(Event(
+        type=EventTypes.NODE_RUNNING,
+        payload={"run_id": run_id, "user_id": user_id, "node_id": node_id},
+    ))
+
+    try:
+        start = time.perf_counter()
+        try:
+            output = await _with_timeout(
+                _run_pipelined(executor, ctx, upstream, upstream_id, outputs), budget,
+            )
+        finally:
+            await deltas.flush()
+    except UpstreamFailed as exc:
+        outputs[node_id] = NodeOutput(error=str(exc))
+        await _emit(Event(
+            type=EventTypes.NODE_SKIPPED,
+            payload={"run_id": run_id, "user_id": user_id, "node_id": node_id, "reason": str(exc)},
+        ))
+        return
+    except Exception as exc:
+        logger.exception("Executor failed for node %s", node_id)
+        outputs[node_id] = NodeOutput(error=str(exc))
+        await _emit(Event(
+            type=EventTypes.NODE_FAILED,
+            payload={"run_id": run_id, "user_id": user_id, "node_id": node_id, "error": str(exc)},
+        ))
+        return
+
+    output.duration_ms = (time.perf_counter() - start) * 1000
+    outputs[node_id] = output
+    run_store.checkpoint(run_id, node_id, output)
+
+    # Cache under the same key a non-pipelined run would compute
+    if cacheable:
+        cache_key = compute_cache_key(
+            step.node_type, resolved, node_data, [outputs[upstream_id]], [],
+        )
+        await node_output_cache.put(cache_key, step.node_type, output)
+
+    await _emit(Event(
+        type=EventTypes.NODE_COMPLETED,
+        payload={
+            "run_id": run_id, "user_id": user_id,
+            "node_id": node_id, "output": output.model_dump(exclude_none=True),
+        },
+    ))
+
+
+async def _run_pipelined(
+    executor: Callable,
+    ctx: NodeExecutionContext,
+    upstream: TextStream,
+    upstream_id: str,
+    outputs: dict[str, NodeOutput],
+) -> NodeOutput:
+    output = await executor(ctx, upstream)
+    if upstream.diverged:
+        logger.info("Upstream %s diverged — re-running node %s", upstream_id, ctx.node_id)
+        fallback = get_executor(ctx.node_type)
+        output = await fallback(ctx.model_copy(update={
+            "text_inputs": [outputs[upstream_id]],
+            "on_delta": None,
+        }))
+    return output
+
+
+async def _with_timeout(coro: Awaitable[NodeOutput], seconds: float | None) -> NodeOutput:
+    """Await *coro*, failing with a readable ``TimeoutError`` after *seconds*."""
+    budget = asyncio.timeout(seconds)
+    try:
+        async with budget:
+            return await coro
+    except TimeoutError:
+        if budget.expired():
+            raise TimeoutError(f"Node timed out after {seconds:g}s") from None
+        raise
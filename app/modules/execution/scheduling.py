@@ -0,0 +1,88 @@
+"""Node scheduling strategies for a single run.
+
+Both strategies take topologically sorted steps and an async ``run_step``
+callback. ``run_when_ready`` is what the runner uses; ``run_by_levels`` is
+the original level-barrier strategy, kept for benchmarking.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable
+
+from app.modules.execution.graph.topological_sort import group_by_levels
+from app.modules.execution.models import ExecutionStep
+
+RunStepFn = Callable[[ExecutionStep], Awaitable[None]]
+
+
+async def run_by_levels(steps: list[ExecutionStep], run_step: RunStepFn) -> None:
+    """Run each topological level with ``asyncio.gather``, one level at a time.
+
+    A slow node holds back every node of the next level, even unrelated ones.
+    """
+    for level in group_by_levels(steps):
+        await asyncio.gather(*(run_step(step) for step in level))
+
+
+async def run_when_ready(
+    steps: list[ExecutionStep],
+    run_step: RunStepFn,
+    early_start: set[str] | None = None,
+) -> None:
+    """Start every step as soon as all of its own dependencies have finished.
+
+    Dependencies outside *steps* (e.g. pre-cached upstream nodes in a partial
+    re-run) are treated as already finished. Total time is bounded by the
+    critical path rather than the sum of per-level maxima.
+
+    Steps whose IDs are in *early_start* only wait for their dependencies to
+    *start* — they consume upstream output while it streams.
+    """
+    early_start = early_start or set()
+    step_ids = {s.node_id for s in steps}
+    waiting: dict[str, int] = {}
+    dependents: dict[str, list[ExecutionStep]] = defaultdict(list)
+
+    for step in steps:
+        deps = {
+            d for d in step.input_node_ids + step.adapter_node_ids
+            if d in step_ids
+        }
+        waiting[step.node_id] = len(deps)
+        for dep in deps:
+            dependents[dep].append(step)
+
+    running: dict[asyncio.Task, ExecutionStep] = {}
+
+    def release(step: ExecutionStep) -> None:
+        waiting[step.node_id] -= 1
+        if waiting[step.node_id] == 0:
+            start(step)
+
+    def start(step: ExecutionStep) -> None:
+        running[asyncio.create_task(run_step(step))] = step
+        for child in dependents[step.node_id]:
+            if child.node_id in early_start:
+                release(child)
+
+    # Collect roots first — starting one may already release early-start children
+    for step in [s for s in steps if waiting[s.node_id] == 0]:
+        start(step)
+
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step = running.pop(task)
+                task.result()
+                for child in dependents[step.node_id]:
+                    if child.node_id not in early_start:
+                        release(child)
+    finally:
+        # Unexpected error or cancellation — don't leave orphaned node tasks.
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
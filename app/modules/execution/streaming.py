@@ -0,0 +1,183 @@
+"""Streaming helpers for incremental node output.
+
+Providers yield one delta per token. ``DeltaCoalescer`` batches those into
+fewer, larger deltas — flushed every ``NODE_DELTA_FLUSH_INTERVAL`` seconds
+or once ``NODE_DELTA_FLUSH_CHARS`` characters are buffered — so a stream
+becomes a handful of WS frames per second instead of one per token.
+
+``TextStream`` exposes text while it is produced — a running node's output
+to pipelined downstream nodes, or a shared provider stream to every caller
+that joined it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+NODE_DELTA_FLUSH_INTERVAL = float(os.environ.get("NODE_DELTA_FLUSH_INTERVAL", "0.1"))
+NODE_DELTA_FLUSH_CHARS = int(os.environ.get("NODE_DELTA_FLUSH_CHARS", "512"))
+
+
+class DeltaCoalescer:
+    def __init__(
+        self,
+        emit: Callable[[str], Awaitable[None]],
+        interval: float = NODE_DELTA_FLUSH_INTERVAL,
+        max_chars: int = NODE_DELTA_FLUSH_CHARS,
+    ) -> None:
+        self._emit = emit
+        self._interval = interval
+        self._max_chars = max_chars
+        self._buffer: list[str] = []
+        self._buffered_chars = 0
+        self._last_flush = time.monotonic()
+        self._timer: asyncio.Task | None = None
+
+    async def push(self, delta: str) -> None:
+        if not delta:
+            return
+        self._buffer.append(delta)
+        self._buffered_chars += len(delta)
+
+        if (
+            self._buffered_chars >= self._max_chars
+            or time.monotonic() - self._last_flush >= self._interval
+        ):
+            await self.flush()
+        elif self._timer is None:
+            # Make sure a stalled stream still delivers what it has so far
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+        await self._emit(text)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._interval)
+        await self.flush()
+
+
+class UpstreamFailed(Exception):
+    """Raised to a stream consumer when the producing node fails or is skipped."""
+
+
+class TextStream:
+    """Append-only text produced by a running node, readable while it grows.
+
+    Pipelined downstream nodes read it paragraph by paragraph (see
+    ``paragraphs``) instead of waiting for the producer's final output.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._done = False
+        self._error: str | None = None
+        self._changed = asyncio.Event()
+        # True if the final output did not extend what was streamed
+        self.diverged = False
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def append(self, delta: str) -> None:
+        if self._done or not delta:
+            return
+        self._text += delta
+        self._notify()
+
+    def finish(self, final_text: str) -> None:
+        """Mark the stream complete, reconciling with the producer's final text."""
+        if self._done:
+            return
+        if final_text.startswith(self._text):
+            self._text = final_text
+        else:
+            self.diverged = True
+        self._done = True
+        self._notify()
+
+    def fail(self, reason: str) -> None:
+        if self._done:
+            return
+        self._error = reason
+        self._done = True
+        self._notify()
+
+    async def ready(self) -> None:
+        """Wait until the first paragraph is complete or the stream has ended."""
+        while not (self._done or "\n\n" in self._text):
+            await self._changed.wait()
+
+    async def result(self) -> str:
+        """Wait for the stream to end and return its text.
+
+        Raises ``UpstreamFailed`` if the producer fails.
+        """
+        while not self._done:
+            await self._changed.wait()
+        if self._error is not None:
+            raise UpstreamFailed(self._error)
+        return self._text
+
+    async def deltas(self) -> AsyncIterator[str]:
+        """Yield the text from the start, then each new piece as it is appended.
+
+        Raises ``UpstreamFailed`` if the producer fails.
+        """
+        pos = 0
+        while True:
+            changed = self._changed
+            if len(self._text) > pos:
+                chunk = self._text[pos:]
+                pos = len(self._text)
+                yield chunk
+                continue
+            if self._error is not None:
+                raise UpstreamFailed(self._error)
+            if self._done:
+                return
+            await changed.wait()
+
+    async def paragraphs(self) -> AsyncIterator[str]:
+        """Yield each blank-line-separated paragraph once it is complete.
+
+        Raises ``UpstreamFailed`` if the producer fails.
+        """
+        pos = 0
+        while True:
+            changed = self._changed
+            idx = self._text.find("\n\n", pos)
+            if idx != -1:
+                paragraph = self._text[pos:idx].strip()
+                pos = idx + 2
+                if paragraph:
+                    yield paragraph
+                continue
+            if self._error is not None:
+                raise UpstreamFailed(self._error)
+            if self._done:
+                tail = self._text[pos:].strip()
+                if tail:
+                    yield tail
+                return
+            await changed.wait()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
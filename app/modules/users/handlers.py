@@ -1,5 +1,6 @@
 import logging
 
+from app.core.auth import user_cache
 from app.core.events import Event, EventTypes, subscribe
 
 logger = logging.getLogger(__name__)
@@ -13,3 +14,4 @@ async def on_user_registered(event: Event) -> None:
 @subscribe(EventTypes.USER_DEACTIVATED)
 async def on_user_deactivated(event: Event) -> None:
     logger.info("Handle user.deactivated: %s", event.payload)
+    user_cache.invalidate(int(event.payload["user_id"]))
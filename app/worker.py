@@ -0,0 +1,101 @@
+"""Execution worker — claims runs from the Postgres run queue and executes them.
+
+    python -m app.worker
+
+Start any number of these, on any host that reaches the database, next to
+API processes running with ``EXECUTION_BACKEND=queue``. Each worker claims
+runs up to its free ``EXECUTION_MAX_CONCURRENT_RUNS`` capacity, executes them
+with the regular runner, and publishes their events through the event broker
+(``EVENT_BROKER``) to the API processes holding the users' sockets. On
+SIGTERM/SIGINT it stops claiming, abandons its in-flight runs and releases
+them so another worker resumes them from their node checkpoints.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import signal
+
+from app.core.bus import event_bus
+from app.core.bus.broker import InMemoryBroker, make_broker
+from app.core.db.notify import Listener
+from app.core.logger import setup_logging
+from app.modules.execution.admission import run_scheduler
+from app.modules.execution.manager import ExecutionManager, SupersedePolicy
+from app.modules.execution.run_queue import (
+    RUN_CONTROL_CHANNEL,
+    RUN_QUEUE_CHANNEL,
+    RUN_QUEUE_POLL_INTERVAL,
+    ExecutionBackend,
+    run_queue,
+)
+from app.modules.execution.run_store import run_store
+
+logger = logging.getLogger(__name__)
+
+
+async def serve(manager: ExecutionManager) -> None:
+    wake = asyncio.Event()
+    listener = Listener({
+        RUN_QUEUE_CHANNEL: lambda _: wake.set(),
+        RUN_CONTROL_CHANNEL: lambda _: wake.set(),
+    })
+    await listener.start()
+    try:
+        while True:
+            wake.clear()
+            try:
+                for request in await run_queue.cancel_requests(run_store.worker_id):
+                    if not await manager.cancel(request.run_id, request.user_id, request.superseded_by):
+                        # Not running here any more (e.g. finished meanwhile) — just close it out
+                        await run_store.finish(request.run_id, "cancelled")
+                if run_scheduler.free_slots:
+                    await manager.resume_stale_runs(limit=run_scheduler.free_slots)
+            except Exception:
+                logger.exception("Run queue poll failed")
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(RUN_QUEUE_POLL_INTERVAL):
+                    await wake.wait()
+    finally:
+        await listener.close()
+
+
+async def main() -> None:
+    setup_logging()
+    if not run_store.enabled:
+        raise SystemExit("The run queue needs EXECUTION_DURABLE_RUNS=1")
+    broker = make_broker()
+    if isinstance(broker, InMemoryBroker):
+        raise SystemExit("Workers need EVENT_BROKER=postgres or socket to reach the API's WebSockets")
+
+    event_bus.start()
+    await event_bus.use_broker(broker)
+    run_store.start()
+    # Superseding is decided by the API process when the run is enqueued
+    manager = ExecutionManager(
+        supersede_policy=SupersedePolicy.NONE,
+        backend=ExecutionBackend.LOCAL,
+    )
+    logger.info("Execution worker %s started", run_store.worker_id)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    server = asyncio.create_task(serve(manager))
+    await stop.wait()
+    logger.info("Execution worker %s stopping", run_store.worker_id)
+
+    server.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await server
+    await run_scheduler.shutdown()
+    await run_store.shutdown()
+    await event_bus.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -317,6 +317,9 @@ FIELDS: dict[str, list[dict]] = {
         {"field_key": "height", "label": "Height", "field_type": FieldType.number,
          "placeholder": None, "default_value": None, "required": False,
          "options": None, "sort_order": 2},
+        {"field_key": "seed", "label": "Seed", "field_type": FieldType.number,
+         "placeholder": "Random", "default_value": None, "required": False,
+         "options": None, "sort_order": 3},
     ],
     "personasReplacer": [
         {"field_key": "image", "label": "Target Image", "field_type": FieldType.image,
@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+from app.core.events import Event
+from app.modules.execution import admission
+from app.modules.execution.admission import AdmissionRejected, RunScheduler
+
+
+@pytest.fixture
+def queued_events(monkeypatch) -> list[dict]:
+    events: list[dict] = []
+
+    async def emit(event: Event, persist: bool = True) -> None:
+        events.append(event.payload)
+
+    monkeypatch.setattr(admission.event_bus, "emit", emit)
+    return events
+
+
+class Runs:
+    """Runs that block until released; records the order they start in."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self._gates: dict[str, asyncio.Event] = {}
+
+    def __call__(self, run_id: str):
+        gate = self._gates[run_id] = asyncio.Event()
+
+        async def run() -> None:
+            self.started.append(run_id)
+            await gate.wait()
+
+        return run
+
+    async def finish(self, run_id: str) -> None:
+        self._gates[run_id].set()
+        # Let the run return and the scheduler dispatch the next one
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def drain(self) -> None:
+        """Finish runs in start order until none are left running."""
+        while unfinished := [r for r in self.started if not self._gates[r].is_set()]:
+            await self.finish(unfinished[0])
+
+
+async def submit(scheduler: RunScheduler, runs: Runs, run_id: str, user_id: int) -> None:
+    await scheduler.submit(run_id, user_id, runs(run_id))
+    await asyncio.sleep(0)
+
+
+def test_light_user_is_not_stuck_behind_heavy_users_backlog(queued_events):
+    async def scenario() -> list[str]:
+        scheduler = RunScheduler(max_concurrent=1, max_per_user=0, max_queued_per_user=0)
+        runs = Runs()
+        for i in range(1, 5):
+            await submit(scheduler, runs, f"heavy-{i}", 1)
+        await submit(scheduler, runs, "light-1", 2)
+        await runs.drain()
+        return runs.started
+
+    assert asyncio.run(scenario()) == ["heavy-1", "light-1", "heavy-2", "heavy-3", "heavy-4"]
+
+
+def test_users_with_backlogs_alternate(queued_events):
+    async def scenario() -> list[str]:
+        scheduler = RunScheduler(max_concurrent=1, max_per_user=0, max_queued_per_user=0)
+        runs = Runs()
+        for i in range(1, 4):
+            await submit(scheduler, runs, f"a{i}", 1)
+        for i in range(1, 4):
+            await submit(scheduler, runs, f"b{i}", 2)
+        await runs.drain()
+        return runs.started
+
+    assert asyncio.run(scenario()) == ["a1", "b1", "a2", "b2", "a3", "b3"]
+
+
+def test_weight_gives_user_proportionally_more_turns(queued_events):
+    async def scenario() -> list[str]:
+        scheduler = RunScheduler(
+            max_concurrent=1, max_per_user=0, max_queued_per_user=0,
+            weight_of=lambda user_id: 2.0 if user_id == 2 else 1.0,
+        )
+        runs = Runs()
+        await submit(scheduler, runs, "blocker", 3)
+        for i in range(1, 3):
+            await submit(scheduler, runs, f"a{i}", 1)
+        for i in range(1, 5):
+            await submit(scheduler, runs, f"b{i}", 2)
+        await runs.drain()
+        return runs.started
+
+    # Finish tags: a1=1 a2=2, b1=0.5 b2=1 b3=1.5 b4=2; ties go to the earlier submit
+    assert asyncio.run(scenario()) == ["blocker", "b1", "a1", "b2", "b3", "a2", "b4"]
+
+
+def test_per_user_cap_lets_other_users_use_free_slots(queued_events):
+    async def scenario() -> tuple[list[str], int, list[str]]:
+        scheduler = RunScheduler(max_concurrent=3, max_per_user=1, max_queued_per_user=0)
+        runs = Runs()
+        await submit(scheduler, runs, "a1", 1)
+        await submit(scheduler, runs, "a2", 1)
+        await submit(scheduler, runs, "b1", 2)
+        started, queued = list(runs.started), scheduler.queued_count
+        await runs.finish("a1")
+        after_finish = list(runs.started)
+        await runs.drain()
+        return started, queued, after_finish
+
+    started, queued, after_finish = asyncio.run(scenario())
+    assert started == ["a1", "b1"]
+    assert queued == 1
+    assert after_finish == ["a1", "b1", "a2"]
+
+
+def test_per_tenant_cap(queued_events):
+    async def scenario() -> list[str]:
+        scheduler = RunScheduler(
+            max_concurrent=4, max_per_user=0, max_per_tenant=1, max_queued_per_user=0,
+            tenant_of=lambda user_id: "acme" if user_id in (1, 2) else None,
+        )
+        runs = Runs()
+        await submit(scheduler, runs, "a1", 1)
+        await submit(scheduler, runs, "b1", 2)
+        await submit(scheduler, runs, "c1", 3)
+        started = list(runs.started)
+        await runs.drain()
+        return started
+
+    assert asyncio.run(scenario()) == ["a1", "c1"]
+
+
+def test_full_user_queue_is_rejected(queued_events):
+    async def scenario() -> RunScheduler:
+        scheduler = RunScheduler(max_concurrent=1, max_per_user=0, max_queued_per_user=2)
+        runs = Runs()
+        await submit(scheduler, runs, "a1", 1)
+        await submit(scheduler, runs, "a2", 1)
+        await submit(scheduler, runs, "a3", 1)
+        with pytest.raises(AdmissionRejected):
+            await submit(scheduler, runs, "a4", 1)
+        # Other users still have room
+        await submit(scheduler, runs, "b1", 2)
+        await scheduler.shutdown()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.stats.rejected == 1
+
+
+def test_queued_positions_are_reported_and_updated(queued_events):
+    async def scenario() -> None:
+        scheduler = RunScheduler(max_concurrent=1, max_per_user=0, max_queued_per_user=0)
+        runs = Runs()
+        await submit(scheduler, runs, "a1", 1)
+        await submit(scheduler, runs, "a2", 1)
+        await submit(scheduler, runs, "b1", 2)
+        assert await scheduler.cancel("b1", user_id=1) is False
+        assert await scheduler.cancel("b1") is True
+        await runs.drain()
+
+    asyncio.run(scenario())
+    assert [(e["run_id"], e["position"]) for e in queued_events] == [
+        ("a2", 1),
+        # b1 jumps ahead of a2
+        ("b1", 1), ("a2", 2),
+        # b1 cancelled
+        ("a2", 1),
+    ]
+
+
+def test_cancel_running_run_frees_its_slot(queued_events):
+    async def scenario() -> list[str]:
+        scheduler = RunScheduler(max_concurrent=1, max_per_user=0, max_queued_per_user=0)
+        runs = Runs()
+        await submit(scheduler, runs, "a1", 1)
+        await submit(scheduler, runs, "b1", 2)
+        assert scheduler.is_running("a1")
+        assert await scheduler.cancel("a1") is True
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert scheduler.is_running("b1")
+        await runs.finish("b1")
+        assert scheduler.running_count == 0
+        return runs.started
+
+    assert asyncio.run(scenario()) == ["a1", "b1"]
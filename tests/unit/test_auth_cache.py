@@ -0,0 +1,83 @@
+import pytest
+
+from app.core import auth
+from app.core.auth import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_value_until_it_expires(clock):
+    cache: TTLCache[str, int] = TTLCache(10)
+    cache.put("a", 1, ttl=5)
+
+    clock[0] += 4.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+
+
+def test_each_entry_has_its_own_ttl(clock):
+    cache: TTLCache[str, int] = TTLCache(10)
+    cache.put("short", 1, ttl=1)
+    cache.put("long", 2, ttl=10)
+
+    clock[0] += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_put_refreshes_value_and_ttl(clock):
+    cache: TTLCache[str, int] = TTLCache(10)
+    cache.put("a", 1, ttl=5)
+    clock[0] += 4
+    cache.put("a", 2, ttl=5)
+    clock[0] += 4
+
+    assert cache.get("a") == 2
+
+
+def test_non_positive_ttl_is_not_cached(clock):
+    cache: TTLCache[str, int] = TTLCache(10)
+    cache.put("a", 1, ttl=0)
+    cache.put("b", 1, ttl=-3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache: TTLCache[str, int] = TTLCache(2)
+    cache.put("a", 1, ttl=60)
+    cache.put("b", 2, ttl=60)
+    cache.get("a")
+    cache.put("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_zero_size_disables_the_cache(clock):
+    cache: TTLCache[str, int] = TTLCache(0)
+    cache.put("a", 1, ttl=60)
+
+    assert cache.get("a") is None
+
+
+def test_invalidate_and_clear(clock):
+    cache: TTLCache[str, int] = TTLCache(10)
+    cache.put("a", 1, ttl=60)
+    cache.put("b", 2, ttl=60)
+
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.get("b") is None
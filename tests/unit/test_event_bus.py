@@ -0,0 +1,73 @@
+import asyncio
+import gc
+
+from app.core.bus.event_bus import EventBus
+from app.core.events import Event
+
+
+def test_events_of_a_run_reach_handlers_in_order():
+    async def scenario() -> tuple[list[str], EventBus]:
+        bus = EventBus()
+        seen: list[str] = []
+
+        async def slow_running(event: Event) -> None:
+            await asyncio.sleep(0.01)
+            seen.append(event.type)
+
+        async def completed(event: Event) -> None:
+            seen.append(event.type)
+
+        bus.on("node.running", slow_running)
+        bus.on("node.completed", completed)
+        await bus.deliver(Event(type="node.running", payload={"run_id": "r"}))
+        await bus.deliver(Event(type="node.completed", payload={"run_id": "r"}))
+        # Nothing else references the drainer; it must survive a collection
+        gc.collect()
+        await asyncio.sleep(0.05)
+        return seen, bus
+
+    seen, bus = asyncio.run(scenario())
+    assert seen == ["node.running", "node.completed"]
+    assert bus._lanes == {}
+    assert bus._drainers == {}
+
+
+def test_runs_are_dispatched_concurrently():
+    async def scenario() -> list[str]:
+        bus = EventBus()
+        seen: list[str] = []
+        release = asyncio.Event()
+
+        async def handler(event: Event) -> None:
+            if event.payload["run_id"] == "slow":
+                await release.wait()
+            seen.append(event.payload["run_id"])
+
+        bus.on("node.completed", handler)
+        await bus.deliver(Event(type="node.completed", payload={"run_id": "slow"}))
+        await bus.deliver(Event(type="node.completed", payload={"run_id": "fast"}))
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.sleep(0.01)
+        return seen
+
+    assert asyncio.run(scenario()) == ["fast", "slow"]
+
+
+def test_failing_handler_does_not_stop_its_lane():
+    async def scenario() -> list[int]:
+        bus = EventBus()
+        seen: list[int] = []
+
+        async def handler(event: Event) -> None:
+            if event.payload["n"] == 1:
+                raise RuntimeError("boom")
+            seen.append(event.payload["n"])
+
+        bus.on("e", handler)
+        for n in range(3):
+            await bus.deliver(Event(type="e", payload={"run_id": "r", "n": n}))
+        await asyncio.sleep(0.01)
+        return seen
+
+    assert asyncio.run(scenario()) == [0, 2]
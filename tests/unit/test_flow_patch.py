@@ -0,0 +1,96 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.flows import _apply_diff, _apply_patch
+from app.api.v1.schemas.flow import ElementDiff, FlowPatch
+
+
+def graph() -> dict:
+    return {
+        "nodes": [
+            {"id": "a", "type": "initialPrompt", "position": {"x": 0, "y": 0}, "data": {"text": "hi"}},
+            {"id": "b", "type": "translator", "position": {"x": 1, "y": 0}},
+            {"id": "c", "type": "grammarFix", "position": {"x": 2, "y": 0}},
+        ],
+        "edges": [
+            {"id": "ab", "source": "a", "target": "b"},
+            {"id": "bc", "source": "b", "target": "c"},
+        ],
+        "providerId": "mistral",
+        "viewport": {"zoom": 1},
+    }
+
+
+def test_upsert_merges_top_level_keys_into_existing_element():
+    nodes = _apply_diff(graph()["nodes"], ElementDiff(upsert=[{"id": "a", "position": {"x": 9, "y": 9}}]))
+
+    assert nodes[0] == {"id": "a", "type": "initialPrompt", "position": {"x": 9, "y": 9}, "data": {"text": "hi"}}
+    assert [n["id"] for n in nodes] == ["a", "b", "c"]
+
+
+def test_upsert_appends_unknown_id():
+    nodes = _apply_diff(graph()["nodes"], ElementDiff(upsert=[{"id": "d", "type": "compressor"}]))
+
+    assert [n["id"] for n in nodes] == ["a", "b", "c", "d"]
+    assert nodes[-1] == {"id": "d", "type": "compressor"}
+
+
+def test_upserted_then_appended_id_merges_repeat_upserts():
+    nodes = _apply_diff([], ElementDiff(upsert=[{"id": "d", "x": 1}, {"id": "d", "y": 2}]))
+
+    assert nodes == [{"id": "d", "x": 1, "y": 2}]
+
+
+def test_id_both_upserted_and_removed_is_removed():
+    nodes = _apply_diff(graph()["nodes"], ElementDiff(upsert=[{"id": "b", "x": 1}, {"id": "d"}], remove=["b", "d"]))
+
+    assert [n["id"] for n in nodes] == ["a", "c"]
+
+
+def test_upsert_without_string_id_is_rejected():
+    for change in ({"type": "translator"}, {"id": 7}):
+        with pytest.raises(HTTPException) as exc:
+            _apply_diff(graph()["nodes"], ElementDiff(upsert=[change]))
+        assert exc.value.status_code == 422
+
+
+def test_removing_a_node_drops_its_edges():
+    patched = _apply_patch(graph(), FlowPatch(version=1, nodes=ElementDiff(remove=["b"])))
+
+    assert [n["id"] for n in patched["nodes"]] == ["a", "c"]
+    assert patched["edges"] == []
+
+
+def test_edges_added_with_a_node_survive_unrelated_removal():
+    patched = _apply_patch(graph(), FlowPatch(
+        version=1,
+        nodes=ElementDiff(upsert=[{"id": "d"}], remove=["c"]),
+        edges=ElementDiff(upsert=[{"id": "ad", "source": "a", "target": "d"}]),
+    ))
+
+    assert [e["id"] for e in patched["edges"]] == ["ab", "ad"]
+
+
+def test_patch_keeps_other_graph_keys_and_sets_provider():
+    original = graph()
+    patched = _apply_patch(original, FlowPatch(version=1, providerId="claude"))
+
+    assert patched["viewport"] == {"zoom": 1}
+    assert patched["providerId"] == "claude"
+    assert patched["nodes"] == original["nodes"]
+
+
+def test_patch_does_not_mutate_the_stored_graph():
+    original = graph()
+    _apply_patch(original, FlowPatch(
+        version=1,
+        nodes=ElementDiff(upsert=[{"id": "a", "position": {"x": 5}}], remove=["c"]),
+    ))
+
+    assert original == graph()
+
+
+def test_patch_of_graph_without_nodes_or_edges():
+    patched = _apply_patch({"providerId": "glm"}, FlowPatch(version=1, nodes=ElementDiff(upsert=[{"id": "a"}])))
+
+    assert patched == {"providerId": "glm", "nodes": [{"id": "a"}], "edges": []}
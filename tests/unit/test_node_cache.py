@@ -0,0 +1,37 @@
+from app.modules.execution.cache import compute_cache_key, is_cacheable
+from app.modules.execution.models import NodeOutput, ResolvedModel
+
+MODEL = ResolvedModel(provider_id="blackforestlabs", model="flux-kontext-pro")
+
+
+def key(node_data: dict, node_type: str = "imageGenerator", inputs: tuple[str, ...] = ()) -> str:
+    return compute_cache_key(node_type, MODEL, node_data, [NodeOutput(text=t) for t in inputs], [])
+
+
+def test_deterministic_node_types_are_cacheable():
+    assert is_cacheable("translator", {})
+    assert is_cacheable("compressor", {})
+
+
+def test_node_types_without_a_provider_call_are_not_cacheable():
+    assert not is_cacheable("textOutput", {})
+    assert not is_cacheable("group", {})
+
+
+def test_image_generator_is_cacheable_only_with_a_seed():
+    assert not is_cacheable("imageGenerator", {"prompt": "a cat"})
+    assert not is_cacheable("imageGenerator", {"prompt": "a cat", "seed": None})
+    assert is_cacheable("imageGenerator", {"prompt": "a cat", "seed": 0})
+
+
+def test_story_teller_is_never_cacheable():
+    assert not is_cacheable("storyTeller", {"idea": "a heist"})
+    assert not is_cacheable("storyTeller", {"idea": "a heist", "seed": 7})
+
+
+def test_cache_key_covers_seed_and_inputs_but_not_cosmetic_fields():
+    base = key({"prompt": "a cat", "seed": 1, "label": "Cat"})
+
+    assert key({"prompt": "a cat", "seed": 1, "label": "Kitty"}) == base
+    assert key({"prompt": "a cat", "seed": 2, "label": "Cat"}) != base
+    assert key({"prompt": "a cat", "seed": 1}, inputs=("upstream",)) != base
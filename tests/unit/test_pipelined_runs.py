@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.core.events import Event, EventTypes
+from app.modules.execution import runner
+from app.modules.execution.cache import node_output_cache
+from app.modules.execution.executors import text_processing
+from app.modules.execution.runner import run_execution
+
+TEXT = "First paragraph.\n\n\nSecond paragraph.  \n"
+
+
+class FakeProvider:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def chat(self, messages: list[dict], **kwargs) -> str:
+        self.calls += 1
+        return messages[-1]["content"].upper()
+
+
+@pytest.fixture
+def events(monkeypatch) -> list[Event]:
+    emitted: list[Event] = []
+
+    async def emit(event: Event, persist: bool = True) -> None:
+        emitted.append(event)
+
+    monkeypatch.setattr(runner, "_emit", emit)
+    node_output_cache.clear()
+    yield emitted
+    node_output_cache.clear()
+
+
+@pytest.fixture
+def provider(monkeypatch) -> FakeProvider:
+    fake = FakeProvider()
+    monkeypatch.setattr(text_processing, "get_text_provider", lambda provider_id: fake)
+    return fake
+
+
+def run(language: str, run_id: str = "r1"):
+    nodes = [
+        {"id": "prompt", "type": "initialPrompt", "data": {"text": TEXT}},
+        {"id": "tr", "type": "translator", "data": {"language": language}},
+    ]
+    edges = [{"id": "e", "source": "prompt", "target": "tr"}]
+    return asyncio.run(run_execution(run_id, 1, "flow", nodes, edges, "mistral", pipelined=True))
+
+
+def test_pass_through_translator_keeps_upstream_text_unchanged(events, provider):
+    outputs = run(language="")
+
+    assert outputs["tr"].text == TEXT
+    assert provider.calls == 0
+
+
+def test_pipelined_node_is_served_from_cache(events, provider):
+    first = run(language="fr", run_id="r1")
+    calls = provider.calls
+    assert calls > 0
+
+    events.clear()
+    second = run(language="fr", run_id="r2")
+
+    assert provider.calls == calls
+    assert second["tr"].text == first["tr"].text
+    node_events = [e.type for e in events if e.payload.get("node_id") == "tr"]
+    assert EventTypes.NODE_RUNNING not in node_events
+    assert EventTypes.NODE_COMPLETED in node_events
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.modules.execution.providers import limits
+from app.modules.execution.providers.limits import ProviderLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(limits.time, "monotonic", lambda: now[0])
+    return now
+
+
+def tokens_left(bucket: TokenBucket) -> float:
+    bucket._refill()
+    return bucket._tokens
+
+
+def reserve_and_settle(limiter: ProviderLimiter, reserve: int, used: int) -> None:
+    async def scenario() -> None:
+        async with limiter.slot(tokens=reserve) as reservation:
+            reservation.settle(used)
+
+    asyncio.run(scenario())
+
+
+def test_settle_refunds_unused_tokens(clock):
+    limiter = ProviderLimiter("test", {"tokens_per_minute": 600, "burst_seconds": 60})
+    reserve_and_settle(limiter, reserve=400, used=150)
+
+    assert tokens_left(limiter._limits.tokens) == 600 - 150
+
+
+def test_refund_never_exceeds_what_a_clamped_reservation_took(clock):
+    limiter = ProviderLimiter("test", {"tokens_per_minute": 600, "burst_seconds": 60})
+    # Clamped to the bucket's capacity: only 600 are taken
+    reserve_and_settle(limiter, reserve=5000, used=100)
+
+    assert tokens_left(limiter._limits.tokens) == 600 - 100
+
+
+def test_settle_with_underestimate_does_not_charge_more(clock):
+    limiter = ProviderLimiter("test", {"tokens_per_minute": 600, "burst_seconds": 60})
+    reserve_and_settle(limiter, reserve=100, used=300)
+
+    assert tokens_left(limiter._limits.tokens) == 500
+
+
+def test_each_layer_refunds_what_it_took(clock):
+    limiter = ProviderLimiter(
+        "test",
+        {"tokens_per_minute": 6000, "burst_seconds": 60},
+        model_config={"small": {"tokens_per_minute": 300, "burst_seconds": 60}},
+    )
+
+    async def scenario() -> None:
+        async with limiter.slot("small", tokens=1000) as reservation:
+            reservation.settle(200)
+
+    asyncio.run(scenario())
+
+    # Model bucket took its full capacity (300); provider bucket took 1000
+    assert tokens_left(limiter._model_limits["small"].tokens) == 100
+    assert tokens_left(limiter._limits.tokens) == 6000 - 200
+
+
+def test_settling_twice_refunds_once(clock):
+    limiter = ProviderLimiter("test", {"tokens_per_minute": 600, "burst_seconds": 60})
+
+    async def scenario() -> None:
+        async with limiter.slot(tokens=400) as reservation:
+            reservation.settle(100)
+            reservation.settle(100)
+
+    asyncio.run(scenario())
+
+    assert tokens_left(limiter._limits.tokens) == 500
@@ -0,0 +1,79 @@
+from app.core.ws.models import WSMessage
+from app.modules.execution.replay import RunReplayBuffer
+
+
+def message(seq: int) -> WSMessage:
+    return WSMessage(type="execution.node.status", data={"seq": seq})
+
+
+def seqs(messages: list[WSMessage]) -> list[int]:
+    return [m.data["seq"] for m in messages]
+
+
+def filled(buffer: RunReplayBuffer, run_id: str, first: int, last: int, user_id: int = 1) -> RunReplayBuffer:
+    for seq in range(first, last + 1):
+        buffer.record(user_id, run_id, seq, message(seq))
+    return buffer
+
+
+def test_since_returns_messages_after_last_seq():
+    buffer = filled(RunReplayBuffer(), "r", 1, 5)
+
+    messages, complete = buffer.since(1, "r", 2)
+
+    assert seqs(messages) == [3, 4, 5]
+    assert complete
+
+
+def test_since_up_to_date_client_gets_nothing():
+    messages, complete = filled(RunReplayBuffer(), "r", 1, 5).since(1, "r", 5)
+
+    assert messages == []
+    assert complete
+
+
+def test_since_from_the_start():
+    messages, complete = filled(RunReplayBuffer(), "r", 1, 3).since(1, "r", 0)
+
+    assert seqs(messages) == [1, 2, 3]
+    assert complete
+
+
+def test_since_is_incomplete_when_buffer_no_longer_reaches_back():
+    buffer = filled(RunReplayBuffer(max_events=3), "r", 1, 6)
+
+    messages, complete = buffer.since(1, "r", 2)
+
+    assert seqs(messages) == [4, 5, 6]
+    assert not complete
+    # Exactly at the oldest buffered message is still complete
+    assert buffer.since(1, "r", 3)[1]
+
+
+def test_since_hides_other_users_runs():
+    buffer = filled(RunReplayBuffer(), "r", 1, 3, user_id=1)
+
+    assert buffer.since(2, "r", 0) == ([], False)
+
+
+def test_since_unknown_run():
+    assert RunReplayBuffer().since(1, "missing", 0) == ([], False)
+
+
+def test_messages_without_seq_are_not_buffered():
+    buffer = RunReplayBuffer()
+    buffer.record(1, "r", None, message(0))
+
+    assert buffer.since(1, "r", 0) == ([], False)
+
+
+def test_least_recently_active_run_is_evicted():
+    buffer = RunReplayBuffer(max_runs=2)
+    filled(buffer, "a", 1, 1)
+    filled(buffer, "b", 1, 1)
+    filled(buffer, "a", 2, 2)
+    filled(buffer, "c", 1, 1)
+
+    assert buffer.since(1, "b", 0) == ([], False)
+    assert seqs(buffer.since(1, "a", 0)[0]) == [1, 2]
+    assert seqs(buffer.since(1, "c", 0)[0]) == [1]
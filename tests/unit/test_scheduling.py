@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.modules.execution.models import ExecutionStep
+from app.modules.execution.scheduling import run_when_ready
+
+
+def step(node_id: str, *inputs: str, adapters: tuple[str, ...] = ()) -> ExecutionStep:
+    return ExecutionStep(
+        node_id=node_id,
+        node_type="test",
+        input_node_ids=list(inputs),
+        adapter_node_ids=list(adapters),
+    )
+
+
+class Recorder:
+    """``run_step`` stub that logs start/end events and sleeps per node."""
+
+    def __init__(self, delays: dict[str, float] | None = None, fail: str | None = None) -> None:
+        self.delays = delays or {}
+        self.fail = fail
+        self.events: list[tuple[str, str]] = []
+        self.cancelled: list[str] = []
+
+    async def __call__(self, s: ExecutionStep) -> None:
+        self.events.append(("start", s.node_id))
+        try:
+            await asyncio.sleep(self.delays.get(s.node_id, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(s.node_id)
+            raise
+        if s.node_id == self.fail:
+            raise RuntimeError(f"{s.node_id} failed")
+        self.events.append(("end", s.node_id))
+
+    def index(self, kind: str, node_id: str) -> int:
+        return self.events.index((kind, node_id))
+
+
+def test_step_starts_only_after_all_dependencies_finish():
+    rec = Recorder({"a": 0.01, "b": 0.03})
+    steps = [step("a"), step("b"), step("c", "a", adapters=("b",))]
+
+    asyncio.run(run_when_ready(steps, rec))
+
+    assert rec.index("start", "c") > rec.index("end", "a")
+    assert rec.index("start", "c") > rec.index("end", "b")
+    assert len(rec.events) == 6
+
+
+def test_independent_branch_is_not_held_back_by_slow_node():
+    # Levels: [slow, fast] then [after_slow, after_fast]
+    rec = Recorder({"slow": 0.05})
+    steps = [
+        step("slow"), step("fast"),
+        step("after_slow", "slow"), step("after_fast", "fast"),
+    ]
+
+    asyncio.run(run_when_ready(steps, rec))
+
+    assert rec.index("end", "after_fast") < rec.index("end", "slow")
+
+
+def test_dependencies_outside_steps_count_as_finished():
+    rec = Recorder()
+
+    asyncio.run(run_when_ready([step("b", "cached"), step("c", "b")], rec))
+
+    assert rec.events == [("start", "b"), ("end", "b"), ("start", "c"), ("end", "c")]
+
+
+def test_early_start_step_runs_alongside_its_dependency():
+    rec = Recorder({"a": 0.03})
+    steps = [step("a"), step("b", "a"), step("c", "b")]
+
+    asyncio.run(run_when_ready(steps, rec, early_start={"b"}))
+
+    assert rec.index("start", "b") < rec.index("end", "a")
+    # c is not early-start, so it still waits for b to finish
+    assert rec.index("start", "c") > rec.index("end", "b")
+
+
+def test_failure_cancels_running_steps_and_propagates():
+    rec = Recorder({"a": 0.0, "b": 1.0}, fail="a")
+    steps = [step("a"), step("b"), step("c", "a")]
+
+    with pytest.raises(RuntimeError, match="a failed"):
+        asyncio.run(run_when_ready(steps, rec))
+
+    assert rec.cancelled == ["b"]
+    assert ("start", "c") not in rec.events
+
+
+def test_empty_steps():
+    asyncio.run(run_when_ready([], Recorder()))
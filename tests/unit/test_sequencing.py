@@ -0,0 +1,87 @@
+import asyncio
+
+from app.core.bus.sequencing import RunSequencer
+from app.core.events import Event, EventTypes
+
+
+def event(run_id: str | None, type: str = "execution.node.status", seq: int | None = None) -> Event:
+    payload = {"run_id": run_id} if run_id is not None else {}
+    return Event(type=type, payload=payload, seq=seq)
+
+
+def assign(sequencer: RunSequencer, e: Event) -> int | None:
+    sequencer.assign(e)
+    return e.seq
+
+
+def test_each_run_counts_from_one():
+    sequencer = RunSequencer()
+
+    assert [assign(sequencer, event("a")) for _ in range(3)] == [1, 2, 3]
+    assert assign(sequencer, event("b")) == 1
+    assert assign(sequencer, event("a")) == 4
+
+
+def test_events_without_run_id_or_with_seq_are_untouched():
+    sequencer = RunSequencer()
+
+    assert assign(sequencer, event(None)) is None
+    assert assign(sequencer, event("a", seq=42)) == 42
+    # A preassigned seq doesn't advance the counter
+    assert assign(sequencer, event("a")) == 1
+
+
+def test_seed_continues_after_last_seq():
+    sequencer = RunSequencer()
+    sequencer.seed("a", 7)
+
+    assert assign(sequencer, event("a")) == 8
+
+
+def test_seed_never_moves_a_counter_backwards():
+    sequencer = RunSequencer()
+    for _ in range(5):
+        assign(sequencer, event("a"))
+    sequencer.seed("a", 2)
+
+    assert assign(sequencer, event("a")) == 6
+
+
+def test_last_seqs():
+    sequencer = RunSequencer()
+    assign(sequencer, event("a"))
+    assign(sequencer, event("a"))
+    sequencer.seed("b", 10)
+
+    assert sequencer.last_seqs() == {"a": 2, "b": 10}
+
+
+def test_counter_released_after_terminal_event():
+    async def scenario() -> tuple[list[int | None], dict[str, int]]:
+        sequencer = RunSequencer(release_delay=0.01)
+        seqs = [
+            assign(sequencer, event("a")),
+            assign(sequencer, event("a", EventTypes.EXECUTION_COMPLETED)),
+            # Late event before the release keeps counting
+            assign(sequencer, event("a")),
+        ]
+        await asyncio.sleep(0.05)
+        return seqs, sequencer.last_seqs()
+
+    seqs, remaining = asyncio.run(scenario())
+    assert seqs == [1, 2, 3]
+    assert remaining == {}
+
+
+def test_idle_counters_are_swept(monkeypatch):
+    from app.core.bus import sequencing
+
+    monkeypatch.setattr(sequencing, "_SWEEP_EVERY", 2)
+    clock = iter([0.0, 100.0, 100.0])
+    monkeypatch.setattr(sequencing.time, "monotonic", lambda: next(clock))
+    sequencer = RunSequencer(idle_ttl=10)
+
+    assign(sequencer, event("idle"))
+    assign(sequencer, event("busy"))
+
+    assert sequencer.last_seqs() == {"busy": 1}
@@ -0,0 +1,82 @@
+import asyncio
+
+from app.core.ws.connection import ClientConnection, SlowConsumerPolicy
+from app.core.ws.models import WSMessage
+
+
+class FakeSocket:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.closed_with: int | None = None
+
+    async def send_text(self, payload: str) -> None:
+        self.sent.append(payload)
+
+    async def close(self, code: int, reason: str) -> None:
+        self.closed_with = code
+
+
+def message(type: str, **data) -> WSMessage:
+    return WSMessage(type=type, data=data)
+
+
+def queued_types(conn: ClientConnection) -> list[str]:
+    return [WSMessage.model_validate_json(payload).type for _, _, payload in conn._queue]
+
+
+def test_full_queue_sheds_deltas_before_statuses():
+    conn = ClientConnection(1, FakeSocket(), max_queue=2, policy=SlowConsumerPolicy.DROP)
+    conn.send(message("execution.node.status", run_id="r", node_id="a"))
+    conn.send(message("execution.node.delta", run_id="r", node_id="a"))
+    conn.send(message("execution.node.status", run_id="r", node_id="b"))
+
+    assert queued_types(conn) == ["execution.node.status", "execution.node.status"]
+    assert conn.dropped == 1
+
+
+def test_incoming_message_ranked_lowest_is_dropped():
+    conn = ClientConnection(1, FakeSocket(), max_queue=1, policy=SlowConsumerPolicy.DROP)
+    conn.send(message("execution.node.status", run_id="r", node_id="a"))
+    conn.send(message("execution.node.delta", run_id="r", node_id="a"))
+
+    assert queued_types(conn) == ["execution.node.status"]
+
+
+def test_coalesce_replaces_older_status_of_same_node():
+    conn = ClientConnection(1, FakeSocket(), max_queue=1, policy=SlowConsumerPolicy.COALESCE)
+    conn.send(message("execution.node.status", run_id="r", node_id="a", status="running"))
+    conn.send(message("execution.node.status", run_id="r", node_id="a", status="complete"))
+
+    assert len(conn._queue) == 1
+    assert conn.dropped == 0
+    assert '"complete"' in conn._queue[0][2]
+
+
+def test_unsheddable_message_on_full_queue_closes_the_socket():
+    async def scenario() -> tuple[ClientConnection, FakeSocket]:
+        ws = FakeSocket()
+        conn = ClientConnection(1, ws, max_queue=1, policy=SlowConsumerPolicy.DROP)
+        conn.send(message("execution.node.completed", run_id="r", node_id="a"))
+        conn.send(message("execution.completed", run_id="r"))
+        await conn._close_task
+        return conn, ws
+
+    conn, ws = asyncio.run(scenario())
+    assert conn.closed
+    assert ws.closed_with == 1013
+
+
+def test_send_first_goes_ahead_of_queued_messages():
+    async def scenario() -> list[str]:
+        ws = FakeSocket()
+        conn = ClientConnection(1, ws)
+        async with conn.paused():
+            conn.start()
+            conn.send(message("live"))
+            conn.send_first([message("missed-1"), message("missed-2")])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        conn.stop()
+        return [WSMessage.model_validate_json(p).type for p in ws.sent]
+
+    assert asyncio.run(scenario()) == ["missed-1", "missed-2", "live"]